@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗂️ Candidate Table - 以整数 ID 为行键的候选词列存表
+=================================================
+
+run_ultimate_hunter 原来每一步都 merge(on='keyword')：
+GPTs、SERP、意图、用户意图各做一次字符串哈希连接，每次复制整张表；
+某一步的结果里如果有重复关键词，还会悄悄把行数翻倍。
+
+这里每个关键词在建表时分配一个整数 ID（行号），各步骤把自己的列
+按 ID 直接写进表里：
+- join(): 侧表按关键词查 ID（每行一次字典查找），只写新列，不复制已有列；
+  侧表里同一个关键词出现多次时保留最后一行并记警告，不会让行数翻倍；
+  join(via=列名) 按表里的另一列查侧表，一行结果可以铺给多个关键词
+- set_column(): 已按行号对齐的结果直接放进去
+- lazy(): 登记延迟计算的列，第一次读取（或 to_frame）时才计算
+- to_frame(): 最后拼成 DataFrame（只在这里整体复制一次）
+"""
+
+from datetime import datetime
+from typing import List, Dict, Callable, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+def log_execution(message: str, level: str = "INFO"):
+    """日志记录"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}")
+
+class CandidateTable:
+    """
+    候选词列存表：每个关键词一行，行号即关键词 ID
+
+    列按 ID 对齐存成 pd.Series（索引 0..n-1），保留各自的 dtype。
+    提供 len()、in、[列名]、index、columns，只读取列的函数
+    （如 calculate_final_scores）可以直接传表，不用先转成 DataFrame。
+    """
+
+    def __init__(self, keywords: Iterable[str], key: str = "keyword"):
+        keywords = list(keywords)
+        unique = list(dict.fromkeys(keywords))
+        if len(unique) != len(keywords):
+            log_execution(f"⚠️ 候选词重复，已去重: {_duplicates(keywords)[:10]}", "WARNING")
+            keywords = unique
+        self.key = key
+        self._ids: Dict[str, int] = {keyword: keyword_id for keyword_id, keyword in enumerate(keywords)}
+
+        self._index = pd.RangeIndex(len(keywords))
+        self._columns: Dict[str, pd.Series] = {key: pd.Series(keywords, index=self._index, dtype=object)}
+        # 延迟列：列名 → 生成函数（一个函数可以一次生成多列）
+        self._lazy: Dict[str, Callable[["CandidateTable"], Dict[str, Sequence]]] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, key: str = "keyword") -> "CandidateTable":
+        """从 DataFrame 建表，其余列原样带入（重复关键词保留最后一行并记警告）"""
+        if key not in df.columns:
+            if df.empty:
+                return cls([], key=key)
+            raise KeyError(key)
+        df = _drop_duplicate_keys(df, key, "候选词")
+        table = cls(df[key].tolist(), key=key)
+        # 保持原来的列顺序和 dtype
+        table._columns = {column: df[column].set_axis(table._index) for column in df.columns}
+        return table
+
+    # ==================== 基本信息 ====================
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns or column in self._lazy
+
+    @property
+    def index(self) -> pd.RangeIndex:
+        """行索引（即关键词 ID）"""
+        return self._index
+
+    @property
+    def columns(self) -> List[str]:
+        """全部列名（含尚未计算的延迟列）"""
+        return list(self._columns) + [c for c in self._lazy if c not in self._columns]
+
+    @property
+    def keywords(self) -> List[str]:
+        return self._columns[self.key].tolist()
+
+    def ids(self, keywords: Iterable[str]) -> List[Optional[int]]:
+        """关键词 → ID（不在表里的是 None）"""
+        return [self._ids.get(keyword) for keyword in keywords]
+
+    def __getitem__(self, column: str) -> pd.Series:
+        if column not in self._columns and column in self._lazy:
+            self._materialize(column)
+        return self._columns[column]
+
+    # ==================== 写入 ====================
+
+    def set_column(self, name: str, values) -> None:
+        """写入一列（标量广播，或长度等于行数、按 ID 顺序排列的序列）"""
+        if np.ndim(values) == 0:
+            series = pd.Series([values] * len(self), index=self._index)
+        else:
+            if len(values) != len(self):
+                raise ValueError(f"列 {name} 有 {len(values)} 个值，表有 {len(self)} 行")
+            if isinstance(values, pd.Series):
+                series = values.set_axis(self._index)
+            else:
+                series = pd.Series(values, index=self._index)
+        self._columns[name] = series
+        self._lazy.pop(name, None)
+
+    def join(self, frame: pd.DataFrame, columns: Optional[List[str]] = None,
+             via: Optional[str] = None) -> int:
+        """
+        按关键词把侧表的列写进来（左连接语义：表里有、侧表没有的行是 NaN），返回匹配行数
+
+        via: 用表里的这一列（而不是关键词本身）去侧表查找，多行可以共享侧表的同一行
+        （如 via="cluster"：代表词的结果铺到整个簇）。
+        侧表里同一个关键词出现多次时保留最后一行并记警告；不在表里的关键词忽略。
+
+        注意：和 merge 不同，表里已有的同名列会被侧表的列整列覆盖（不会生成 _x / _y 两列），
+        侧表没有的行在这些列上变成 NaN。只想补新列时用 columns 指定列名。
+        """
+        if frame.empty or self.key not in frame.columns:
+            return 0
+        frame = _drop_duplicate_keys(frame, self.key, "侧表关键词")
+        keys = frame[self.key]
+        columns = columns or [c for c in frame.columns if c != self.key]
+
+        if via is not None:
+            positions = {key: position for position, key in enumerate(keys)}
+            rows = np.fromiter((positions.get(k, -1) for k in self[via]), dtype=np.int64, count=len(self))
+            matched = rows >= 0
+            ids = self._index[matched]
+            for column in columns:
+                values = frame[column].iloc[rows[matched]].set_axis(ids)
+                self._columns[column] = values.reindex(self._index)
+                self._lazy.pop(column, None)
+            return int(matched.sum())
+
+        ids = np.fromiter((self._ids.get(k, -1) for k in keys), dtype=np.int64, count=len(keys))
+        matched = ids >= 0
+        ids = ids[matched]
+
+        for column in columns:
+            values = frame[column][matched].set_axis(ids)
+            self._columns[column] = values.reindex(self._index)
+            self._lazy.pop(column, None)
+        return int(matched.sum())
+
+    def lazy(self, names: Iterable[str], factory: Callable[["CandidateTable"], Dict[str, Sequence]]) -> None:
+        """
+        登记延迟计算的列
+
+        factory(table) 返回 {列名: 按 ID 顺序排列的值}，第一次读取其中任一列时调用一次。
+        """
+        for name in names:
+            self._lazy[name] = factory
+
+    def _materialize(self, column: str) -> None:
+        factory = self._lazy[column]
+        produced = factory(self)
+        for name, values in produced.items():
+            self.set_column(name, values)
+        # 同一个函数登记的其他列一并完成
+        for name in [n for n, f in self._lazy.items() if f is factory]:
+            del self._lazy[name]
+        if column not in self._columns:
+            raise KeyError(f"延迟列 {column} 的生成函数没有返回这一列")
+
+    # ==================== 输出 ====================
+
+    def to_frame(self) -> pd.DataFrame:
+        """计算全部延迟列后拼成 DataFrame（列按写入顺序，索引为 ID）"""
+        for column in list(self._lazy):
+            if column in self._lazy:
+                self._materialize(column)
+        return pd.DataFrame(self._columns, index=self._index)
+
+def _drop_duplicate_keys(frame: pd.DataFrame, key: str, label: str) -> pd.DataFrame:
+    """重复的关键词只保留最后一行（与 merge 后 drop_duplicates(keep="last") 一致），记警告"""
+    duplicated = frame[key].duplicated(keep="last")
+    if not duplicated.any():
+        return frame
+    log_execution(f"⚠️ {label}重复 {int(duplicated.sum())} 行，保留最后一行: "
+                  f"{_duplicates(frame[key].tolist())[:10]}", "WARNING")
+    return frame[~duplicated]
+
+def _duplicates(values: List) -> List:
+    seen, duplicates = set(), []
+    for value in values:
+        if value in seen and value not in duplicates:
+            duplicates.append(value)
+        seen.add(value)
+    return duplicates
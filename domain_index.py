@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏷️ Domain Index - 域名分类索引
+================================
+
+把 SERP 结果域名分类为：
+- giant:  大厂 / 高权重站点（难以超越）
+- forum:  论坛 / 问答社区（弱竞争）
+- blog:   博客平台（弱竞争）
+- social: 社交 / UGC 平台（弱竞争）
+- tool:   在线工具站（直接竞品）
+
+分类表来自可编辑的 domain_categories.tsv（域名<TAB>分类），加载后放进
+哈希表。查找时从完整主机名逐级向上匹配到可注册域名，所以
+old.reddit.com → reddit.com、support.google.com → google.com，
+answers.microsoft.com 这类单独登记的子域名优先。
+
+每个域名的查找代价只和它的标签数有关，与分类表大小无关，
+对一页 SERP 分类是 O(结果数)。
+
+范围说明：当前随仓库提供的分类表只有约 570 个人工整理的域名
+（常见大厂、论坛 / 问答、博客平台、社交站点和在线工具站），不是最初设想的数千条。
+没有登记的域名靠 FORUM_LABEL_HINTS / TOOL_NAME_HINTS / TOOL_WORD_HINTS 的主机名提示兜底；
+分类表可以直接追加扩充，查找仍是哈希表，规模变大不影响分类速度。
+"""
+
+import os
+from typing import List, Dict, Optional, Iterable
+
+# ==================== 配置区 ====================
+
+DOMAIN_CATEGORIES_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "domain_categories.tsv"
+)
+
+DOMAIN_CATEGORIES = ("giant", "forum", "blog", "social", "tool")
+
+# 多级公共后缀（可注册域名需要再往左多取一级）
+MULTI_LEVEL_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "ltd.uk", "plc.uk",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au",
+    "co.nz", "org.nz", "co.za", "co.in", "net.in", "org.in",
+    "co.jp", "ne.jp", "or.jp", "ac.jp", "co.kr", "or.kr",
+    "com.br", "net.br", "org.br", "com.mx", "com.ar", "com.co",
+    "com.cn", "net.cn", "org.cn", "gov.cn", "edu.cn",
+    "com.hk", "com.tw", "com.sg", "com.my", "com.tr", "com.ua",
+    "com.pl", "com.vn", "com.ph", "com.pk", "com.eg", "com.sa",
+}
+
+# 分类表里没有时的主机名提示
+FORUM_LABEL_HINTS = {"forum", "forums", "community", "communities", "discuss", "discussions", "answers"}
+TOOL_NAME_HINTS = ("calculator", "converter", "generator", "checker", "maker")  # 按子串（pdfconverter）
+# 太泛的词只按连字符分开的整词算（online-tools.io 算，toolstation.com、onlinesbi.com 不算）
+TOOL_WORD_HINTS = {"tool", "tools", "online"}
+
+_DOMAIN_INDEX: Optional[Dict[str, str]] = None
+
+# ==================== 域名处理 ====================
+
+def normalize_host(host: str) -> str:
+    """主机名小写、去掉端口、末尾点和 www."""
+    host = (host or "").strip().lower().rstrip(".")
+    if "://" in host:
+        host = host.split("://", 1)[1]
+    host = host.split("/", 1)[0].rsplit("@", 1)[-1].split(":", 1)[0]
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+def registrable_domain(host: str) -> str:
+    """
+    提取可注册域名（eTLD+1）
+
+    例：old.reddit.com → reddit.com，news.bbc.co.uk → bbc.co.uk
+    """
+    host = normalize_host(host)
+    labels = host.split(".")
+    if len(labels) <= 2:
+        return host
+    if ".".join(labels[-2:]) in MULTI_LEVEL_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+# ==================== 分类表 ====================
+
+def load_domain_index(filepath: str = DOMAIN_CATEGORIES_FILE) -> Dict[str, str]:
+    """
+    加载域名分类表
+
+    文件格式（# 开头为注释）：
+        reddit.com	forum
+        answers.microsoft.com	forum
+    """
+    index = {}
+    if not os.path.exists(filepath):
+        return index
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            domain = normalize_host(parts[0])
+            if domain:
+                index[domain] = parts[1].lower()
+    return index
+
+def get_domain_index() -> Dict[str, str]:
+    """进程内只加载一次的分类表"""
+    global _DOMAIN_INDEX
+    if _DOMAIN_INDEX is None:
+        _DOMAIN_INDEX = load_domain_index()
+    return _DOMAIN_INDEX
+
+def reload_domain_index(filepath: str = DOMAIN_CATEGORIES_FILE) -> Dict[str, str]:
+    """重新加载分类表（编辑 domain_categories.tsv 之后）"""
+    global _DOMAIN_INDEX
+    _DOMAIN_INDEX = load_domain_index(filepath)
+    return _DOMAIN_INDEX
+
+# ==================== 分类 ====================
+
+def classify_domain(host: str, index: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    返回域名分类（giant / forum / blog / social / tool），未知返回 None
+
+    从完整主机名逐级向上查表，最多查到可注册域名；
+    表里没有时再看论坛 / 工具站的主机名提示。
+    """
+    if index is None:
+        index = get_domain_index()
+    host = normalize_host(host)
+    if not host:
+        return None
+
+    base = registrable_domain(host)
+    candidate = host
+    while True:
+        category = index.get(candidate)
+        if category is not None:
+            return category
+        if candidate == base or "." not in candidate:
+            break
+        candidate = candidate.split(".", 1)[1]
+
+    labels = host.split(".")
+    if any(label in FORUM_LABEL_HINTS for label in labels[:-1]):
+        return "forum"
+    name = base.split(".", 1)[0]
+    if any(hint in name for hint in TOOL_NAME_HINTS) or TOOL_WORD_HINTS.intersection(name.split("-")):
+        return "tool"
+    return None
+
+def classify_domains(domains: Iterable[str]) -> List[Optional[str]]:
+    """逐个分类（保持顺序）"""
+    index = get_domain_index()
+    return [classify_domain(d, index) for d in domains]
+
+def count_categories(domains: Iterable[str]) -> Dict[str, int]:
+    """统计每个分类出现的次数"""
+    counts = {c: 0 for c in DOMAIN_CATEGORIES}
+    for category in classify_domains(domains):
+        if category is not None:
+            counts[category] = counts.get(category, 0) + 1
+    return counts
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧹 Filter Engine - 声明式关键词过滤（规则文件 + 一次扫描）
+======================================================
+
+trend_hunter_v2 / trend_hunter_optimized / profit_hunter_lite 的过滤条件
+（噪音词、实物产品排除、工具词、词数限制）原来分散写在各个脚本里。
+这里统一放进可编辑的 filter_rules.json，每个脚本一个配置，启动时编译：
+
+- match=token 的淘汰规则（整词，如人名、新闻事件）：单个词放进词哈希表，
+  用 keyword_tokens 缓存的分词结果逐词查表，不跑正则；含空格的短语并入分类器按整词匹配
+- whole_words：短信号词（"to"、"edit"、"test"……）在所有词表里都只按整词命中
+- 其余淘汰规则、require 必含词表、打分用的 tables：合并成一个 KeywordClassifier
+  （trie 正则），每个关键词只扫描一遍
+- 检查顺序：词数 → 最短词长 → 淘汰规则（按文件顺序）→ 必含词；
+  词数 / 整词规则不通过时连分类扫描都省掉
+
+每个被淘汰的关键词记一个短的原因码（too_few_words、noise:event、missing:tool……），
+块函数把它们作为两列额外结果带回主进程，最后追加写进 CSV，方便之后分析过滤效果。
+
+用法：
+    engine = FilterEngine(load_filter_rules("trend_hunter_v2"))
+    reason, hits = engine.evaluate("pdf to jpg converter")
+    # reason 为 None 表示通过，hits 是分类结果（{表名: {分组: [词]}}）
+"""
+
+import os
+import csv
+import json
+from collections import Counter
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple, Iterable
+
+from keyword_classifier import KeywordClassifier
+from keyword_tokens import keyword_tokens
+from text_fingerprints import TOKEN_RE
+
+# ==================== 配置区 ====================
+
+FILTER_RULES_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "filter_rules.json"
+)
+
+# 淘汰原因码
+REJECT_TOO_FEW_WORDS = "too_few_words"
+REJECT_TOO_MANY_WORDS = "too_many_words"
+REJECT_SHORT_WORD = "short_word"
+
+# 块函数带回淘汰记录用的两列（与通过的候选词列分开拼接）
+REJECTED_COLUMNS = ("rejected_keyword", "reject_reason")
+
+# ==================== 规则 ====================
+
+def log_execution(message: str, level: str = "INFO"):
+    """日志记录"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}")
+
+def load_filter_rules(profile: str, filepath: str = FILTER_RULES_FILE) -> Dict:
+    """
+    读取规则文件里某个脚本的配置（以 _ 开头的键是说明）
+
+    同一个词表里重复的词（不区分大小写）记警告后去掉，只保留第一次出现。
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    if profile not in rules or profile.startswith("_"):
+        raise KeyError(f"{filepath} 里没有过滤配置: {profile}")
+    return _dedupe_terms(rules[profile], profile)
+
+def _dedupe_terms(node, path: str):
+    """递归检查配置里的每个词表（字符串列表），去掉组内重复的词"""
+    if isinstance(node, dict):
+        return {key: _dedupe_terms(value, f"{path}.{key}") for key, value in node.items()}
+    if isinstance(node, list) and all(isinstance(word, str) for word in node):
+        seen, terms, duplicates = set(), [], []
+        for word in node:
+            if word.lower() in seen:
+                duplicates.append(word)
+                continue
+            seen.add(word.lower())
+            terms.append(word)
+        if duplicates:
+            log_execution(f"⚠️ 过滤规则 {path} 里有重复的词，已忽略: {duplicates}", "WARNING")
+        return terms
+    return node
+
+class FilterEngine:
+    """
+    编译好的过滤器
+
+    rules: 一个脚本的配置（见 filter_rules.json）；
+    tables: 脚本自己额外要分类的词表（如 lite 的意图信号），并入同一个分类器。
+    """
+
+    def __init__(self, rules: Dict, tables: Optional[Dict[str, Dict[str, Iterable[str]]]] = None):
+        self.min_words = rules.get("min_words", 0)
+        self.max_words = rules.get("max_words")
+        self.min_word_length = rules.get("min_word_length", 0)
+
+        classifier_tables: Dict[str, Dict[str, List[str]]] = {}
+        whole_word_tables = set()
+
+        # 淘汰规则按顺序：(规则名, 整词哈希表 {词: 原因码} 或 None)
+        self._reject_rules: List[Tuple[str, Optional[Dict[str, str]]]] = []
+        for rule, spec in rules.get("reject", {}).items():
+            groups = spec["groups"]
+            if spec.get("match", "substring") != "token":
+                classifier_tables[rule] = groups
+                self._reject_rules.append((rule, None))
+                continue
+            tokens: Dict[str, str] = {}
+            phrases: Dict[str, List[str]] = {}
+            for group, words in groups.items():
+                for word in words:
+                    word = word.lower()
+                    if TOKEN_RE.fullmatch(word):
+                        tokens.setdefault(word, f"{rule}:{group}")
+                    else:
+                        phrases.setdefault(group, []).append(word)
+            self._reject_rules.append((rule, tokens))
+            if phrases:
+                classifier_tables[rule] = phrases
+                whole_word_tables.add(rule)
+
+        self._required = list(rules.get("require", {}))
+        for name, words in rules.get("require", {}).items():
+            classifier_tables[name] = {name: words}
+
+        classifier_tables.update(rules.get("tables", {}))
+        classifier_tables.update(tables or {})
+        self.classifier = KeywordClassifier(classifier_tables, whole_word_tables=whole_word_tables,
+                                            whole_words=rules.get("whole_words", ()))
+
+    def evaluate(self, keyword: str) -> Tuple[Optional[str], Optional[Dict[str, Dict[str, List[str]]]]]:
+        """
+        一个关键词跑完全部过滤条件，返回 (淘汰原因码或 None, 分类结果)
+
+        词数 / 词长 / 整词规则淘汰时还没有分类，分类结果是 None。
+        """
+        tokens = keyword_tokens(keyword)
+        words = tokens.tokens
+        if len(words) < self.min_words:
+            return REJECT_TOO_FEW_WORDS, None
+        if self.max_words is not None and len(words) > self.max_words:
+            return REJECT_TOO_MANY_WORDS, None
+        if self.min_word_length and any(len(w) < self.min_word_length for w in words):
+            return REJECT_SHORT_WORD, None
+
+        hits = None
+        for rule, token_reasons in self._reject_rules:
+            if token_reasons:
+                for word in tokens.words:
+                    reason = token_reasons.get(word)
+                    if reason is not None:
+                        return reason, hits
+            if rule in self.classifier.tables:
+                if hits is None:
+                    hits = self.classifier.classify(keyword)
+                if hits[rule]:
+                    return f"{rule}:{next(iter(hits[rule]))}", hits
+
+        if hits is None:
+            hits = self.classifier.classify(keyword)
+        for name in self._required:
+            if not hits[name]:
+                return f"missing:{name}", hits
+        return None, hits
+
+# ==================== 淘汰记录 ====================
+
+def new_rejection_columns() -> Dict[str, list]:
+    return {column: [] for column in REJECTED_COLUMNS}
+
+def split_rejections(columns: Dict[str, list]) -> Tuple[Dict[str, list], Dict[str, list]]:
+    """块函数的列式结果 → (通过的候选词列, 淘汰记录列)"""
+    rejections = {column: columns.pop(column, []) for column in REJECTED_COLUMNS}
+    return columns, rejections
+
+def summarize_rejections(rejections: Dict[str, list]) -> List[Tuple[str, int]]:
+    """按原因码计数，从多到少"""
+    return Counter(rejections.get("reject_reason", [])).most_common()
+
+def save_rejections(rejections: Dict[str, list], filepath: str, source: str) -> int:
+    """淘汰记录追加写进 CSV（keyword, reason, source, time），返回写入行数"""
+    keywords = rejections.get("rejected_keyword", [])
+    if not keywords:
+        return 0
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    write_header = not os.path.exists(filepath)
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open(filepath, "a", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(["keyword", "reason", "source", "time"])
+        writer.writerows((keyword, reason, source, timestamp)
+                         for keyword, reason in zip(keywords, rejections["reject_reason"]))
+    return len(keywords)
@@ -11,6 +11,8 @@ import pandas as pd
 from datetime import datetime
 import json
 
+from keyword_topics import topic_rollup
+
 # 修复 Windows 控制台编码
 if sys.platform == 'win32':
     import io
@@ -86,6 +88,49 @@ def get_top_opportunities(df, n=10):
     
     return opportunities
 
+def generate_topic_section(df, n=20):
+    """按主题汇总表格（结果里没有主题列时返回空字符串）"""
+    if 'topic' not in df.columns:
+        return ""
+    
+    rollup = topic_rollup(df).head(n)
+    rows = ""
+    for _, topic in rollup.iterrows():
+        avg_score = topic.get('avg_score', 0)
+        build_now = topic.get('build_now', 0)
+        rows += f"""
+                            <tr>
+                                <td><strong>{topic['topic_label']}</strong></td>
+                                <td>{topic['keywords']}</td>
+                                <td><strong>{avg_score:.1f}</strong></td>
+                                <td>{build_now}</td>
+                                <td>{topic['top_keyword']}</td>
+                            </tr>
+"""
+    
+    return f"""
+            <!-- 5.5 按主题汇总 -->
+            <div class="table-section">
+                <h2 class="section-title">🗺️ 按主题汇总（Top {len(rollup)}）</h2>
+                <div style="overflow-x: auto;">
+                    <table class="data-table">
+                        <thead>
+                            <tr>
+                                <th>主题</th>
+                                <th>关键词数</th>
+                                <th>平均分</th>
+                                <th>立即做</th>
+                                <th>代表词</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+{rows}
+                        </tbody>
+                    </table>
+                </div>
+            </div>
+"""
+
 def generate_enhanced_html_report(df):
     """生成增强版HTML报告"""
     
@@ -620,7 +665,11 @@ def generate_enhanced_html_report(df):
                     </table>
                 </div>
             </div>
-            
+"""
+    
+    html += generate_topic_section(df)
+    
+    html += """
             <!-- 6. 下一步行动建议 -->
             <div class="action-section">
                 <h2>🎯 下一步行动建议</h2>
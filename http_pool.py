@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🌐 HTTP Pool - 连接池会话 + 按主机限速
+=======================================
+
+给并发抓取用的两个小工具：
+- get_session(): 进程内共享的 requests.Session（带连接池，复用 TCP/TLS 连接）
+- HostRateLimiter: 线程安全的按主机限速器（最小间隔 + 随机抖动）
+
+限速器按主机“预约”下一个请求时间片，线程拿到时间片后在锁外睡眠，
+所以多个线程对同一主机的请求会被均匀错开，不同主机之间互不影响。
+"""
+
+import time
+import random
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ==================== 配置区 ====================
+
+POOL_CONFIG = {
+    "POOL_CONNECTIONS": 10,   # 缓存的主机连接池数量
+    "POOL_MAXSIZE": 16,       # 每个主机的最大连接数（≥ 线程数）
+    "USER_AGENT": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+}
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+# ==================== 会话 ====================
+
+def get_session() -> requests.Session:
+    """进程内共享的连接池会话（首次调用时创建）"""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONFIG["POOL_CONNECTIONS"],
+                    pool_maxsize=POOL_CONFIG["POOL_MAXSIZE"]
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = POOL_CONFIG["USER_AGENT"]
+                _SESSION = session
+    return _SESSION
+
+# ==================== 限速 ====================
+
+class HostRateLimiter:
+    """
+    按主机限速：同一主机相邻两次请求至少间隔 min_interval 秒，
+    再加 0 ~ jitter 秒的随机抖动，避免请求节奏过于规律。
+    """
+
+    def __init__(self, min_interval: float = 1.0, jitter: float = 0.0,
+                 per_host: Optional[Dict[str, float]] = None):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.per_host = per_host or {}
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, host: str) -> float:
+        """预约下一个时间片，返回需要等待的秒数（不睡眠）"""
+        interval = self.per_host.get(host, self.min_interval)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval + random.uniform(0, self.jitter)
+        return slot - now
+
+    def wait(self, url_or_host: str) -> float:
+        """等到该主机的下一个时间片，返回实际等待秒数"""
+        host = host_of(url_or_host)
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+def host_of(url_or_host: str) -> str:
+    """URL 或主机名 → 小写主机名"""
+    if "//" in url_or_host:
+        return urlparse(url_or_host).netloc.lower()
+    return url_or_host.lower()
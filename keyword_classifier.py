@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏷️ Keyword Classifier - 关键词分类（全部信号词表一次扫描）
+==========================================================
+
+各个脚本原来对每个关键词跑好几遍嵌套循环：
+痛点词表、工具词表、用户意图表、工具类型表、噪音正则……每张表都把关键词重新扫一遍。
+
+这里把一个脚本用到的全部词表合并编译成一个 PatternMatcher（trie 正则），
+每个关键词只做一次线性扫描；每个命中的词在编译时就已经换算成
+"表/分组/词序" 的编号，分类时只是合并编号，开销只和命中数有关，和词表大小无关。
+
+词表格式：{表名: {分组名: [词, ...]}}，分组顺序和分组内的词序都保留，
+所以 "按分组顺序取第一个命中的分组" 和 "分组内取第一个命中的词"
+与原来的 for ... break 写法结果一致。
+
+用法：
+    classifier = KeywordClassifier({
+        "pain": {"strong": [...], "tool": [...]},
+        "noise": {"news": ["election", "scandal"]},
+    }, whole_word_tables={"noise"})          # 进程内编译一次
+
+    hits = classifier.classify("how to fix pdf converter")
+    hits["pain"]   # {"strong": ["how to fix"], "tool": ["converter"]}
+    hits["noise"]  # {}
+
+whole_word_tables 里的表只接受整词命中（对应原来的 r'\\b(...)\\b' 正则），
+其余表是子串命中（对应原来的 "word in keyword"）；
+whole_words 里的词在任何表里都只按整词命中（"to" 不再命中 photo / tool，
+"edit" 不再命中 credit / reddit）。
+
+关键词的小写形式取自 keyword_tokens 的缓存，同一个词在各个评分步骤里只小写一次。
+"""
+
+from typing import List, Dict, Tuple, Iterable
+
+from pattern_matcher import PatternMatcher
+from keyword_tokens import keyword_tokens
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    return ((start == 0 or not _is_word_char(text[start - 1])) and
+            (end == len(text) or not _is_word_char(text[end])))
+
+class KeywordClassifier(PatternMatcher):
+    """
+    多张词表的单次扫描分类器
+
+    classify() 返回 {表名: {命中的分组: [命中的词（按词表顺序）]}}；
+    每张表都会出现在结果里，没有命中时是空字典。
+    词表里重复出现的词会重复计入（与原来逐项计数的写法一致）。
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, Iterable[str]]],
+                 whole_word_tables: Iterable[str] = (), whole_words: Iterable[str] = ()):
+        self.tables: Dict[str, Dict[str, List[str]]] = {
+            table: {group: [p.lower() for p in words if p] for group, words in groups.items()}
+            for table, groups in tables.items()
+        }
+        self.whole_word_tables = set(whole_word_tables)
+        unknown = self.whole_word_tables - set(self.tables)
+        if unknown:
+            raise ValueError(f"未知的词表: {', '.join(sorted(unknown))}")
+        self.whole_words = {w.lower() for w in whole_words}
+
+        # 每个 (表, 分组, 词) 按词表顺序编号，命中的编号排序后即恢复词表顺序
+        self._entries: List[Tuple[str, str, str]] = []
+        substring_members: Dict[str, List[int]] = {}
+        whole_word_members: Dict[str, List[int]] = {}
+        for table, groups in self.tables.items():
+            whole_word_table = table in self.whole_word_tables
+            for group, words in groups.items():
+                for word in words:
+                    whole_word = whole_word_table or word in self.whole_words
+                    members = whole_word_members if whole_word else substring_members
+                    members.setdefault(word, []).append(len(self._entries))
+                    self._entries.append((table, group, word))
+
+        super().__init__(set(substring_members) | set(whole_word_members))
+
+        # 按 "同一位置最长的词" 预先合并：
+        # 子串表的编号直接并入；整词表的词要在命中位置检查边界
+        self._substring_ordinals: Dict[str, Tuple[int, ...]] = {}
+        self._whole_word_checks: Dict[str, List[Tuple[int, Tuple[int, ...]]]] = {}
+        for longest, prefixes in self._prefixes.items():
+            words = prefixes + [longest]
+            self._substring_ordinals[longest] = tuple(
+                o for word in words for o in substring_members.get(word, ()))
+            checks = [(len(word), tuple(whole_word_members[word]))
+                      for word in words if word in whole_word_members]
+            if checks:
+                self._whole_word_checks[longest] = checks
+
+    def classify(self, keyword: str) -> Dict[str, Dict[str, List[str]]]:
+        """一次扫描，返回全部词表的命中"""
+        hits: Dict[str, Dict[str, List[str]]] = {table: {} for table in self.tables}
+        if self._regex is None or not keyword:
+            return hits
+        text = keyword_tokens(keyword).text
+
+        ordinals = set()
+        substring_ordinals = self._substring_ordinals
+        if not self._whole_word_checks:
+            for longest in self._regex.findall(text):
+                ordinals.update(substring_ordinals[longest])
+        else:
+            whole_word_checks = self._whole_word_checks
+            for match in self._regex.finditer(text):
+                longest = match.group(1)
+                ordinals.update(substring_ordinals[longest])
+                if longest in whole_word_checks:
+                    start = match.start()
+                    for length, word_ordinals in whole_word_checks[longest]:
+                        if _is_whole_word(text, start, start + length):
+                            ordinals.update(word_ordinals)
+
+        entries = self._entries
+        for ordinal in sorted(ordinals):
+            table, group, word = entries[ordinal]
+            groups = hits[table]
+            if group in groups:
+                groups[group].append(word)
+            else:
+                groups[group] = [word]
+        return hits
+
+    def classify_many(self, keywords: Iterable[str]) -> List[Dict[str, Dict[str, List[str]]]]:
+        """批量分类"""
+        return [self.classify(keyword) for keyword in keywords]
+
+def first_hits(groups: Dict[str, List[str]]) -> Dict[str, str]:
+    """{分组: [命中的词]} → {分组: 第一个命中的词}"""
+    return {group: words[0] for group, words in groups.items()}
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧮 Keyword Scorer - 任意关键词文件的流式批量评分
+================================================
+
+不跑挖掘流程，直接给一份现成的关键词清单打分
+（Search Console 导出、广告平台关键词列表……几 GB 也可以）：
+    意图评分（痛点/工具/对比/B2B/速度）、用户意图、可构建性
+
+- 输入：CSV（指定列）、纯文本（每行一个）、JSONL（指定字段），或标准输入
+- 按块读取、按块写出，内存占用和文件大小无关
+- 多个块在多个 CPU 核上并行评分（parallel_scoring），同时在途的块数有上限，输出顺序与输入一致
+
+用法：
+    python keyword_scorer.py keywords.csv -o scored.csv --column query
+    python keyword_scorer.py keywords.txt -o scored.jsonl --workers 8
+    cat keywords.txt | python keyword_scorer.py - -o - > scored.csv
+
+Python：
+    from keyword_scorer import score_keywords, score_file
+    df = score_keywords(["pdf to word converter", "mortgage calculator"])
+    score_file("keywords.csv", "scored.csv", column="query")
+"""
+
+import os
+import sys
+import json
+from datetime import datetime
+from typing import List, Iterator, Optional
+
+import pandas as pd
+
+from profit_hunter_ultimate import (
+    score_intent_columns, calculate_buildability_scores, INTENT_COLUMNS, USER_INTENT_COLUMNS
+)
+from parallel_scoring import iter_parallel_chunks
+
+# ==================== 配置区 ====================
+
+SCORER_CONFIG = {
+    "CHUNK_SIZE": 50_000,       # 每块关键词数
+    "WORKERS": os.cpu_count() or 1,  # 并行进程数（1 = 当前进程内评分）
+    "CSV_COLUMN": "keyword",    # CSV 默认关键词列
+    "JSON_FIELD": "keyword",    # JSONL 默认关键词字段
+}
+
+OUTPUT_COLUMNS = ["keyword"] + INTENT_COLUMNS + USER_INTENT_COLUMNS + ["buildability_score"]
+
+# ==================== 工具函数 ====================
+
+def log_execution(message: str, level: str = "INFO"):
+    """日志记录（写到 stderr，结果可以直接输出到 stdout）"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}", file=sys.stderr)
+
+def detect_format(path: str) -> str:
+    """按扩展名判断格式：csv / jsonl / txt（标准输入按 txt）"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".csv", ".tsv"):
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "txt"
+
+# ==================== 评分 ====================
+
+def score_keywords(keywords: List[str]) -> pd.DataFrame:
+    """给一组关键词评分（一个块），返回 OUTPUT_COLUMNS 列"""
+    keywords = [str(k) for k in keywords]
+    columns = score_intent_columns(keywords)
+    columns["buildability_score"] = calculate_buildability_scores(pd.Series(keywords, dtype=object))
+    return pd.DataFrame(columns, columns=OUTPUT_COLUMNS)
+
+# ==================== 读取 ====================
+
+def iter_keyword_chunks(path: str, fmt: Optional[str] = None, column: Optional[str] = None,
+                        chunk_size: int = SCORER_CONFIG["CHUNK_SIZE"]) -> Iterator[List[str]]:
+    """
+    按块读取关键词（path 为 "-" 时读标准输入）
+
+    fmt: csv / jsonl / txt，默认按扩展名判断；空行和空值跳过。
+    """
+    fmt = fmt or ("txt" if path == "-" else detect_format(path))
+
+    if fmt == "csv":
+        column = column or SCORER_CONFIG["CSV_COLUMN"]
+        source = sys.stdin if path == "-" else path
+        sep = "\t" if path.lower().endswith(".tsv") else ","
+        for chunk in pd.read_csv(source, usecols=[column], chunksize=chunk_size,
+                                 sep=sep, dtype=str, keep_default_na=False):
+            keywords = [k.strip() for k in chunk[column] if k.strip()]
+            if keywords:
+                yield keywords
+        return
+
+    field = column or SCORER_CONFIG["JSON_FIELD"]
+    handle = sys.stdin if path == "-" else open(path, "r", encoding="utf-8", errors="replace")
+    try:
+        chunk = []
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            if fmt == "jsonl":
+                try:
+                    keyword = json.loads(line).get(field)
+                except (ValueError, AttributeError):
+                    continue
+                if not isinstance(keyword, str) or not keyword.strip():
+                    continue
+                line = keyword.strip()
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+# ==================== 写出 ====================
+
+def score_file(input_path: str, output_path: str, fmt: Optional[str] = None,
+               column: Optional[str] = None, chunk_size: int = SCORER_CONFIG["CHUNK_SIZE"],
+               workers: int = SCORER_CONFIG["WORKERS"]) -> int:
+    """
+    流式评分一个关键词文件，边算边写，返回评分的关键词数
+
+    输出格式按 output_path 扩展名：.jsonl 写 JSONL，其余写 CSV；"-" 写到标准输出（CSV）。
+    """
+    output_jsonl = output_path != "-" and detect_format(output_path) == "jsonl"
+    out = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8", newline="")
+    total = 0
+    try:
+        chunks = iter_keyword_chunks(input_path, fmt=fmt, column=column, chunk_size=chunk_size)
+        for i, scored in enumerate(iter_parallel_chunks(score_keywords, chunks, workers=workers)):
+            if output_jsonl:
+                scored.to_json(out, orient="records", lines=True, force_ascii=False)
+            else:
+                scored.to_csv(out, index=False, header=(i == 0))
+            out.flush()
+            total += len(scored)
+            log_execution(f"🧮 已评分 {total:,} 个关键词")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return total
+
+# ==================== CLI ====================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='关键词文件流式批量评分（意图 / 用户意图 / 可构建性）')
+    parser.add_argument('input', help='关键词文件（CSV / TXT / JSONL），"-" 为标准输入')
+    parser.add_argument('-o', '--output', default='-', help='输出文件（.csv / .jsonl），默认标准输出')
+    parser.add_argument('--format', choices=['csv', 'txt', 'jsonl'], help='输入格式（默认按扩展名）')
+    parser.add_argument('--column', help='CSV 列名 / JSONL 字段名（默认 keyword）')
+    parser.add_argument('--chunk-size', type=int, default=SCORER_CONFIG["CHUNK_SIZE"], help='每块关键词数')
+    parser.add_argument('--workers', type=int, default=SCORER_CONFIG["WORKERS"], help='并行进程数')
+
+    args = parser.parse_args()
+
+    start = datetime.now()
+    total = score_file(args.input, args.output, fmt=args.format, column=args.column,
+                       chunk_size=args.chunk_size, workers=args.workers)
+    elapsed = (datetime.now() - start).total_seconds()
+    log_execution(f"✅ 完成: {total:,} 个关键词，{elapsed:.1f} 秒")
+
+if __name__ == "__main__":
+    main()
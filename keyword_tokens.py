@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔤 Keyword Tokens - 关键词的共享分词结果（每个词只切一次）
+=======================================================
+
+各个评分函数原来各自对同一个关键词反复 lower() / split()：
+意图评分数一遍词数，SERP 简化评估再数一遍，可构建性再小写一遍，
+过滤器、分类器、Reddit 归属判断……每一步都重新分配一遍字符串。
+
+keyword_tokens(keyword) 一次生成并缓存（LRU）：
+- text:      小写字符串
+- tokens:    按空白切分的词（词数、单字母检查用，与原来的 split() 一致）
+- words:     \\w+ 词（整词匹配用，标点不算词的一部分）
+- word_set:  words 的哈希集合，整词判断是一次集合查找
+所有字符串都经过 sys.intern，同一个词在整个进程里只有一份。
+
+整词匹配：
+短的信号词（"to"、"vs"、"app"、"api"、"edit"……）用子串判断会命中
+photo / tool / apple / credit 这类不相干的词，这些词应该按整词匹配：
+KeywordClassifier(whole_words=...) 和 filter_rules.json 的 whole_words 用的就是这个规则；
+多词短语（"to jpg"、"instead of"）也由分类器按整词边界匹配，这里不再单独生成 n-gram。
+"""
+
+import sys
+from functools import lru_cache
+from typing import Tuple, FrozenSet, NamedTuple
+
+from text_fingerprints import TOKEN_RE
+
+# ==================== 配置区 ====================
+
+# 缓存的关键词数（一次挖掘 / 评分流程通常几千个词，流式评分时超出部分按 LRU 淘汰）
+TOKEN_CACHE_SIZE = 65536
+
+# ==================== 分词 ====================
+
+class KeywordTokens(NamedTuple):
+    """一个关键词的分词结果（全部小写、已驻留）"""
+    text: str
+    tokens: Tuple[str, ...]
+    words: Tuple[str, ...]
+    word_set: FrozenSet[str]
+
+    @property
+    def word_count(self) -> int:
+        """词数（按空白切分，与 len(keyword.split()) 一致）"""
+        return len(self.tokens)
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def keyword_tokens(keyword: str) -> KeywordTokens:
+    """关键词 → 分词结果（同一个关键词只分一次）"""
+    intern = sys.intern
+    text = intern(keyword.lower())
+    words = tuple(intern(w) for w in TOKEN_RE.findall(text))
+    return KeywordTokens(
+        text=text,
+        tokens=tuple(intern(t) for t in text.split()),
+        words=words,
+        word_set=frozenset(words),
+    )
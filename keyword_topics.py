@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗺️ Keyword Topics - 挖掘关键词的主题分组（稀疏 TF-IDF + mini-batch k-means）
+=========================================================================
+
+各步骤原来把每个关键词当成独立的个体：同一个主题（如 "pdf converter"）
+挖出几百个变体时，随机抽样会让它吃掉大部分 Trends 预算，报告里也看不出主题分布。
+
+这里把全部挖掘关键词分成若干主题：
+- 特征：词 + 相邻词对（去掉 free / online / 年份这类通用修饰词和 to / how 这类虚词），
+  次线性 TF × 平滑 IDF，行向量 L2 归一化，存成 scipy.sparse CSR 矩阵；
+  只保留文档频率最高的 MAX_FEATURES 个特征，几十万个关键词也只占几十 MB
+- 聚类：球面 mini-batch k-means（余弦相似度），每轮只看 BATCH_SIZE 行，
+  纯 numpy / scipy，不需要 GPU 和 sklearn
+- 主题名：质心权重最高的几个特征
+
+下游用法：
+- sample_per_topic(): 按主题轮流抽样，每个主题先出分数最高的词
+- topic_rollup(): 报告按主题汇总（词数、平均分、立即做数量、代表词）
+
+用法：
+    from keyword_topics import group_topics, sample_per_topic, topic_rollup
+    topics = group_topics(keywords)              # keyword / topic / topic_label
+    picked = sample_per_topic(df.merge(topics), 100, score_column="final_score")
+"""
+
+from datetime import datetime
+from typing import List, Dict, Optional, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from text_fingerprints import tokenize, KEYWORD_MODIFIERS, YEAR_RE
+
+# ==================== 配置区 ====================
+
+TOPIC_CONFIG = {
+    "KEYWORDS_PER_TOPIC": 50,   # 未指定主题数时：主题数 ≈ 关键词数 / 这个值
+    "MIN_TOPICS": 2,
+    "MAX_TOPICS": 200,
+    "MIN_DF": 2,                # 至少出现在这么多个关键词里的特征才保留
+    "MAX_DF_RATIO": 0.5,        # 出现在超过这个比例关键词里的特征太泛，丢掉
+    "MAX_FEATURES": 20000,      # 最多保留的特征数（按文档频率）
+    "BATCH_SIZE": 2048,         # mini-batch 行数
+    "MAX_ITERATIONS": 100,      # 最多迭代轮数
+    "N_INIT": 3,                # 不同初始化跑几次，取总相似度最高的一次
+    "ASSIGN_CHUNK": 20000,      # 全量分配时每块行数（控制 n × k 相似度矩阵的内存）
+    "LABEL_TERMS": 2,           # 主题名取质心权重最高的几个特征
+    "RANDOM_STATE": 1,
+}
+
+# 虚词：不参与主题特征（否则会出现 "pdf / to" 这样的主题名）
+FEATURE_STOPWORDS = frozenset([
+    "to", "how", "of", "in", "on", "for", "with", "and", "or", "is", "are", "my", "your",
+    "i", "can", "do", "what", "from", "into", "at", "by", "without",
+])
+
+# ==================== 工具函数 ====================
+
+def log_execution(message: str, level: str = "INFO"):
+    """日志记录"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}")
+
+def keyword_features(keyword: str) -> List[str]:
+    """关键词 → TF-IDF 特征（词 + 相邻词对，去掉通用修饰词、虚词和年份）"""
+    words = [w for w in tokenize(keyword)
+             if w not in KEYWORD_MODIFIERS and w not in FEATURE_STOPWORDS and not YEAR_RE.match(w)]
+    return words + [a + " " + b for a, b in zip(words, words[1:])]
+
+def default_topic_count(n_keywords: int) -> int:
+    topics = round(n_keywords / TOPIC_CONFIG["KEYWORDS_PER_TOPIC"])
+    return max(TOPIC_CONFIG["MIN_TOPICS"], min(TOPIC_CONFIG["MAX_TOPICS"], topics))
+
+# ==================== TF-IDF ====================
+
+def build_tfidf(keywords: List[str]) -> Tuple[sparse.csr_matrix, List[str]]:
+    """
+    关键词列表 → (L2 归一化的 TF-IDF CSR 矩阵 [关键词 × 特征], 特征列表)
+
+    矩阵直接由 indices / indptr 数组拼出来，不经过逐行的稀疏对象。
+    """
+    vocabulary: Dict[str, int] = {}
+    indices: List[int] = []
+    indptr = [0]
+    for keyword in keywords:
+        for feature in keyword_features(keyword):
+            indices.append(vocabulary.setdefault(feature, len(vocabulary)))
+        indptr.append(len(indices))
+
+    n_rows = len(keywords)
+    counts = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(n_rows, len(vocabulary)),
+    )
+    counts.sum_duplicates()
+    terms = np.array(list(vocabulary), dtype=object)
+
+    # 按文档频率挑特征
+    df = np.bincount(counts.indices, minlength=len(vocabulary))
+    keep = (df >= TOPIC_CONFIG["MIN_DF"]) & (df <= max(1, TOPIC_CONFIG["MAX_DF_RATIO"] * n_rows))
+    kept = np.flatnonzero(keep)
+    if len(kept) > TOPIC_CONFIG["MAX_FEATURES"]:
+        kept = kept[np.argsort(-df[kept], kind="stable")[:TOPIC_CONFIG["MAX_FEATURES"]]]
+        kept.sort()
+    counts = counts[:, kept]
+
+    # 次线性 TF × 平滑 IDF，行 L2 归一化
+    idf = (np.log((1 + n_rows) / (1 + df[kept])) + 1).astype(np.float32)
+    counts.data = 1 + np.log(counts.data)
+    tfidf = counts @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    tfidf = sparse.diags((1 / norms).astype(np.float32)) @ tfidf
+    return tfidf.tocsr().astype(np.float32), terms[kept].tolist()
+
+# ==================== Mini-batch k-means ====================
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+def _init_centroids(X: sparse.csr_matrix, k: int, rng: np.random.RandomState) -> np.ndarray:
+    """
+    k-means++ 初始化（在最多 20k 行的样本上做，按距离平方加权）
+
+    单位向量的欧氏距离平方 = 2(1 - cos)，所以权重直接用 1 - cos。
+    """
+    sample = rng.choice(X.shape[0], size=min(X.shape[0], max(20 * k, 2000), 20000), replace=False)
+    Xs = X[sample]
+    centroids = np.empty((k, X.shape[1]), dtype=np.float32)
+    centroids[0] = Xs[rng.randint(Xs.shape[0])].toarray()
+    distance = 1 - np.asarray(Xs @ centroids[0]).ravel()
+    for i in range(1, k):
+        weights = np.clip(distance, 0, None)  # 1 - cos 已经正比于距离平方
+        total = weights.sum()
+        pick = rng.choice(Xs.shape[0], p=weights / total) if total > 0 else rng.randint(Xs.shape[0])
+        centroids[i] = Xs[pick].toarray()
+        distance = np.minimum(distance, 1 - np.asarray(Xs @ centroids[i]).ravel())
+    return centroids
+
+def assign_topics(X: sparse.csr_matrix, centroids: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    每行分到余弦相似度最高的质心，返回 (主题编号, 总相似度)
+
+    分块计算，不生成完整的 n × k 矩阵。
+    """
+    chunk = TOPIC_CONFIG["ASSIGN_CHUNK"]
+    labels = np.empty(X.shape[0], dtype=np.int64)
+    total = 0.0
+    for start in range(0, X.shape[0], chunk):
+        similarity = np.asarray(X[start:start + chunk] @ centroids.T)
+        labels[start:start + chunk] = similarity.argmax(axis=1)
+        total += float(similarity.max(axis=1).sum())
+    return labels, total
+
+def _fit_centroids(X: sparse.csr_matrix, k: int, batch_size: int, max_iterations: int,
+                   rng: np.random.RandomState) -> np.ndarray:
+    """一次 mini-batch k-means（k-means++ 初始化），返回单位长度的质心"""
+    n = X.shape[0]
+    centroids = _init_centroids(X, k, rng)
+    counts = np.zeros(k, dtype=np.float64)
+
+    for _ in range(max_iterations):
+        batch = X[rng.choice(n, size=min(batch_size, n), replace=False)]
+        labels = np.asarray(batch @ centroids.T).argmax(axis=1)
+        batch_counts = np.bincount(labels, minlength=k)
+        counts += batch_counts
+
+        # 各质心本轮分到的行向量之和：指示矩阵 [k × b] × batch [b × 特征]
+        membership = sparse.csr_matrix(
+            (np.ones(len(labels), dtype=np.float32), (labels, np.arange(len(labels)))),
+            shape=(k, len(labels)),
+        )
+        sums = np.asarray((membership @ batch).todense())
+        updated = batch_counts > 0
+        rate = (batch_counts[updated] / counts[updated])[:, None]
+        centroids[updated] = (1 - rate) * centroids[updated] + rate * sums[updated] / batch_counts[updated, None]
+        centroids = _normalize_rows(centroids).astype(np.float32)
+
+    return centroids
+
+def minibatch_kmeans(X: sparse.csr_matrix, k: int,
+                     batch_size: Optional[int] = None,
+                     max_iterations: Optional[int] = None,
+                     random_state: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    球面 mini-batch k-means，返回 (每行的主题编号, 质心 [k × 特征])
+
+    每轮抽 batch_size 行分配到最近的质心，质心按累计计数做增量平均
+    （学习率 = 本轮新增 / 累计，越往后越稳定），再归一化到单位长度。
+    跑 N_INIT 次不同的初始化，取全部行与所属质心总相似度最高的一次。
+    """
+    batch_size = batch_size or TOPIC_CONFIG["BATCH_SIZE"]
+    max_iterations = max_iterations or TOPIC_CONFIG["MAX_ITERATIONS"]
+    rng = np.random.RandomState(TOPIC_CONFIG["RANDOM_STATE"] if random_state is None else random_state)
+    k = max(1, min(k, X.shape[0]))
+
+    best = None
+    for _ in range(TOPIC_CONFIG["N_INIT"]):
+        centroids = _fit_centroids(X, k, batch_size, max_iterations, rng)
+        labels, total = assign_topics(X, centroids)
+        if best is None or total > best[2]:
+            best = (labels, centroids, total)
+    return best[0], best[1]
+
+# ==================== 主题分组 ====================
+
+def topic_labels(centroids: np.ndarray, terms: List[str],
+                 n_terms: Optional[int] = None) -> List[str]:
+    """主题名：质心权重最高的几个特征，用 " / " 连接"""
+    n_terms = n_terms or TOPIC_CONFIG["LABEL_TERMS"]
+    labels = []
+    for centroid in centroids:
+        top = np.argsort(-centroid, kind="stable")[:n_terms]
+        labels.append(" / ".join(terms[i] for i in top if centroid[i] > 0) or "(其他)")
+    return labels
+
+def group_topics(keywords: Iterable[str], n_topics: Optional[int] = None) -> pd.DataFrame:
+    """
+    关键词主题分组，返回 keyword / topic / topic_label 三列（顺序与输入一致，去重）
+
+    没有任何可用特征的关键词（全是修饰词、或特征太稀有）单独归到 -1 "(其他)"。
+    """
+    keywords = list(dict.fromkeys(str(k) for k in keywords))
+    if not keywords:
+        return pd.DataFrame(columns=["keyword", "topic", "topic_label"])
+
+    X, terms = build_tfidf(keywords)
+    has_features = np.diff(X.indptr) > 0
+    topics = np.full(len(keywords), -1, dtype=np.int64)
+    names = {-1: "(其他)"}
+
+    rows = np.flatnonzero(has_features)
+    if len(rows) > 0:
+        k = n_topics or default_topic_count(len(rows))
+        labels, centroids = minibatch_kmeans(X[rows], k)
+        topics[rows] = labels
+        names.update(enumerate(topic_labels(centroids, terms)))
+
+    return pd.DataFrame({
+        "keyword": keywords,
+        "topic": topics,
+        "topic_label": [names[t] for t in topics],
+    })
+
+# ==================== 下游：抽样 / 汇总 ====================
+
+def sample_per_topic(df: pd.DataFrame, n: int, topic_column: str = "topic",
+                     score_column: Optional[str] = None,
+                     random_state: Optional[int] = None) -> pd.DataFrame:
+    """
+    按主题轮流抽样 n 行
+
+    每个主题内按 score_column 从高到低（没有分数列时随机）排队，
+    各主题轮流出一个，直到凑够 n 行；小主题先抽完，名额留给大主题。
+    """
+    if len(df) <= n:
+        return df
+    if score_column is not None and score_column in df.columns:
+        ordered = df.sort_values(score_column, ascending=False, kind="stable")
+    else:
+        ordered = df.sample(frac=1, random_state=random_state)
+    # 组内名次：第 0 轮每个主题的第一名，第 1 轮每个主题的第二名……
+    rank = ordered.groupby(topic_column, sort=False).cumcount()
+    return ordered.assign(_rank=rank.values).sort_values("_rank", kind="stable").head(n).drop(columns="_rank")
+
+def topic_rollup(df: pd.DataFrame, score_column: str = "final_score",
+                 decision_column: str = "decision",
+                 build_label: str = "🔴 BUILD NOW") -> pd.DataFrame:
+    """
+    按主题汇总：词数、平均分、最高分、立即做数量、代表词（分数最高的词）
+
+    按平均分从高到低排序。
+    """
+    if df.empty or "topic" not in df.columns:
+        return pd.DataFrame(columns=["topic", "topic_label", "keywords", "avg_score",
+                                     "max_score", "build_now", "top_keyword"])
+    ordered = df.sort_values(score_column, ascending=False, kind="stable") if score_column in df.columns else df
+    grouped = ordered.groupby("topic", sort=False)
+    rollup = pd.DataFrame({
+        "topic_label": grouped["topic_label"].first(),
+        "keywords": grouped.size(),
+        "top_keyword": grouped["keyword"].first(),
+    })
+    if score_column in df.columns:
+        rollup["avg_score"] = grouped[score_column].mean().round(1)
+        rollup["max_score"] = grouped[score_column].max()
+    if decision_column in df.columns:
+        rollup["build_now"] = grouped[decision_column].apply(lambda d: int((d == build_label).sum()))
+    rollup = rollup.reset_index()
+    sort_by = "avg_score" if "avg_score" in rollup.columns else "keywords"
+    return rollup.sort_values(sort_by, ascending=False, kind="stable").reset_index(drop=True)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔁 Offline Rescore - 用存下来的原始信号离线重算评分（不联网）
+==========================================================
+
+改了 THRESHOLDS、评分规则（FINAL_SCORE_WEIGHTS 等分档、VALIDATION_RULES）、意图词表或域名分类表之后，
+原来只能重跑一遍完整流程（Trends + SERP，一个多小时）。这里只读本地数据：
+
+- 每个词的原始信号：结果库里每个词最近一次记录的特征
+  （GPTs 比值 avg_ratio、增长 growth、竞争度、降维打击……），
+  或者指定一份之前的 ultimate_final_results.csv
+- SERP 域名：serp_archive 里存档的 Google SERP（词本身或它的簇代表词），
+  用当前的 domain_categories.tsv 重新判断竞争度 / 降维打击；没有存档的词沿用原来的竞争度
+- Reddit 汇总：结果库里每个词最近一次的验证汇总，按当前规则重算综合验证分
+
+然后重算意图评分、用户意图和终极评分（calculate_final_scores，向量化），
+和存下来的旧决策对比，输出两个 CSV：全部重算结果 + 决策变化的词。
+
+用法：
+    python offline_rescore.py                               # 结果库里每个词最近一次的信号
+    python offline_rescore.py --input data/ultimate_final_results.csv
+    python offline_rescore.py --no-serp-archive             # 竞争度沿用原来的结果
+    python profit_hunter_ultimate.py --rescore              # 同上（默认参数）
+"""
+
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from profit_hunter_ultimate import (
+    score_intent_columns, calculate_final_scores, INTENT_COLUMNS, USER_INTENT_COLUMNS,
+    DATA_DIR, log_execution
+)
+from parallel_scoring import parallel_map_chunks
+from validation_store import latest_candidate_features, latest_validations, canonical_keyword
+
+# ==================== 配置区 ====================
+
+RESCORE_CONFIG = {
+    "USE_SERP_ARCHIVE": True,   # 有 Google SERP 存档的词按当前域名分类重算竞争度
+    "USE_VALIDATIONS": True,    # 带上结果库里的 Reddit / SERP 验证汇总并重算验证分
+    "SERP_ENGINE": "google",    # ultimate 的 SERP 分析用 Google（ddg 是 lite 的决策矩阵）
+}
+
+DEFAULT_RESULTS_CSV = os.path.join(DATA_DIR, "ultimate_final_results.csv")
+
+# 重算时覆盖的评分列（原来的 decision / final_score 改名保留，用来对比）
+SCORE_COLUMNS = ["trend_score", "competition_score", "buildability_score", "final_score", "decision"]
+PREVIOUS_COLUMNS = {"decision": "previous_decision", "final_score": "previous_final_score"}
+
+# 结果库验证汇总里带进结果的列
+VALIDATION_COLUMNS = ["reddit_score", "reddit_mentions", "pain_signals", "real_complaints",
+                      "has_market_gap", "commercial_intent", "tool_results", "forum_results"]
+
+# ==================== 读取原始信号 ====================
+
+def load_stored_signals(input_path: Optional[str] = None) -> Tuple[pd.DataFrame, str]:
+    """
+    读取之前运行存下的逐词原始信号，返回 (DataFrame, 来源说明)
+
+    input_path 为空时用结果库（每个词最近一次的特征），结果库为空再退回最近一次的结果 CSV。
+    """
+    if input_path is None:
+        rows = latest_candidate_features()
+        if rows:
+            return pd.DataFrame(rows), "结果库 candidate_features"
+        input_path = DEFAULT_RESULTS_CSV
+
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"没有可重算的原始信号: {input_path}")
+    return pd.read_csv(input_path, encoding='utf-8-sig'), input_path
+
+def apply_serp_archive(df: pd.DataFrame, engine: str = RESCORE_CONFIG["SERP_ENGINE"]) -> int:
+    """
+    有存档 SERP 的词：按当前域名分类重算 competition / 降维打击 / top_domains（原地修改）
+
+    先找词本身的存档，没有再找它的簇代表词（只有代表词抓过 SERP）。返回重算的词数。
+    """
+    from serp_archive import iter_index, rescore_entry, BLOB_READ_ERRORS
+
+    entries = {entry["keyword"]: entry for entry in iter_index(engine=engine)}
+    if not entries:
+        return 0
+
+    clusters = df["cluster"] if "cluster" in df.columns else df["keyword"]
+    scored: Dict[str, Optional[Dict]] = {}  # 同一份存档（簇代表词）只解析一次
+    updates = {}
+    for index, keyword, cluster in zip(df.index, df["keyword"], clusters):
+        source = keyword if keyword in entries else cluster
+        if source not in entries:
+            continue
+        if source not in scored:
+            try:
+                scored[source] = rescore_entry(entries[source])
+            except BLOB_READ_ERRORS as e:
+                log_execution(f"⚠️ 读取存档失败 '{source}': {str(e)[:50]}", "WARNING")
+                scored[source] = None
+        if scored[source] is not None:
+            updates[index] = scored[source]
+
+    if updates:
+        rescored = pd.DataFrame.from_dict(updates, orient="index")
+        for column in ("competition", "降维打击", "top_domains"):
+            df[column] = df[column].astype(object) if column in df.columns else None
+            df.loc[rescored.index, column] = rescored[column]
+        df.loc[rescored.index, "reason"] = "存档 SERP 重算"
+    return len(updates)
+
+def attach_validations(df: pd.DataFrame) -> int:
+    """
+    带上结果库里每个词最近一次的验证汇总，按当前规则重算验证分（原地修改）
+
+    原来的验证分 / 结论保存为 previous_validation_score / previous_is_real_need。返回匹配的词数。
+    """
+    from profit_hunter_deep_validation import calculate_validation_scores
+
+    stored = latest_validations()
+    matched = [stored.get(canonical_keyword(str(kw))) for kw in df["keyword"]]
+    if not any(matched):
+        return 0
+
+    validations = pd.DataFrame([row or {} for row in matched], index=df.index)
+    for column in VALIDATION_COLUMNS:
+        df[column] = validations.get(column)
+    df["previous_validation_score"] = validations.get("validation_score")
+    df["previous_is_real_need"] = validations.get("is_real_need").map(
+        lambda v: None if pd.isna(v) else bool(v))
+
+    has_validation = validations["validated_at"].notna()
+    scores = calculate_validation_scores(df[has_validation])
+    df["validation_score"] = scores["validation_score"]
+    df["is_real_need"] = scores["is_real_need"].astype(object)
+    return int(has_validation.sum())
+
+# ==================== 重算 ====================
+
+def rescore_signals(df: pd.DataFrame) -> pd.DataFrame:
+    """重算意图评分、用户意图和终极评分（全部列运算 / 多进程分块，不联网）"""
+    df = df.rename(columns=PREVIOUS_COLUMNS).drop(columns=SCORE_COLUMNS, errors="ignore")
+    df = df.dropna(subset=["keyword"]).drop_duplicates(subset=["keyword"], keep="last")
+    df = df.reset_index(drop=True)
+    df["keyword"] = df["keyword"].astype(str)
+
+    columns = parallel_map_chunks(score_intent_columns, df["keyword"].tolist())
+    for column in INTENT_COLUMNS + USER_INTENT_COLUMNS:
+        df[column] = columns[column]
+
+    scores = calculate_final_scores(df)
+    for column in scores.columns:
+        df[column] = scores[column]
+    return df
+
+def decision_diff(df: pd.DataFrame) -> pd.DataFrame:
+    """决策（或验证结论）变化的词，按新分数从高到低"""
+    if "previous_decision" not in df.columns:
+        return df.iloc[:0]
+    changed = df["decision"] != df["previous_decision"]
+    if "previous_is_real_need" in df.columns:
+        verdict = df["previous_is_real_need"].notna() & (df["is_real_need"] != df["previous_is_real_need"])
+        changed |= verdict
+
+    columns = ["keyword", "previous_decision", "decision", "previous_final_score", "final_score"]
+    if "previous_is_real_need" in df.columns:
+        columns += ["previous_is_real_need", "is_real_need",
+                    "previous_validation_score", "validation_score"]
+    diff = df.loc[changed, columns].copy()
+    diff.insert(5, "score_change", (pd.to_numeric(diff["final_score"]) -
+                                    pd.to_numeric(diff["previous_final_score"], errors="coerce")).round(1))
+    return diff.sort_values("final_score", ascending=False)
+
+def run_rescore(input_path: Optional[str] = None, output_path: Optional[str] = None,
+                use_serp_archive: bool = RESCORE_CONFIG["USE_SERP_ARCHIVE"],
+                use_validations: bool = RESCORE_CONFIG["USE_VALIDATIONS"]) -> Tuple[str, pd.DataFrame, pd.DataFrame]:
+    """
+    离线重算全部存下来的词，返回 (结果 CSV 路径, 重算结果, 决策变化)
+
+    决策变化另存为同名的 *_diff.csv。
+    """
+    start = time.perf_counter()
+    df, source = load_stored_signals(input_path)
+    log_execution(f"🔁 离线重算 {len(df)} 个词（来源: {source}）")
+
+    if use_serp_archive:
+        log_execution(f"🗄️ 存档 SERP 重算竞争度: {apply_serp_archive(df)} 个词")
+    if use_validations:
+        log_execution(f"🗃️ 带上验证汇总: {attach_validations(df)} 个词")
+
+    df = rescore_signals(df).sort_values("final_score", ascending=False)
+    diff = decision_diff(df)
+
+    if output_path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = os.path.join(DATA_DIR, f"ultimate_rescore_{timestamp}.csv")
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    diff_path = os.path.splitext(output_path)[0] + "_diff.csv"
+    diff.to_csv(diff_path, index=False, encoding='utf-8-sig')
+
+    # 统计
+    for decision, count in df["decision"].value_counts().items():
+        log_execution(f"   {decision}: {count}")
+    if "previous_decision" in diff.columns:
+        transitions = diff.loc[diff["decision"] != diff["previous_decision"]]
+        for (before, after), count in transitions.groupby(
+                [transitions["previous_decision"].fillna("(无)"), "decision"]).size().items():
+            log_execution(f"   {before} → {after}: {count}")
+    log_execution(f"🔀 决策 / 验证结论变化: {len(diff)} 个词 → {diff_path}")
+    log_execution(f"✅ 重算结果已保存: {output_path}（{time.perf_counter() - start:.1f} 秒）")
+    return output_path, df, diff
+
+# ==================== CLI ====================
+
+def add_rescore_arguments(parser):
+    """--input / --output / --no-serp-archive / --no-validations（ultimate 的 --rescore 共用）"""
+    parser.add_argument('--input', type=str, default=None,
+                        help='原始信号 CSV（默认用结果库里每个词最近一次的特征）')
+    parser.add_argument('--output', type=str, default=None, help='输出 CSV 路径')
+    parser.add_argument('--no-serp-archive', action='store_true', help='竞争度沿用原来的结果，不读 SERP 存档')
+    parser.add_argument('--no-validations', action='store_true', help='不带结果库的验证汇总')
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='用存下来的原始信号离线重算终极评分（不联网）')
+    add_rescore_arguments(parser)
+    args = parser.parse_args(argv)
+
+    run_rescore(input_path=args.input, output_path=args.output,
+                use_serp_archive=not args.no_serp_archive,
+                use_validations=not args.no_validations)
+
+if __name__ == "__main__":
+    main()
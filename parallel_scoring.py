@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡ Parallel Scoring - 关键词评分 / 筛选的多进程执行
+==================================================
+
+意图评分、用户意图、filter_candidates、filter_and_score 都是纯 CPU 计算，
+关键词一多就卡在单核上。这里把关键词切块分给多个子进程：
+
+- 块函数 chunk_func(关键词列表) 返回列式结果 {列名: [值, ...]}，
+  比逐行字典传回主进程更紧凑，主进程按块顺序拼接，结果与串行完全一致
+  （串行路径就是对整批调用同一个块函数）
+- Linux/macOS 用 fork 启动子进程：模块级已编译好的词表 / 正则
+  （KEYWORD_CLASSIFIER 等）按写时复制直接共享，不用重新编译；
+  Windows 只能 spawn，每个子进程导入模块时编译一次
+- 关键词少于 MIN_PARALLEL_ITEMS 时直接串行，省掉进程启动开销
+
+用法：
+    from parallel_scoring import parallel_map_chunks, to_records
+    columns = parallel_map_chunks(score_intent_columns, keywords)
+"""
+
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Callable, Iterable, Iterator, Optional, Any
+
+# ==================== 配置区 ====================
+
+PARALLEL_CONFIG = {
+    "WORKERS": os.cpu_count() or 1,   # 子进程数（1 = 串行）
+    "CHUNK_SIZE": 5000,               # 每块关键词数
+    "MIN_PARALLEL_ITEMS": 20000,      # 少于这么多关键词时串行
+    "MAX_PENDING_PER_WORKER": 2,      # 流式模式下每个进程最多排队的块数
+}
+
+# ==================== 列式结果 ====================
+
+def to_columns(records: List[Dict], columns: Optional[List[str]] = None) -> Dict[str, list]:
+    """[{列: 值}, ...] → {列: [值, ...]}（columns 默认取第一行的键）"""
+    if columns is None:
+        columns = list(records[0]) if records else []
+    return {column: [record[column] for record in records] for column in columns}
+
+def to_records(columns: Dict[str, list]) -> List[Dict]:
+    """{列: [值, ...]} → [{列: 值}, ...]"""
+    if not columns:
+        return []
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+def concat_columns(parts: Iterable[Dict[str, list]]) -> Dict[str, list]:
+    """按顺序拼接多块列式结果"""
+    result: Dict[str, list] = {}
+    for part in parts:
+        for column, values in part.items():
+            result.setdefault(column, []).extend(values)
+    return result
+
+# ==================== 进程池 ====================
+
+def _mp_context():
+    """能 fork 就 fork（已编译的词表写时复制共享），否则 spawn"""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("spawn")
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    return max(1, workers if workers is not None else PARALLEL_CONFIG["WORKERS"])
+
+def parallel_map_chunks(chunk_func: Callable[[List], Dict[str, list]], items: Iterable,
+                        workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                        min_items: Optional[int] = None) -> Dict[str, list]:
+    """
+    把 items 切块并行调用 chunk_func，按原顺序拼接列式结果
+
+    chunk_func 必须是模块级函数（子进程按名字找到它）。
+    workers <= 1 或 items 少于 min_items 时直接 chunk_func(items)。
+    """
+    items = list(items)
+    workers = resolve_workers(workers)
+    chunk_size = chunk_size or PARALLEL_CONFIG["CHUNK_SIZE"]
+    if min_items is None:
+        min_items = PARALLEL_CONFIG["MIN_PARALLEL_ITEMS"]
+
+    if workers <= 1 or len(items) < max(min_items, 2 * chunk_size):
+        return chunk_func(items)
+
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=_mp_context()) as executor:
+        return concat_columns(executor.map(chunk_func, chunks))
+
+def iter_parallel_chunks(chunk_func: Callable[[List], Any], chunks: Iterable[List],
+                         workers: Optional[int] = None) -> Iterator[Any]:
+    """
+    流式版本：逐块并行处理，按输入顺序逐块返回 chunk_func 的结果
+
+    同时在途的块数不超过 workers * MAX_PENDING_PER_WORKER，
+    读取不会跑到处理前面，内存占用保持平稳。
+    """
+    workers = resolve_workers(workers)
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk_func(chunk)
+        return
+
+    max_pending = workers * PARALLEL_CONFIG["MAX_PENDING_PER_WORKER"]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(chunk_func, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔎 Pattern Matcher - 多模式信号词匹配（一次线性扫描）
+=====================================================
+
+把一组信号词（痛点词、工具词、对比词……）编译成一个正则，
+对每段文本只扫描一遍，就能找出所有信号词的所有出现位置。
+
+实现方式：
+- 信号词先建成字典树（trie），再展开成前缀共享的正则，
+  每个位置最多匹配到最长信号词的长度，整体是线性扫描；
+- 外层用零宽前瞻 (?=(...)) 包住，相邻/重叠的信号词也都能找到；
+- 同一位置只会匹配到最长的那个词，再按预先算好的前缀表补上
+  更短的词（如 "how to fix" 补出 "how to"），结果和 Aho-Corasick 一致。
+
+用法：
+    matcher = PatternMatcher({"pain": [...], "tool": [...]})   # 进程内编译一次
+    matcher.find_all(text)          # [PatternMatch(start, end, pattern), ...]
+    matcher.first_in_groups(text)   # {"pain": "how to", "tool": "converter"}
+
+whole_words=True 时只保留前后都不是字母/数字的命中（"api" 不会命中 "rapid"）。
+"""
+
+import re
+from typing import List, Dict, Set, Union, Iterable, Iterator, NamedTuple
+
+DEFAULT_GROUP = "default"
+
+class PatternMatch(NamedTuple):
+    """一次命中：在（小写后的）文本中的起止位置和信号词"""
+    start: int
+    end: int
+    pattern: str
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+# ==================== 编译 ====================
+
+def _build_trie(patterns: Iterable[str]) -> Dict:
+    """信号词 → 字典树，"" 键表示一个词在此结束"""
+    root = {}
+    for pattern in patterns:
+        node = root
+        for ch in pattern:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return root
+
+def _trie_to_regex(node: Dict) -> str:
+    """字典树 → 前缀共享的正则（贪婪，同一位置优先匹配最长的词）"""
+    branches = [re.escape(ch) + _trie_to_regex(child)
+                for ch, child in sorted(node.items()) if ch != ""]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        body = "(?:" + body + ")?"
+    return body
+
+# ==================== 匹配器 ====================
+
+class PatternMatcher:
+    """
+    多模式匹配器
+
+    patterns 可以是词列表，也可以是 {分组名: 词列表}；
+    同一个词可以出现在多个分组里。匹配不区分大小写（信号词和文本都转小写），
+    返回的位置是相对小写后文本的。whole_words=True 时只返回整词命中。
+    """
+
+    def __init__(self, patterns: Union[Iterable[str], Dict[str, Iterable[str]]],
+                 whole_words: bool = False):
+        self.whole_words = whole_words
+        if not isinstance(patterns, dict):
+            patterns = {DEFAULT_GROUP: patterns}
+
+        # 分组内保留原始顺序（first_in_groups 按这个顺序取第一个命中的词）
+        self.groups: Dict[str, List[str]] = {
+            group: [p.lower() for p in words if p]
+            for group, words in patterns.items()
+        }
+        self.patterns: Set[str] = {p for words in self.groups.values() for p in words}
+
+        # 前缀表：最长词 → 同一位置开始、也命中的更短的词（按长度升序）
+        self._prefixes: Dict[str, List[str]] = {
+            p: sorted((q for q in self.patterns if q != p and p.startswith(q)), key=len)
+            for p in self.patterns
+        }
+
+        if self.patterns:
+            self._regex = re.compile("(?=(" + _trie_to_regex(_build_trie(self.patterns)) + "))")
+        else:
+            self._regex = None
+
+    def finditer(self, text: str) -> Iterator[PatternMatch]:
+        """逐个返回所有命中（按起始位置，同一位置先短后长）"""
+        if self._regex is None or not text:
+            return
+        text = text.lower()
+        for m in self._regex.finditer(text):
+            start = m.start()
+            if self.whole_words and start > 0 and _is_word_char(text[start - 1]):
+                continue
+            longest = m.group(1)
+            for pattern in self._prefixes[longest] + [longest]:
+                end = start + len(pattern)
+                if self.whole_words and end < len(text) and _is_word_char(text[end]):
+                    continue
+                yield PatternMatch(start, end, pattern)
+
+    def find_all(self, text: str) -> List[PatternMatch]:
+        """所有命中（含位置）"""
+        return list(self.finditer(text))
+
+    def matched_patterns(self, text: str) -> Set[str]:
+        """文本中出现过的信号词集合"""
+        return {match.pattern for match in self.finditer(text)}
+
+    def first_in_groups(self, text: str) -> Dict[str, str]:
+        """
+        每个分组按词表顺序取第一个出现的词
+
+        与原来 "for trigger in 词表: if trigger in text: ... break" 的写法结果一致，
+        但整段文本只扫描一次。没有命中的分组不出现在结果里。
+        """
+        found = self.matched_patterns(text)
+        if not found:
+            return {}
+        result = {}
+        for group, words in self.groups.items():
+            for pattern in words:
+                if pattern in found:
+                    result[group] = pattern
+                    break
+        return result
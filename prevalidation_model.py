@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 Pre-validation Model - 预测哪些词值得深度验证
+================================================
+
+深度验证（Reddit + Google）是每个词最贵的一步。这里用历史验证结论训练一个
+很小的逻辑回归（纯 numpy），根据 ultimate 已经算好的特征预测 is_real_need 的概率：
+    intent_score、avg_ratio、growth、词数、降维打击、
+    competition（独热）、user_intent（多热）
+
+选词时按期望价值排序：P(真实需求) × final_score，
+再留一小部分名额随机探索，避免模型只验证自己已经看好的词。
+训练样本不足或还没有模型时，退回按 final_score 排序。
+
+离线重新训练：
+    python prevalidation_model.py train
+    python prevalidation_model.py stats
+"""
+
+import os
+import sys
+import json
+import math
+import random
+from datetime import datetime
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from keyword_tokens import keyword_tokens
+from validation_store import training_rows, VALIDATION_DIR
+
+# ==================== 配置区 ====================
+
+MODEL_FILE = os.path.join(VALIDATION_DIR, "prevalidation_model.json")
+
+PREVALIDATION_CONFIG = {
+    "MIN_TRAIN_SAMPLES": 30,    # 少于这么多条验证历史就不训练
+    "EXPLORE_FRACTION": 0.1,    # 验证名额里留给随机探索的比例
+    "L2": 1.0,                  # L2 正则强度
+    "LEARNING_RATE": 0.5,       # 梯度下降步长（特征已标准化）
+    "EPOCHS": 1000,             # 迭代次数
+}
+
+# ==================== 工具函数 ====================
+
+def log_execution(message: str, level: str = "INFO"):
+    """日志记录"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}")
+
+def _to_float(value) -> float:
+    """数值 / 布尔 / CSV 读出的字符串 → float（NaN 和无法解析的按 0）"""
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return 1.0 if value.strip().lower() == "true" else 0.0
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if math.isnan(value) else value
+
+def _competition_level(competition) -> str:
+    """"🟢 WEAK" → "WEAK"（去掉前面的表情）"""
+    if not isinstance(competition, str) or not competition.strip():
+        return "UNKNOWN"
+    return competition.split()[-1].upper()
+
+def _user_intents(user_intent) -> List[str]:
+    if not isinstance(user_intent, str) or user_intent == "无明确意图":
+        return []
+    return [i.strip() for i in user_intent.split(",") if i.strip()]
+
+# ==================== 特征 ====================
+
+def extract_features(row: Dict) -> Dict[str, float]:
+    """ultimate 的一行结果 → 稀疏特征字典"""
+    features = {
+        "intent_score": _to_float(row.get("intent_score")),
+        "avg_ratio": _to_float(row.get("avg_ratio")),
+        "growth": _to_float(row.get("growth")),
+        "word_count": float(keyword_tokens(str(row.get("keyword", ""))).word_count),
+        "降维打击": _to_float(row.get("降维打击")),
+    }
+    features[f"competition={_competition_level(row.get('competition'))}"] = 1.0
+    for intent in _user_intents(row.get("user_intent")):
+        features[f"intent={intent}"] = 1.0
+    return features
+
+def _vectorize(feature_dicts: List[Dict[str, float]], feature_names: List[str]) -> np.ndarray:
+    index = {name: i for i, name in enumerate(feature_names)}
+    X = np.zeros((len(feature_dicts), len(feature_names)))
+    for r, features in enumerate(feature_dicts):
+        for name, value in features.items():
+            if name in index:
+                X[r, index[name]] = value
+    return X
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+# ==================== 训练 ====================
+
+def train_model(rows: Optional[List[Dict]] = None, save: bool = True) -> Optional[Dict]:
+    """
+    用验证历史训练逻辑回归，返回模型字典（样本不足时返回 None）
+
+    rows 默认取 validation_store.training_rows()
+    """
+    if rows is None:
+        rows = training_rows()
+
+    if len(rows) < PREVALIDATION_CONFIG["MIN_TRAIN_SAMPLES"]:
+        log_execution(f"⚠️ 验证历史只有 {len(rows)} 条（需要 {PREVALIDATION_CONFIG['MIN_TRAIN_SAMPLES']}），"
+                      f"暂不训练", "WARNING")
+        return None
+
+    feature_dicts = [extract_features(r["features"]) for r in rows]
+    y = np.array([1.0 if r["is_real_need"] else 0.0 for r in rows])
+
+    feature_names = sorted({name for f in feature_dicts for name in f})
+    X = _vectorize(feature_dicts, feature_names)
+
+    # 标准化（独热列也一起标准化，预测时用同样的均值和标准差）
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    Xs = (X - mean) / std
+
+    n, d = Xs.shape
+    w = np.zeros(d)
+    b = math.log((y.mean() + 1e-6) / (1 - y.mean() + 1e-6))  # 从正样本比例起步
+    lr = PREVALIDATION_CONFIG["LEARNING_RATE"]
+    l2 = PREVALIDATION_CONFIG["L2"]
+
+    for _ in range(PREVALIDATION_CONFIG["EPOCHS"]):
+        p = _sigmoid(Xs @ w + b)
+        error = p - y
+        w -= lr * (Xs.T @ error / n + l2 * w / n)
+        b -= lr * error.mean()
+
+    p = _sigmoid(Xs @ w + b)
+    eps = 1e-9
+    log_loss = float(-np.mean(y * np.log(p + eps) + (1 - y) * np.log(1 - p + eps)))
+    accuracy = float(np.mean((p >= 0.5) == (y == 1)))
+
+    model = {
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "n_samples": n,
+        "positive_rate": float(y.mean()),
+        "train_accuracy": accuracy,
+        "train_log_loss": log_loss,
+        "feature_names": feature_names,
+        "mean": mean.tolist(),
+        "std": std.tolist(),
+        "weights": w.tolist(),
+        "bias": float(b)
+    }
+
+    log_execution(f"✅ 预验证模型训练完成: {n} 条样本，正样本 {y.mean():.1%}，"
+                  f"训练准确率 {accuracy:.1%}，log loss {log_loss:.3f}")
+
+    if save:
+        os.makedirs(os.path.dirname(MODEL_FILE), exist_ok=True)
+        with open(MODEL_FILE, "w", encoding="utf-8") as f:
+            json.dump(model, f, ensure_ascii=False, indent=2)
+    return model
+
+def load_model(path: str = MODEL_FILE) -> Optional[Dict]:
+    """读取模型，没有时返回 None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# ==================== 预测与选词 ====================
+
+def predict_proba(model: Dict, rows: List[Dict]) -> np.ndarray:
+    """每行的 P(is_real_need)"""
+    X = _vectorize([extract_features(r) for r in rows], model["feature_names"])
+    Xs = (X - np.array(model["mean"])) / np.array(model["std"])
+    return _sigmoid(Xs @ np.array(model["weights"]) + model["bias"])
+
+def select_for_validation(rows: List[Dict], max_keywords: int,
+                          model: Optional[Dict] = None) -> List[str]:
+    """
+    从 ultimate 结果里挑出要深度验证的关键词（按期望价值排序）
+
+    期望价值 = P(真实需求) × final_score；EXPLORE_FRACTION 的名额从剩下的词里随机抽。
+    没有模型时按 final_score 取前 max_keywords 个（原来的行为）。
+    """
+    if model is None:
+        model = load_model()
+
+    def value(row: Dict) -> float:
+        return max(_to_float(row.get("final_score")), 1.0)
+
+    if model is None or not rows:
+        ranked = sorted(rows, key=value, reverse=True)
+        return [r["keyword"] for r in ranked[:max_keywords]]
+
+    probs = predict_proba(model, rows)
+    scored = sorted(zip(rows, probs), key=lambda x: x[1] * value(x[0]), reverse=True)
+
+    n_explore = int(max_keywords * PREVALIDATION_CONFIG["EXPLORE_FRACTION"])
+    n_exploit = max_keywords - n_explore
+    selected = [r["keyword"] for r, _ in scored[:n_exploit]]
+    rest = [r["keyword"] for r, _ in scored[n_exploit:]]
+    selected += random.sample(rest, min(n_explore, len(rest)))
+
+    log_execution(f"🧪 预验证模型选词: 期望价值前 {min(n_exploit, len(scored))} 个 + "
+                  f"随机探索 {len(selected) - min(n_exploit, len(scored))} 个"
+                  f"（模型训练于 {model['trained_at']}，{model['n_samples']} 条样本）")
+    return selected
+
+# ==================== CLI ====================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='预验证模型（离线训练）')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('train', help='用验证历史重新训练模型')
+    subparsers.add_parser('stats', help='显示当前模型信息和最重要的特征')
+
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        train_model()
+    elif args.command == 'stats':
+        model = load_model()
+        if model is None:
+            print("还没有训练好的模型")
+            return
+        for key in ("trained_at", "n_samples", "positive_rate", "train_accuracy", "train_log_loss"):
+            print(f"{key}: {model[key]}")
+        weights = sorted(zip(model["feature_names"], model["weights"]), key=lambda x: -abs(x[1]))
+        print("top features:")
+        for name, weight in weights[:10]:
+            print(f"  {name}: {weight:+.3f}")
+
+if __name__ == "__main__":
+    sys.exit(main())
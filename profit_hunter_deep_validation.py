@@ -18,13 +18,25 @@
 
 import os
 import sys
+import math
 import time
 import json
-import requests
+import asyncio
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from urllib.parse import quote, urlencode
+from serp_extractors import analyze_serp_document, load_serp_signals
+from http_pool import get_session, HostRateLimiter
+from reddit_client import RedditClient
+from validation_store import (
+    save_validations, load_recent_validations, score_history, save_candidate_features
+)
+from prevalidation_model import select_for_validation
+from pattern_matcher import PatternMatcher
+from reddit_evidence import RedditEvidence, update_reddit_evidence, update_reddit_batch, plan_reddit_batches
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -36,7 +48,13 @@ VALIDATION_DIR = os.path.join(DATA_DIR, "validation")
 
 # 深度验证配置
 VALIDATION_CONFIG = {
-    "REDDIT_SEARCH_LIMIT": 20,       # 每个关键词搜索Reddit的帖子数
+    "REDDIT_SEARCH_LIMIT": 20,       # Reddit 每页帖子数
+    "REDDIT_MAX_POSTS": 100,         # 每个关键词最多翻看的帖子数
+    "REDDIT_TIME_BUDGET": 30,        # 每个关键词翻页的时间预算（秒）
+    "REDDIT_TOP_COMPLAINTS": 10,     # 保留互动量最高的真实抱怨条数
+    "REDDIT_EMPTY_PAGE_STOP": 2,     # 连续几页没有痛点信号就停止翻页
+    "REDDIT_FULL_REFRESH_DAYS": 30,  # 增量验证：每隔几天做一次完整重扫
+    "REDDIT_BATCH_SIZE": 5,          # 共享种子词的关键词合并成一个 OR 查询（1 = 不合并）
     "GOOGLE_SERP_LIMIT": 10,         # 每个关键词搜索Google的结果数
     "PAIN_KEYWORDS": [                # 痛点信号词
         "how to", "can't", "cannot", "problem", "issue", "help",
@@ -46,9 +64,45 @@ VALIDATION_CONFIG = {
         "there should be", "why is there no"
     ],
     "VALIDATION_THRESHOLD": 3,        # 最少需要3个真实需求验证
-    "MAX_CONCURRENT": 5,              # 最大并发验证数
+    "MAX_CONCURRENT": 5,              # 最大并发验证数（同时验证的关键词数）
+    "REDDIT_MAX_CONCURRENT": 2,       # 同时进行的 Reddit 批次数（专用线程池，不占 SERP 的线程）
+    "REDDIT_MIN_INTERVAL": 1.0,       # Reddit 还没返回限速头时的请求间隔（秒），之后按限速头自动调整
+    "GOOGLE_MIN_INTERVAL": 3.0,       # Google 相邻请求最小间隔（秒），避免被封
+    "RATE_JITTER": 0.5,               # 间隔随机抖动（秒）
+    "SERP_SIGNAL_TTL_HOURS": 24,      # 已存 SERP 信号的有效期（小时），期内不重复抓取
+    "RESULT_TTL_HOURS": 24,           # 验证结果有效期（小时），期内直接从结果库读取
+    "REDDIT_RUN_SECONDS": 1800,       # 一次验证里 Reddit 可用的时间（秒），按剩余额度估算能验证几个词
+    "REDDIT_WINDOW_SECONDS": 600,     # Reddit 限速窗口长度（秒），估算运行期间还会重置几次额度
 }
 
+# 综合验证规则：逐个验证的 combine_validation 和向量化的 calculate_validation_scores
+# （--rescore 离线重算用）都从这里读，改权重 / 分数线只改这里
+VALIDATION_RULES = {
+    "REDDIT_MIN_SCORE": 30,        # Reddit 分数超过它才计入
+    "REDDIT_WEIGHT": 0.5,          # Reddit贡献 (50%)
+    "MARKET_GAP_SCORE": 30,        # SERP：市场空白（论坛需求多但工具少）
+    "FORUM_SCORE": 15,             # SERP：只有论坛讨论
+    "COMMERCIAL_MIN_INTENT": 20,   # 商业意图超过它才加分
+    "COMMERCIAL_SCORE": 20,        # 商业意图贡献 (20%)
+    "REAL_NEED_SCORE": 50,         # 综合分达到它算真实需求
+}
+
+# batch_validate_keywords 返回的列
+RESULT_COLUMNS = ["keyword", "is_real_need", "validation_score", "reddit_mentions", "pain_signals",
+                  "real_complaints", "has_market_gap", "commercial_intent", "reasoning", "from_store"]
+
+# 痛点信号词编译成一个匹配器（进程内只编译一次）
+PAIN_MATCHER = PatternMatcher(VALIDATION_CONFIG["PAIN_KEYWORDS"])
+
+# Google 按主机限速（替代原来固定的 sleep），并发验证时各线程共享
+VALIDATION_RATE_LIMITER = HostRateLimiter(
+    min_interval=VALIDATION_CONFIG["GOOGLE_MIN_INTERVAL"],
+    jitter=VALIDATION_CONFIG["RATE_JITTER"]
+)
+
+# Reddit 按 x-ratelimit-* 响应头控制节奏，把每个窗口的额度均匀用完
+REDDIT_CLIENT = RedditClient(get_session(), default_interval=VALIDATION_CONFIG["REDDIT_MIN_INTERVAL"])
+
 # ==================== 工具函数 ====================
 
 def ensure_dirs():
@@ -66,89 +120,98 @@ def log_execution(message: str, level: str = "INFO"):
 
 def search_reddit_pain_points(keyword: str) -> Dict:
     """
-    在Reddit搜索关键词相关的痛点讨论
+    在Reddit搜索关键词相关的痛点讨论（沿 after 游标分页，流式评分）
+    
+    之前验证过的词只抓上次之后的新帖子，在已存的累计值上增量评分。
     
     返回：
     {
         "total_mentions": 整数,
-        "pain_signals": 痛点信号列表,
-        "real_complaints": 真实抱怨列表,
+        "pain_signal_count": 痛点信号总数,
+        "pain_signals": {信号词: 出现帖子数},
+        "complaint_count": 真实抱怨总数,
+        "real_complaints": 互动量最高的 Top N 条真实抱怨,
         "validation_score": 需求验证分数 (0-100)
     }
     """
     log_execution(f"🔍 Reddit验证: {keyword}")
     
-    result = {
-        "total_mentions": 0,
-        "pain_signals": [],
-        "real_complaints": [],
-        "validation_score": 0
-    }
+    # 使用 Reddit API（不需要OAuth的公开搜索），按相关度排序、过去一年
+    try:
+        evidence = update_reddit_evidence(keyword, PAIN_MATCHER, REDDIT_CLIENT, **_reddit_options())
+    except Exception as e:
+        # 状态文件 / 磁盘等意外错误只影响这一个词，不能让整批验证中断
+        log_execution(f"⚠️ Reddit验证失败 '{keyword}': {str(e)[:100]}", "WARNING")
+        return _empty_reddit_result()
+    return _reddit_result(keyword, evidence)
+
+def search_reddit_pain_points_batch(batch: List[str]) -> Dict[str, Dict]:
+    """
+    批量版 Reddit 验证（plan_reddit_batches 的一个批次）：共享种子词的关键词合并成
+    OR 查询，抓一次并集，再用关键词的实词在本地把帖子归到各个关键词
+
+    批量查询意外失败时，这一批的词退回逐个查询。
+    返回 {关键词: search_reddit_pain_points 格式的结果}
+    """
+    if len(batch) == 1:
+        return {batch[0]: search_reddit_pain_points(batch[0])}
     
+    log_execution(f"🔍 Reddit批量验证: {' | '.join(batch)}")
     try:
-        # 使用 Reddit API（不需要OAuth的公开搜索）
-        search_url = "https://www.reddit.com/search.json"
-        params = {
-            "q": keyword,
-            "limit": VALIDATION_CONFIG["REDDIT_SEARCH_LIMIT"],
-            "sort": "relevance",
-            "t": "year"  # 过去一年
-        }
-        
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        
-        response = requests.get(search_url, params=params, headers=headers, timeout=15)
-        response.raise_for_status()
-        data = response.json()
-        
-        posts = data.get("data", {}).get("children", [])
-        result["total_mentions"] = len(posts)
-        
-        # 分析每个帖子的标题和内容
-        pain_count = 0
-        for post in posts:
-            post_data = post.get("data", {})
-            title = post_data.get("title", "").lower()
-            selftext = post_data.get("selftext", "").lower()
-            combined_text = title + " " + selftext
-            
-            # 检测痛点信号
-            for pain_keyword in VALIDATION_CONFIG["PAIN_KEYWORDS"]:
-                if pain_keyword in combined_text:
-                    pain_count += 1
-                    result["pain_signals"].append(pain_keyword)
-                    
-                    # 提取真实抱怨（标题部分）
-                    if pain_keyword in title and len(title) < 200:
-                        result["real_complaints"].append({
-                            "text": post_data.get("title", ""),
-                            "score": post_data.get("score", 0),
-                            "num_comments": post_data.get("num_comments", 0),
-                            "url": f"https://reddit.com{post_data.get('permalink', '')}"
-                        })
-                    break
-        
-        # 计算验证分数
-        # 公式：痛点信号数 * 10 + 评论数/10 + 点赞数/20
-        total_comments = sum(p["num_comments"] for p in result["real_complaints"])
-        total_score = sum(p["score"] for p in result["real_complaints"])
-        
-        result["validation_score"] = min(100, 
-            len(result["pain_signals"]) * 10 + 
-            total_comments / 10 + 
-            total_score / 20
-        )
-        
-        log_execution(f"✅ Reddit: {result['total_mentions']}条讨论, "
-                     f"{len(result['pain_signals'])}个痛点信号, "
-                     f"验证分数: {result['validation_score']:.1f}")
-        
-        time.sleep(2)  # 礼貌延迟
-        
+        evidences = update_reddit_batch(batch, PAIN_MATCHER, REDDIT_CLIENT, **_reddit_options())
     except Exception as e:
-        log_execution(f"⚠️ Reddit验证失败: {str(e)[:100]}", "WARNING")
+        log_execution(f"⚠️ Reddit批量验证失败，逐个查询: {str(e)[:100]}", "WARNING")
+        return {keyword: search_reddit_pain_points(keyword) for keyword in batch}
+    return {keyword: _reddit_result(keyword, evidences[keyword]) for keyword in batch}
+
+def _reddit_options() -> Dict:
+    """Reddit 收集参数（单个/批量共用）"""
+    return {
+        "full_refresh_days": VALIDATION_CONFIG["REDDIT_FULL_REFRESH_DAYS"],
+        "page_size": VALIDATION_CONFIG["REDDIT_SEARCH_LIMIT"],
+        "max_posts": VALIDATION_CONFIG["REDDIT_MAX_POSTS"],
+        "time_budget": VALIDATION_CONFIG["REDDIT_TIME_BUDGET"],
+        "top_n": VALIDATION_CONFIG["REDDIT_TOP_COMPLAINTS"],
+        "empty_page_stop": VALIDATION_CONFIG["REDDIT_EMPTY_PAGE_STOP"],
+    }
+
+def reddit_budget() -> Dict:
+    """Reddit 当前剩余额度：{"remaining", "used", "reset_in", "interval"}"""
+    return REDDIT_CLIENT.budget()
+
+def reddit_keyword_capacity(run_seconds: float = VALIDATION_CONFIG["REDDIT_RUN_SECONDS"]) -> Optional[int]:
+    """
+    按 Reddit 剩余额度估算 run_seconds 内还能做 Reddit 验证的关键词数
+
+    可用请求数 = 本窗口剩余次数 + 期间重置的窗口数 × 每窗口额度（used + remaining），
+    每个词按最多翻 REDDIT_MAX_POSTS / REDDIT_SEARCH_LIMIT 页折算。
+    还没收到过限速响应头时返回 None（不限制）。
+    """
+    budget = reddit_budget()
+    if budget["remaining"] is None or budget["reset_in"] is None:
+        return None
+    requests_left = max(budget["remaining"], 0)
+    if run_seconds > budget["reset_in"]:
+        windows = 1 + int((run_seconds - budget["reset_in"]) // VALIDATION_CONFIG["REDDIT_WINDOW_SECONDS"])
+        requests_left += windows * (max(budget["remaining"], 0) + (budget["used"] or 0))
+    pages_per_keyword = math.ceil(VALIDATION_CONFIG["REDDIT_MAX_POSTS"] / VALIDATION_CONFIG["REDDIT_SEARCH_LIMIT"])
+    return int(requests_left // pages_per_keyword)
+
+def _empty_reddit_result() -> Dict:
+    """Reddit 验证失败时的空结果（0 条讨论、0 分）"""
+    evidence = RedditEvidence(PAIN_MATCHER, top_n=VALIDATION_CONFIG["REDDIT_TOP_COMPLAINTS"])
+    evidence.stop_reason = "error"
+    return evidence.to_result()
+
+def _reddit_result(keyword: str, evidence) -> Dict:
+    """累计器 → 结果字典，并记录日志"""
+    result = evidence.to_result()
+    
+    log_execution(f"✅ Reddit [{keyword}]: {result['total_mentions']}条讨论"
+                 f"（{result['pages']}页，{result['stop_reason']}，"
+                 f"丢弃近重复 {result['duplicates_dropped']} 条）, "
+                 f"{result['pain_signal_count']}个痛点信号, "
+                 f"验证分数: {result['validation_score']:.1f}")
     
     return result
 
@@ -164,7 +227,8 @@ def analyze_google_serp(keyword: str) -> Dict:
         "forum_results_count": 论坛类结果数量,
         "commercial_intent": 商业意图强度 (0-100),
         "has_gap": 是否存在市场空白,
-        "top_competitors": 前3名竞争对手
+        "top_competitors": 前3名竞争对手,
+        "serp_features": SERP特性（People Also Ask、精选摘要等）
     }
     """
     log_execution(f"🔍 Google SERP验证: {keyword}")
@@ -174,9 +238,20 @@ def analyze_google_serp(keyword: str) -> Dict:
         "forum_results_count": 0,
         "commercial_intent": 0,
         "has_gap": False,
-        "top_competitors": []
+        "top_competitors": [],
+        "serp_features": []
     }
     
+    # 同一关键词已有新鲜的 SERP 信号（ultimate 的 SERP 步骤或之前的验证）就直接复用
+    cached = load_serp_signals(keyword, engine="google",
+                               max_age_hours=VALIDATION_CONFIG["SERP_SIGNAL_TTL_HOURS"])
+    if cached is not None:
+        result.update({k: cached[k] for k in result if k in cached})
+        log_execution(f"♻️ SERP: 复用已存信号 - {result['tool_results_count']}个工具, "
+                     f"{result['forum_results_count']}个论坛, "
+                     f"商业意图: {result['commercial_intent']}")
+        return result
+    
     try:
         # 使用 Google Custom Search API（需要API Key）
         # 这里提供两种方案：
@@ -186,38 +261,19 @@ def analyze_google_serp(keyword: str) -> Dict:
         # 方案1示例（简化版）
         search_url = "https://www.google.com/search"
         params = {"q": keyword, "num": 10}
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
         
-        response = requests.get(search_url, params=params, headers=headers, timeout=15)
-        html = response.text
-        
-        # 简单分析（实际应该用BeautifulSoup解析）
-        # 检测工具类网站
-        tool_domains = ["calculator", "converter", "generator", "tool", "online", "free"]
-        for domain in tool_domains:
-            result["tool_results_count"] += html.lower().count(domain)
-        
-        # 检测论坛类网站
-        forum_domains = ["reddit.com", "quora.com", "stackoverflow.com", "forum"]
-        for domain in forum_domains:
-            result["forum_results_count"] += html.lower().count(domain)
-        
-        # 商业意图（广告数量）
-        ad_count = html.count('data-text-ad') + html.count('ads-fr')
-        result["commercial_intent"] = min(100, ad_count * 10)
+        VALIDATION_RATE_LIMITER.wait(search_url)  # 礼貌延迟（避免被封）
+        response = get_session().get(search_url, params=params, timeout=15)
+        response.raise_for_status()
         
-        # 市场空白判断：论坛结果多 + 工具结果少 = 有需求但缺工具
-        if result["forum_results_count"] >= 3 and result["tool_results_count"] < 5:
-            result["has_gap"] = True
+        # 一次解析跑全部提取器（竞争度、广告、论坛空白、SERP 特性），合并信号存一份
+        signals = analyze_serp_document(keyword, "google", response.text)
+        result.update({k: signals[k] for k in result if k in signals})
         
         log_execution(f"✅ SERP: {result['tool_results_count']}个工具, "
                      f"{result['forum_results_count']}个论坛, "
                      f"商业意图: {result['commercial_intent']}")
         
-        time.sleep(3)  # 礼貌延迟（避免被封）
-        
     except Exception as e:
         log_execution(f"⚠️ SERP验证失败: {str(e)[:100]}", "WARNING")
     
@@ -255,32 +311,63 @@ def deep_validate_keyword(keyword: str) -> Dict:
     serp_data = analyze_google_serp(keyword)
     
     # Step 3: 综合判断
+    return combine_validation(keyword, reddit_data, serp_data)
+
+async def deep_validate_keyword_async(keyword: str, semaphore: asyncio.Semaphore,
+                                     reddit_task: Optional[asyncio.Task] = None) -> Dict:
+    """
+    deep_validate_keyword 的异步版本：Reddit 和 SERP 两个请求同时发出
+
+    semaphore 控制同时验证的关键词数；请求节奏由 VALIDATION_RATE_LIMITER 按主机控制。
+    传入 reddit_task（这个词所在批次的 Reddit 查询）时这里只抓 SERP，Reddit 结果从该批次里取。
+    """
+    async with semaphore:
+        log_execution(f"🎯 深度验证: {keyword}")
+        if reddit_task is None:
+            reddit_data, serp_data = await asyncio.gather(
+                asyncio.to_thread(search_reddit_pain_points, keyword),
+                asyncio.to_thread(analyze_google_serp, keyword)
+            )
+        else:
+            serp_data = await asyncio.to_thread(analyze_google_serp, keyword)
+    
+    if reddit_task is not None:
+        try:
+            reddit_data = (await reddit_task)[keyword]
+        except Exception as e:
+            # 批次意外失败只影响这一批的词
+            log_execution(f"⚠️ Reddit验证失败 '{keyword}': {str(e)[:100]}", "WARNING")
+            reddit_data = _empty_reddit_result()
+    return combine_validation(keyword, reddit_data, serp_data)
+
+def combine_validation(keyword: str, reddit_data: Dict, serp_data: Dict) -> Dict:
+    """根据 Reddit 和 SERP 数据综合判断需求真实性"""
     validation_score = 0
     reasoning_points = []
     
     # Reddit贡献 (50%)
-    if reddit_data["validation_score"] > 30:
-        validation_score += reddit_data["validation_score"] * 0.5
+    if reddit_data["validation_score"] > VALIDATION_RULES["REDDIT_MIN_SCORE"]:
+        validation_score += reddit_data["validation_score"] * VALIDATION_RULES["REDDIT_WEIGHT"]
         reasoning_points.append(f"✅ Reddit有{reddit_data['total_mentions']}条讨论，"
-                               f"{len(reddit_data['pain_signals'])}个痛点信号")
+                               f"{reddit_data['pain_signal_count']}个痛点信号")
     else:
         reasoning_points.append(f"⚠️ Reddit讨论较少({reddit_data['total_mentions']}条)")
     
     # SERP贡献 (30%)
     if serp_data["has_gap"]:
-        validation_score += 30
+        validation_score += VALIDATION_RULES["MARKET_GAP_SCORE"]
         reasoning_points.append("✅ 发现市场空白：论坛需求多但工具少")
     elif serp_data["forum_results_count"] > 0:
-        validation_score += 15
+        validation_score += VALIDATION_RULES["FORUM_SCORE"]
         reasoning_points.append(f"⚠️ 有论坛讨论({serp_data['forum_results_count']}个)")
     
     # 商业意图贡献 (20%)
-    if serp_data["commercial_intent"] > 20:
-        validation_score += 20
+    if serp_data["commercial_intent"] > VALIDATION_RULES["COMMERCIAL_MIN_INTENT"]:
+        validation_score += VALIDATION_RULES["COMMERCIAL_SCORE"]
         reasoning_points.append(f"✅ 商业价值高({serp_data['commercial_intent']})")
     
     # 最终判断
-    is_real_need = validation_score >= 50
+    is_real_need = validation_score >= VALIDATION_RULES["REAL_NEED_SCORE"]
     
     result = {
         "keyword": keyword,
@@ -291,42 +378,128 @@ def deep_validate_keyword(keyword: str) -> Dict:
         "reasoning": " | ".join(reasoning_points)
     }
     
-    log_execution(f"\n📊 验证结果: {'✅ 真实需求' if is_real_need else '❌ 需求不足'}")
-    log_execution(f"📈 综合得分: {result['validation_score']:.1f}/100")
+    log_execution(f"📊 {keyword}: {'✅ 真实需求' if is_real_need else '❌ 需求不足'} "
+                 f"| 综合得分: {result['validation_score']:.1f}/100")
     log_execution(f"💡 理由: {result['reasoning']}")
     
     return result
 
+def calculate_validation_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    向量化的综合判断：与 combine_validation 读同一份 VALIDATION_RULES，结果一致
+
+    df 用结果库的汇总列（reddit_score / has_market_gap / forum_results / commercial_intent），
+    缺失值按 0 计。返回同索引的 validation_score / is_real_need 两列。
+    """
+    def numeric(name: str) -> pd.Series:
+        if name not in df.columns:
+            return pd.Series(0.0, index=df.index)
+        return pd.to_numeric(df[name], errors='coerce').fillna(0)
+
+    reddit_score = numeric("reddit_score")
+    forum_results = numeric("forum_results")
+    validation_score = (
+        reddit_score.where(reddit_score > VALIDATION_RULES["REDDIT_MIN_SCORE"], 0) *
+        VALIDATION_RULES["REDDIT_WEIGHT"] +
+        np.select([numeric("has_market_gap") > 0, forum_results > 0],
+                  [VALIDATION_RULES["MARKET_GAP_SCORE"], VALIDATION_RULES["FORUM_SCORE"]], default=0) +
+        np.where(numeric("commercial_intent") > VALIDATION_RULES["COMMERCIAL_MIN_INTENT"],
+                 VALIDATION_RULES["COMMERCIAL_SCORE"], 0)
+    )
+    return pd.DataFrame({
+        "validation_score": validation_score.clip(upper=100),
+        "is_real_need": validation_score >= VALIDATION_RULES["REAL_NEED_SCORE"]
+    }, index=df.index)
+
 # ==================== 批量验证 ====================
 
-def batch_validate_keywords(keywords: List[str], max_keywords: int = 20) -> pd.DataFrame:
+async def validate_keywords_async(keywords: List[str]) -> List[Dict]:
+    """并发验证一批关键词（最多 MAX_CONCURRENT 个同时进行），结果顺序与输入一致"""
+    semaphore = asyncio.Semaphore(VALIDATION_CONFIG["MAX_CONCURRENT"])
+    done = 0
+
+    # 批量模式：Reddit 按种子词合并成 OR 查询，每个批次一个任务，在专用的小线程池里排队
+    # （Reddit 请求大多在等限速，不能占满默认线程池挡住 SERP）；SERP 同时进行。
+    # 每个词只等自己所在的批次，一个批次失败不影响其他批次
+    reddit_tasks: Dict[str, asyncio.Future] = {}
+    reddit_pool = None
+    if VALIDATION_CONFIG["REDDIT_BATCH_SIZE"] > 1 and len(keywords) > 1:
+        batches = plan_reddit_batches(keywords, batch_size=VALIDATION_CONFIG["REDDIT_BATCH_SIZE"],
+                                      full_refresh_days=VALIDATION_CONFIG["REDDIT_FULL_REFRESH_DAYS"])
+        reddit_pool = ThreadPoolExecutor(max_workers=VALIDATION_CONFIG["REDDIT_MAX_CONCURRENT"],
+                                         thread_name_prefix="reddit")
+        loop = asyncio.get_running_loop()
+        for batch in batches:
+            task = loop.run_in_executor(reddit_pool, search_reddit_pain_points_batch, batch)
+            for keyword in batch:
+                reddit_tasks[keyword] = task
+
+    async def validate_one(keyword: str) -> Dict:
+        nonlocal done
+        result = await deep_validate_keyword_async(keyword, semaphore, reddit_tasks.get(keyword))
+        done += 1
+        log_execution(f"[{done}/{len(keywords)}] 已完成: {keyword}")
+        return result
+
+    try:
+        return await asyncio.gather(*(validate_one(kw) for kw in keywords))
+    finally:
+        if reddit_pool is not None:
+            reddit_pool.shutdown(wait=False)
+
+def batch_validate_keywords(keywords: List[str], max_keywords: int = 20,
+                            refresh: bool = False) -> pd.DataFrame:
     """
     批量验证关键词列表
     
     参数：
     - keywords: 待验证的关键词列表
     - max_keywords: 最大验证数量（控制运行时间）
+    - refresh: 忽略结果库里 TTL 内的结果，全部重新验证
     
     返回：
     DataFrame with validation results
     """
     log_execution(f"\n{'='*60}")
-    log_execution(f"🚀 开始批量验证 {min(len(keywords), max_keywords)} 个关键词")
+    log_execution(f"🚀 开始批量验证 {min(len(keywords), max_keywords)} 个关键词"
+                 f"（并发 {VALIDATION_CONFIG['MAX_CONCURRENT']}）")
     log_execution(f"{'='*60}\n")
     
-    results = []
     keywords_to_validate = keywords[:max_keywords]
     
-    for idx, keyword in enumerate(keywords_to_validate, 1):
-        log_execution(f"\n[{idx}/{len(keywords_to_validate)}] 验证: {keyword}")
-        
-        validation_result = deep_validate_keyword(keyword)
-        results.append(validation_result)
-        
-        # 每验证5个词，休息10秒
-        if idx % 5 == 0 and idx < len(keywords_to_validate):
-            log_execution(f"\n⏸️ 已验证 {idx} 个，休息10秒...")
-            time.sleep(10)
+    # TTL 内验证过的词直接用结果库里的结果
+    cached = {} if refresh else load_recent_validations(
+        keywords_to_validate, VALIDATION_CONFIG["RESULT_TTL_HOURS"])
+    pending = [kw for kw in keywords_to_validate if kw not in cached]
+    if cached:
+        log_execution(f"♻️ {len(cached)} 个词在 {VALIDATION_CONFIG['RESULT_TTL_HOURS']} 小时内验证过，"
+                     f"直接复用；需要验证 {len(pending)} 个")
+    
+    # Reddit 额度不够时，排在后面（期望价值低）的词推迟到下次运行，不做半截验证
+    capacity = reddit_keyword_capacity()
+    if capacity is not None and len(pending) > capacity:
+        deferred = set(pending[capacity:])
+        pending = pending[:capacity]
+        keywords_to_validate = [kw for kw in keywords_to_validate if kw not in deferred]
+        budget = reddit_budget()
+        log_execution(f"📡 Reddit 剩余额度 {budget['remaining']:.0f} 次（{budget['reset_in']:.0f} 秒后重置），"
+                     f"本次只验证 {len(pending)} 个新词，推迟 {len(deferred)} 个到下次运行", "WARNING")
+    if not keywords_to_validate:
+        log_execution("⚠️ 没有可验证的词", "WARNING")
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    
+    start_time = time.time()
+    fresh = asyncio.run(validate_keywords_async(pending)) if pending else []
+    save_validations(fresh)
+    log_execution(f"⏱️ 验证耗时: {time.time() - start_time:.1f} 秒")
+    
+    fresh_by_keyword = dict(zip(pending, fresh))
+    results = [cached.get(kw) or fresh_by_keyword[kw] for kw in keywords_to_validate]
+    from_store = [kw in cached for kw in keywords_to_validate]
+    budget = reddit_budget()
+    if budget["remaining"] is not None:
+        log_execution(f"📡 Reddit 剩余额度: {budget['remaining']:.0f} 次，"
+                     f"{budget['reset_in']:.0f} 秒后重置")
     
     # 转换为DataFrame
     df = pd.DataFrame([
@@ -335,13 +508,14 @@ def batch_validate_keywords(keywords: List[str], max_keywords: int = 20) -> pd.D
             "is_real_need": r["is_real_need"],
             "validation_score": r["validation_score"],
             "reddit_mentions": r["reddit_data"]["total_mentions"],
-            "pain_signals": len(r["reddit_data"]["pain_signals"]),
-            "real_complaints": len(r["reddit_data"]["real_complaints"]),
+            "pain_signals": r["reddit_data"]["pain_signal_count"],
+            "real_complaints": r["reddit_data"]["complaint_count"],
             "has_market_gap": r["serp_data"]["has_gap"],
             "commercial_intent": r["serp_data"]["commercial_intent"],
-            "reasoning": r["reasoning"]
+            "reasoning": r["reasoning"],
+            "from_store": stored
         }
-        for r in results
+        for r, stored in zip(results, from_store)
     ])
     
     # 保存结果
@@ -374,6 +548,9 @@ def generate_deep_validation_report(df: pd.DataFrame, output_path: str = None):
     # 筛选出真实需求
     real_needs = df[df['is_real_need'] == True].sort_values('validation_score', ascending=False)
     
+    # 从结果库查历史分数（显示趋势）
+    history = score_history(real_needs.head(20)['keyword'].tolist())
+    
     html_content = f"""<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -518,6 +695,8 @@ def generate_deep_validation_report(df: pd.DataFrame, output_path: str = None):
     
     # 添加每个验证通过的关键词
     for idx, (_, row) in enumerate(real_needs.head(20).iterrows(), 1):
+        scores = history.get(row['keyword'], [])
+        history_text = " → ".join(f"{score:.0f}" for score in scores) if scores else "首次验证"
         html_content += f"""
             <div class="opportunity">
                 <h3>{idx}. {row['keyword']}</h3>
@@ -535,7 +714,8 @@ def generate_deep_validation_report(df: pd.DataFrame, output_path: str = None):
                     • 痛点信号: {row['pain_signals']}个<br>
                     • 真实抱怨: {row['real_complaints']}条<br>
                     • 市场空白: {'✅ 是' if row['has_market_gap'] else '❌ 否'}<br>
-                    • 商业意图: {row['commercial_intent']}/100
+                    • 商业意图: {row['commercial_intent']}/100<br>
+                    • 历史分数: {history_text}
                 </div>
                 
                 <div class="reasoning">
@@ -567,6 +747,7 @@ def main():
     parser = argparse.ArgumentParser(description='Profit Hunter Deep Validation')
     parser.add_argument('--input', type=str, required=True, help='输入CSV文件路径（包含keyword列）')
     parser.add_argument('--max', type=int, default=20, help='最大验证数量')
+    parser.add_argument('--refresh', action='store_true', help='忽略结果库缓存，全部重新验证')
     
     args = parser.parse_args()
     
@@ -585,11 +766,18 @@ def main():
     keywords = df_input['keyword'].tolist()
     log_execution(f"📂 从 {args.input} 读取了 {len(keywords)} 个关键词")
     
+    # ultimate 的结果文件带评分列时，记录特征并按预验证模型的期望价值挑词
+    if 'final_score' in df_input.columns:
+        candidates = df_input.dropna(subset=['keyword']).to_dict('records')
+        save_candidate_features(candidates)
+        keywords = select_for_validation(candidates, args.max)
+    
     # 批量验证
-    df_results = batch_validate_keywords(keywords, max_keywords=args.max)
+    df_results = batch_validate_keywords(keywords, max_keywords=args.max, refresh=args.refresh)
     
     # 生成HTML报告
-    generate_deep_validation_report(df_results)
+    if not df_results.empty:
+        generate_deep_validation_report(df_results)
     
     log_execution("\n✅ 全部完成！")
 
@@ -32,8 +32,17 @@ import re
 import requests
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Set
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Set, Optional
 from pytrends.request import TrendReq
+from serp_parser import parse_serp
+from serp_extractors import classify_serp_competition
+from http_pool import get_session, HostRateLimiter
+from serp_archive import archive_serp
+from filter_engine import (FilterEngine, load_filter_rules, new_rejection_columns,
+                           split_rejections, summarize_rejections, save_rejections)
+from keyword_tokens import keyword_tokens
+from parallel_scoring import parallel_map_chunks, to_records
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -48,16 +57,13 @@ BENCHMARK_KEYWORD = "GPTs"
 MIN_RATIO = 0.05  # 最低热度比值：5%
 TIMEFRAME = "now 7-d"
 
-# 词长度限制（来自 Yuanbao）
-MIN_WORDS = 3
-MAX_WORDS = 8
-
-# 弱竞争对手域名（来自 Yuanbao，扩展版）
-WEAK_COMPETITORS = [
-    'reddit.com', 'quora.com', 'medium.com', 'stackoverflow.com',
-    'github.com', 'dev.to', 'indiehackers.com', 'linkedin.com',
-    'twitter.com', 'facebook.com', 'pinterest.com'
-]
+# DuckDuckGo SERP 并发抓取配置
+SERP_CONFIG = {
+    "MAX_WORKERS": 6,      # 并发线程数
+    "MIN_INTERVAL": 0.6,   # 同一主机相邻请求的最小间隔（秒）
+    "JITTER": 0.4,         # 额外随机抖动（秒）
+    "TIMEOUT": 10,         # 请求超时（秒）
+}
 
 # 意图评分权重（来自 Yuanbao）
 INTENT_WEIGHTS = {
@@ -81,6 +87,29 @@ COMMERCIAL_TRIGGERS = [
     "tracker", "finder", "downloader", "optimizer", "creator"
 ]
 
+# 竞争对比信号
+COMPARISON_TRIGGERS = ["vs", "alternative", "instead of"]
+
+# 词数范围、实物产品排除规则在 filter_rules.json（profit_hunter_lite）；
+# 意图信号词表一起编译进同一个分类器（进程内只编译一次，每个关键词只扫描一遍）
+FILTER_ENGINE = FilterEngine(load_filter_rules("profit_hunter_lite"), tables={
+    "intent": {
+        "pain": PAIN_TRIGGERS,
+        "tool": COMMERCIAL_TRIGGERS,
+        "comparison": COMPARISON_TRIGGERS
+    }
+})
+KEYWORD_CLASSIFIER = FILTER_ENGINE.classifier
+
+# 被过滤的关键词和原因码（每次运行追加）
+REJECTIONS_FILE = os.path.join(DATA_DIR, "filter_rejections.csv")
+
+# 按主机限速（所有 SERP 线程共享）
+SERP_RATE_LIMITER = HostRateLimiter(
+    min_interval=SERP_CONFIG["MIN_INTERVAL"],
+    jitter=SERP_CONFIG["JITTER"]
+)
+
 # ==================== 工具函数 ====================
 
 def log_execution(message: str, level: str = "INFO"):
@@ -168,7 +197,7 @@ def mine_keywords(seeds: List[str]) -> List[str]:
 
 # ==================== Step 2: 意图评分与筛选 ====================
 
-def calculate_intent_score(keyword: str) -> Dict:
+def calculate_intent_score(keyword: str, hits: Optional[Dict] = None) -> Dict:
     """
     计算意图评分（借鉴 Yuanbao 的加权系统）
     
@@ -178,23 +207,27 @@ def calculate_intent_score(keyword: str) -> Dict:
     - 竞争对比：+2分
     
     通过标准：≥2分
+
+    hits: KEYWORD_CLASSIFIER.classify(keyword) 的结果（已分类过时传入，避免重复扫描）
     """
-    kw_lower = keyword.lower()
+    if hits is None:
+        hits = KEYWORD_CLASSIFIER.classify(keyword)
+    intent_hits = hits["intent"]
     intent_score = 0
     signals = []
     
     # 痛点信号（权重最高）
-    if any(p in kw_lower for p in PAIN_TRIGGERS):
+    if "pain" in intent_hits:
         intent_score += INTENT_WEIGHTS["pain"]
         signals.append("Pain")
     
     # 商业工具意图
-    if any(c in kw_lower for c in COMMERCIAL_TRIGGERS):
+    if "tool" in intent_hits:
         intent_score += INTENT_WEIGHTS["tool"]
         signals.append("Tool")
     
     # 竞争对比意图
-    if " vs " in kw_lower or "alternative" in kw_lower or "instead of" in kw_lower:
+    if "comparison" in intent_hits:
         intent_score += INTENT_WEIGHTS["comparison"]
         signals.append("Comparison")
     
@@ -204,6 +237,36 @@ def calculate_intent_score(keyword: str) -> Dict:
         "is_high_intent": intent_score >= 2
     }
 
+FILTER_COLUMNS = ["keyword", "word_count", "intent_score", "signals"]
+
+def _filter_candidate_chunk(keywords: List[str]) -> Dict[str, list]:
+    """筛选一组关键词，返回列式结果（模块级函数，可以在子进程里跑）"""
+    columns = {column: [] for column in FILTER_COLUMNS}
+    rejections = new_rejection_columns()
+    
+    for kw in keywords:
+        # 条件1-2: 词长度限制（3-8词）、排除实物产品（一次扫描同时得到意图信号）
+        reason, hits = FILTER_ENGINE.evaluate(kw)
+        
+        # 条件3: 计算意图评分
+        if reason is None:
+            intent_data = calculate_intent_score(kw, hits)
+            if not intent_data["is_high_intent"]:
+                reason = "low_intent"
+        
+        if reason is not None:
+            rejections["rejected_keyword"].append(kw)
+            rejections["reject_reason"].append(reason)
+            continue
+        
+        columns["keyword"].append(kw)
+        columns["word_count"].append(keyword_tokens(kw).word_count)
+        columns["intent_score"].append(intent_data["intent_score"])
+        columns["signals"].append(", ".join(intent_data["signals"]))
+    
+    columns.update(rejections)
+    return columns
+
 def filter_candidates(keywords: List[str]) -> List[Dict]:
     """
     筛选候选词
@@ -213,40 +276,18 @@ def filter_candidates(keywords: List[str]) -> List[Dict]:
     2. 意图评分：≥2分
     3. 长尾词优先
     4. AI可解决（非实物产品）
+    
+    关键词多时按块分给多个进程筛选，结果与串行一致。
     """
     log_execution(f"🔍 Step 2: 筛选候选词（从 {len(keywords)} 个中筛选）")
     
-    candidates = []
+    columns, rejections = split_rejections(parallel_map_chunks(_filter_candidate_chunk, keywords))
+    candidates = to_records(columns)
     
-    # 排除实物产品的关键词
-    physical_products = [
-        "maker 20", "ice maker", "coffee maker", "bread maker",
-        "generator 20", "diesel generator", "honda generator",
-        "phone", "laptop", "camera", "printer", "tablet"
-    ]
-    
-    for kw in keywords:
-        kw_lower = kw.lower()
-        words = kw_lower.split()
-        
-        # 条件1: 词长度限制（3-8词）
-        if not (MIN_WORDS <= len(words) <= MAX_WORDS):
-            continue
-        
-        # 条件2: 排除实物产品
-        if any(pp in kw_lower for pp in physical_products):
-            continue
-        
-        # 条件3: 计算意图评分
-        intent_data = calculate_intent_score(kw)
-        
-        if intent_data["is_high_intent"]:
-            candidates.append({
-                "keyword": kw,
-                "word_count": len(words),
-                "intent_score": intent_data["intent_score"],
-                "signals": ", ".join(intent_data["signals"])
-            })
+    # 淘汰原因追加写进 CSV，之后可以分析哪条规则过滤掉的最多
+    save_rejections(rejections, REJECTIONS_FILE, "profit_hunter_lite")
+    summary = "，".join(f"{reason} {count}" for reason, count in summarize_rejections(rejections)[:5])
+    log_execution(f"🧹 过滤掉 {len(rejections['rejected_keyword'])} 个（{summary}）")
     
     # 按意图评分排序
     candidates.sort(key=lambda x: x["intent_score"], reverse=True)
@@ -315,48 +356,22 @@ def analyze_serp_ddg(keyword: str) -> Dict:
     - 不需要 Playwright
     - 不会被 Google 限频
     - 速度快（1-2秒/词）
+    
+    使用共享连接池会话，请求前按主机限速（可多线程并发调用）
     """
-    url = f"https://html.duckduckgo.com/html/?q={keyword}"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    }
+    url = "https://html.duckduckgo.com/html/"
     
     try:
-        r = requests.get(url, headers=headers, timeout=10)
+        SERP_RATE_LIMITER.wait(url)
+        r = get_session().get(url, params={"q": keyword}, timeout=SERP_CONFIG["TIMEOUT"])
         
         if r.status_code == 200:
-            # 用 Regex 提取结果链接
-            links = re.findall(r'class="result__a" href="([^"]+)"', r.text)
-            
-            domains = []
-            for link in links[:5]:  # 只检查 Top 5
-                try:
-                    domain = link.split("/")[2].replace("www.", "")
-                    domains.append(domain)
-                except:
-                    pass
-            
-            # 检测弱竞争对手
-            weak_spots = sum(1 for d in domains if any(w in d for w in WEAK_COMPETITORS))
-            
-            # 决策矩阵（来自 Yuanbao）
-            if weak_spots >= 2:
-                competition = "🟢 LOW"
-                decision = "BUILD NOW"
-            elif weak_spots == 1:
-                competition = "🟡 MED"
-                decision = "WATCH"
-            else:
-                competition = "🔴 HIGH"
-                decision = "DROP"
+            # 原始页面存档（离线重算用），再单次遍历解析（自动还原 DDG 跳转链接）
+            archive_serp(keyword, "ddg", r.text)
+            serp = parse_serp(r.text, engine="ddg")
+            domains = serp["domains"][:5]  # 只检查 Top 5
             
-            return {
-                "top_domains": domains,
-                "weak_spots": weak_spots,
-                "competition": competition,
-                "decision": decision,
-                "has_gap": weak_spots >= 2
-            }
+            return {"top_domains": domains, **classify_serp_competition(domains)}
         else:
             return {"error": f"HTTP {r.status_code}"}
             
@@ -364,25 +379,40 @@ def analyze_serp_ddg(keyword: str) -> Dict:
         return {"error": str(e)}
 
 def analyze_serp_batch(candidates: List[Dict]) -> List[Dict]:
-    """批量 SERP 分析"""
-    log_execution(f"🔍 Step 4: SERP 竞争分析（{len(candidates)} 个关键词）")
+    """
+    批量 SERP 分析（线程池并发）
     
-    for idx, item in enumerate(candidates, 1):
-        kw = item["keyword"]
-        log_execution(f"  [{idx}/{len(candidates)}] 分析: {kw}")
-        
-        serp_data = analyze_serp_ddg(kw)
-        
-        if "error" not in serp_data:
-            item.update(serp_data)
-            log_execution(f"    {serp_data['competition']} - {serp_data['decision']}")
-        else:
-            item["competition"] = "⚪ UNKNOWN"
-            item["decision"] = "SKIP"
-            log_execution(f"    ⚠️ 错误: {serp_data['error'][:30]}", "WARNING")
+    - 线程数：SERP_CONFIG["MAX_WORKERS"]
+    - 同一主机的请求由 SERP_RATE_LIMITER 均匀错开（最小间隔 + 随机抖动）
+    - 结果按原顺序写回候选词
+    """
+    log_execution(f"🔍 Step 4: SERP 竞争分析（{len(candidates)} 个关键词，"
+                  f"{SERP_CONFIG['MAX_WORKERS']} 线程并发）")
+    
+    start = time.time()
+    total = len(candidates)
+    
+    with ThreadPoolExecutor(max_workers=SERP_CONFIG["MAX_WORKERS"]) as executor:
+        futures = {
+            executor.submit(analyze_serp_ddg, item["keyword"]): item
+            for item in candidates
+        }
         
-        time.sleep(1.5)  # 礼貌延迟
+        for done_idx, future in enumerate(as_completed(futures), 1):
+            item = futures[future]
+            kw = item["keyword"]
+            serp_data = future.result()
+            
+            if "error" not in serp_data:
+                item.update(serp_data)
+                log_execution(f"  [{done_idx}/{total}] {kw}: "
+                              f"{serp_data['competition']} - {serp_data['decision']}")
+            else:
+                item["competition"] = "⚪ UNKNOWN"
+                item["decision"] = "SKIP"
+                log_execution(f"  [{done_idx}/{total}] {kw}: ⚠️ 错误: {serp_data['error'][:30]}", "WARNING")
     
+    log_execution(f"✅ SERP 分析耗时 {time.time() - start:.1f} 秒")
     return candidates
 
 # ==================== Step 5: 生成报告 ====================
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔗 Profit Hunter Pipeline - 挖掘 → 深度验证 一个进程跑完
+=========================================================
+
+原来的流程是两个子进程：先跑 profit_hunter_ultimate.py 写 CSV，
+再在 data/ 里按创建时间猜最新的结果文件，启动 profit_hunter_deep_validation.py
+重新读 CSV。这里直接在进程内把 run_ultimate_hunter 的评分结果
+（已按 final_score 排好序的 DataFrame）交给 batch_validate_keywords，
+没有解释器重启、重复 import 和 CSV 往返。
+
+用法：
+    python profit_hunter_pipeline.py --trends --max 100 --validate 100
+
+调度器（scheduler_deep.py）也直接调用 run_pipeline()。
+"""
+
+import time
+from datetime import datetime
+from typing import List, Dict, Optional
+
+from profit_hunter_ultimate import run_ultimate_hunter, load_seed_words
+from profit_hunter_deep_validation import (
+    batch_validate_keywords, generate_deep_validation_report, ensure_dirs, reddit_budget,
+    reddit_keyword_capacity
+)
+from validation_store import save_candidate_features
+from prevalidation_model import select_for_validation, train_model
+
+# ==================== 配置区 ====================
+
+PIPELINE_CONFIG = {
+    "MAX_CANDIDATES": 100,     # 挖掘的候选词数量
+    "MAX_VALIDATE": 100,       # 深度验证的候选词数量（按预验证模型的期望价值选）
+    "RETRAIN_MODEL": True,     # 每次验证后用累计的验证历史重新训练预验证模型
+}
+
+# ==================== 工具函数 ====================
+
+def log_execution(message: str, level: str = "INFO"):
+    """日志记录"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}")
+
+# ==================== 流水线 ====================
+
+def run_pipeline(
+    seed_words: Optional[List[str]] = None,
+    enable_trends: bool = True,
+    enable_playwright: bool = False,
+    max_candidates: int = PIPELINE_CONFIG["MAX_CANDIDATES"],
+    max_validate: int = PIPELINE_CONFIG["MAX_VALIDATE"],
+    refresh: bool = False,
+    retrain: bool = PIPELINE_CONFIG["RETRAIN_MODEL"]
+) -> Dict:
+    """
+    挖掘 + 深度验证 + 报告
+
+    返回：
+    {
+        "ultimate_csv": 挖掘结果 CSV 路径,
+        "final_df": 挖掘评分结果,
+        "stats": 挖掘统计,
+        "validation_df": 深度验证结果（没有候选词时为 None）,
+        "report_path": 深度验证报告路径（没有候选词时为 None）
+    }
+    """
+    if seed_words is None:
+        seed_words = load_seed_words()
+
+    start_time = time.time()
+
+    # Step 1: 挖掘 + 评分
+    ultimate_csv, final_df, stats = run_ultimate_hunter(
+        seed_words=seed_words,
+        enable_trends=enable_trends,
+        enable_playwright=enable_playwright,
+        max_candidates=max_candidates
+    )
+
+    result = {
+        "ultimate_csv": ultimate_csv,
+        "final_df": final_df,
+        "stats": stats,
+        "validation_df": None,
+        "report_path": None
+    }
+
+    # Step 2: 评分结果直接交给深度验证
+    # 记录全部候选词的特征（预验证模型的训练数据），再按期望价值挑词
+    candidates = final_df.dropna(subset=["keyword"]).to_dict("records")
+    if not candidates:
+        log_execution("⚠️ 没有候选词，跳过深度验证", "WARNING")
+        return result
+
+    ensure_dirs()
+    save_candidate_features(candidates)
+    keywords = select_for_validation(candidates, max_validate)
+    capacity = reddit_keyword_capacity()
+    log_execution(f"🔗 直接验证 {len(keywords)} 个候选词"
+                  + (f"（Reddit 额度约够 {capacity} 个新词，超出的推迟到下次）"
+                     if capacity is not None and capacity < len(keywords) else ""))
+    validation_df = batch_validate_keywords(keywords, max_keywords=max_validate, refresh=refresh)
+
+    # Step 3: 报告（Reddit 额度不够、全部推迟时没有结果）
+    result["validation_df"] = validation_df
+    if not validation_df.empty:
+        result["report_path"] = generate_deep_validation_report(validation_df)
+
+    # 离线重新训练预验证模型（样本不足时跳过）
+    if retrain:
+        train_model()
+
+    budget = reddit_budget()
+    log_execution(f"⏱️ 流水线总耗时: {(time.time() - start_time) / 60:.1f} 分钟")
+    if budget["remaining"] is not None:
+        log_execution(f"📡 Reddit 剩余额度: {budget['remaining']:.0f} 次")
+    return result
+
+# ==================== CLI ====================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Profit Hunter Pipeline（挖掘 + 深度验证）')
+    parser.add_argument('--trends', action='store_true', help='启用 Trends 深度挖掘')
+    parser.add_argument('--playwright', action='store_true', help='启用 Playwright SERP 分析（慢）')
+    parser.add_argument('--max', type=int, default=PIPELINE_CONFIG["MAX_CANDIDATES"], help='最大候选词数量')
+    parser.add_argument('--validate', type=int, default=PIPELINE_CONFIG["MAX_VALIDATE"], help='深度验证数量')
+    parser.add_argument('--refresh', action='store_true', help='忽略结果库缓存，全部重新验证')
+    parser.add_argument('--no-retrain', action='store_true', help='验证后不重新训练预验证模型')
+
+    args = parser.parse_args()
+
+    result = run_pipeline(
+        enable_trends=args.trends,
+        enable_playwright=args.playwright,
+        max_candidates=args.max,
+        max_validate=args.validate,
+        refresh=args.refresh,
+        retrain=not args.no_retrain
+    )
+
+    if result["report_path"]:
+        log_execution(f"📄 报告: {result['report_path']}")
+    log_execution("✅ 全部完成！")
+
+if __name__ == "__main__":
+    main()
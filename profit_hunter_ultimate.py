@@ -22,9 +22,17 @@ import time
 import json
 import requests
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from urllib.parse import quote
 from typing import List, Dict, Optional, Set
+from serp_extractors import analyze_serp_document
+from keyword_classifier import KeywordClassifier, first_hits
+from keyword_tokens import keyword_tokens
+from candidate_table import CandidateTable
+from text_fingerprints import cluster_keywords
+from keyword_topics import group_topics, sample_per_topic, topic_rollup
+from parallel_scoring import parallel_map_chunks, to_columns
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -53,6 +61,35 @@ THRESHOLDS = {
     "GREAT_GPTS_RATIO": 0.2  # 极品比值：20%
 }
 
+# 终极评分规则：逐行的 calculate_final_score_ultimate 和向量化的 calculate_final_scores
+# （--rescore 离线重算用）都从这里读，改权重 / 分档只改这里
+FINAL_SCORE_WEIGHTS = {
+    "trend": 0.25,         # 降低 Trend 权重
+    "intent": 0.35,        # 提高 Intent 权重
+    "competition": 0.25,   # 提高竞争度权重
+    "buildability": 0.15,
+}
+
+# Trend 分档：(THRESHOLDS 里的 GPTs 比值, 增长须大于多少（None = 不看增长）, 分数)，取第一个满足的
+TREND_SCORE_TIERS = [
+    ("GREAT_GPTS_RATIO", 0, 100),
+    ("GOOD_GPTS_RATIO", 5, 85),
+    ("MIN_GPTS_RATIO", None, 70),   # 提高基础分
+]
+TREND_BASE_SCORE = 50  # 即使没有 GPTs 数据也给 50 分
+
+# 竞争度分档：降维打击直接满分，否则取 competition 文本里第一个命中的标记档
+DIMENSION_STRIKE_SCORE = 100
+COMPETITION_SCORE_TIERS = [
+    (("🟢", "WEAK", "LOW"), 90),
+    (("🟡",), 60),
+]
+COMPETITION_BASE_SCORE = 30
+
+# 决策：(THRESHOLDS 里的分数线, 决策)，取第一个达到的
+DECISION_TIERS = [("BUILD_NOW", "🔴 BUILD NOW"), ("WATCH", "🟡 WATCH")]
+DEFAULT_DECISION = "❌ DROP"
+
 # 痛点信号词库（扩展版）
 PAIN_TRIGGERS = {
     "strong": [
@@ -78,6 +115,15 @@ PAIN_TRIGGERS = {
     ]
 }
 
+# 意图评分：信号类别 → (标签, 加分)，按此顺序输出信号
+INTENT_GROUP_SCORES = {
+    "strong": ("痛点", 40),
+    "tool": ("工具", 30),
+    "comparison": ("对比", 25),
+    "b2b": ("B2B", 25),
+    "speed": ("速度", 20),
+}
+
 # 用户意图分类（新增）
 USER_INTENT_PATTERNS = {
     "calculate": ["calculator", "calculate", "compute", "formula"],
@@ -92,16 +138,21 @@ USER_INTENT_PATTERNS = {
     "search": ["finder", "search", "find", "lookup"],
 }
 
-# SERP 竞争对手数据库（大厂 vs 弱鸡）
-SERP_GIANTS = [
-    "google.com", "microsoft.com", "adobe.com", "apple.com", "amazon.com",
-    "canva.com", "figma.com", "notion.so", "airtable.com"
-]
+# 简化版 SERP 评估里的常见修饰词
+SIMPLE_SERP_MODIFIERS = ["free", "online", "simple"]
 
-SERP_WEAK_COMPETITORS = [
-    "reddit.com", "quora.com", "stackoverflow.com", "medium.com",
-    "dev.to", "hashnode.com", "blogger.com", "wordpress.com"
-]
+# 只按整词匹配的短信号词（子串会命中 photo / apple / credit / steam 这类不相干的词）
+WHOLE_WORDS = {
+    "to", "from", "vs", "app", "api", "get", "save", "test", "edit",
+    "team", "mass", "fast", "live", "free",
+}
+
+# 全部词表编译成一个分类器（进程内只编译一次，每个关键词只扫描一遍）
+KEYWORD_CLASSIFIER = KeywordClassifier({
+    "pain": PAIN_TRIGGERS,
+    "user_intent": USER_INTENT_PATTERNS,
+    "serp": {"modifier": SIMPLE_SERP_MODIFIERS},
+}, whole_words=WHOLE_WORDS)
 
 # ==================== 工具函数 ====================
 
@@ -229,7 +280,7 @@ def batch_mine_all_seeds(seed_words: List[str], max_seeds: int = None) -> pd.Dat
             all_keywords.append({
                 "seed": seed,
                 "keyword": s,
-                "word_count": len(s.split()),
+                "word_count": keyword_tokens(s).word_count,
                 "source": "google_suggest"
             })
         
@@ -436,55 +487,27 @@ def analyze_serp_with_playwright(keyword: str, headless: bool = True) -> Dict:
             page = browser.new_page()
             
             url = f"https://www.google.com/search?q={quote(keyword)}&num=10"
-            page.goto(url, timeout=15000)
+            response = page.goto(url, timeout=15000)
             time.sleep(2)
             
-            # 提取前 10 个自然搜索结果
-            results = page.query_selector_all('div.g')
-            
-            if not results:
-                browser.close()
-                return {"competition": "🟢 ZERO", "reason": "无搜索结果", "top3": []}
-            
-            top_domains = []
-            for result in results[:3]:  # 只看前 3 名
-                link_el = result.query_selector('a')
-                if link_el:
-                    href = link_el.get_attribute('href') or ""
-                    # 提取域名
-                    import re
-                    match = re.search(r'https?://([^/]+)', href)
-                    if match:
-                        domain = match.group(1).replace('www.', '')
-                        top_domains.append(domain)
-            
+            html = page.content()
             browser.close()
             
-            # 🎯 降维打击分析
-            has_giant = any(domain in top_domains for domain in SERP_GIANTS)
-            has_weak = any(domain in top_domains for domain in SERP_WEAK_COMPETITORS)
+            # 429 / 5xx 不解析（走下面的失败分支），限流页由 analyze_serp_document 识别
+            if response is not None and response.status >= 400:
+                raise RuntimeError(f"HTTP {response.status}")
+            
+            # 单次解析跑全部提取器（竞争度、广告、论坛空白、SERP 特性），
+            # 合并信号存一份，深度验证直接复用，不再重复抓取
+            signals = analyze_serp_document(keyword, "google", html)
             
-            if has_weak and not has_giant:
-                return {
-                    "competition": "🟢 WEAK",
-                    "reason": f"前3名有论坛/博客: {', '.join(top_domains[:3])}",
-                    "top3": top_domains[:3],
-                    "降维打击": True
-                }
-            elif has_giant:
-                return {
-                    "competition": "🔴 GIANT",
-                    "reason": f"大厂占据: {', '.join(top_domains[:3])}",
-                    "top3": top_domains[:3],
-                    "降维打击": False
-                }
-            else:
-                return {
-                    "competition": "🟡 MEDIUM",
-                    "reason": f"中等竞争: {', '.join(top_domains[:3])}",
-                    "top3": top_domains[:3],
-                    "降维打击": False
-                }
+            # 🎯 降维打击分析（前 3 名）
+            return {
+                "competition": signals["competition"],
+                "reason": signals["reason"],
+                "top3": signals["top3"],
+                "降维打击": signals["降维打击"]
+            }
         
     except ImportError:
         log_execution("⚠️ Playwright 未安装，使用简化分析", "WARNING")
@@ -495,13 +518,13 @@ def analyze_serp_with_playwright(keyword: str, headless: bool = True) -> Dict:
 
 def analyze_serp_simple(keyword: str) -> Dict:
     """简化版竞争分析（不用 Playwright）"""
-    keyword_lower = keyword.lower()
+    hits = KEYWORD_CLASSIFIER.classify(keyword)
     
-    if any(word in keyword_lower for word in ["free", "online", "simple"]):
+    if hits["serp"]:
         return {"competition": "🟡 MEDIUM", "reason": "常见修饰词", "降维打击": False}
-    elif len(keyword.split()) >= 4:
+    elif keyword_tokens(keyword).word_count >= 4:
         return {"competition": "🟢 LOW", "reason": "长尾词（4+词）", "降维打击": True}
-    elif any(word in keyword_lower for word in PAIN_TRIGGERS["strong"]):
+    elif "strong" in hits["pain"]:
         return {"competition": "🟢 LOW", "reason": "痛点词", "降维打击": True}
     else:
         return {"competition": "🟡 MEDIUM-LOW", "reason": "默认评估", "降维打击": False}
@@ -535,49 +558,27 @@ def batch_analyze_serp(keywords: List[str], use_playwright: bool = False) -> pd.
 
 # ==================== Step 4: Intent Scoring ====================
 
-def calculate_intent_score(keyword: str) -> Dict:
-    """意图评分（优化版）"""
-    keyword_lower = keyword.lower()
+def calculate_intent_score(keyword: str, hits: Optional[Dict] = None) -> Dict:
+    """
+    意图评分（优化版）
+
+    hits: KEYWORD_CLASSIFIER.classify(keyword) 的结果（已分类过时传入，避免重复扫描）
+    """
+    if hits is None:
+        hits = KEYWORD_CLASSIFIER.classify(keyword)
     score = 0
     signals = []
     
-    # 强痛点 +40（提高权重）
-    for trigger in PAIN_TRIGGERS["strong"]:
-        if trigger in keyword_lower:
-            score += 40
-            signals.append(f"痛点:{trigger}")
-            break
-    
-    # 工具信号 +30
-    for trigger in PAIN_TRIGGERS["tool"]:
-        if trigger in keyword_lower:
-            score += 30
-            signals.append(f"工具:{trigger}")
-            break
-    
-    # 对比需求 +25
-    for trigger in PAIN_TRIGGERS["comparison"]:
-        if trigger in keyword_lower:
-            score += 25
-            signals.append(f"对比:{trigger}")
-            break
-    
-    # B2B +25
-    for trigger in PAIN_TRIGGERS["b2b"]:
-        if trigger in keyword_lower:
-            score += 25
-            signals.append(f"B2B:{trigger}")
-            break
-    
-    # 速度 +20
-    for trigger in PAIN_TRIGGERS["speed"]:
-        if trigger in keyword_lower:
-            score += 20
-            signals.append(f"速度:{trigger}")
-            break
+    # 每类取词表里第一个命中的信号词
+    # 强痛点 +40（提高权重）、工具 +30、对比 +25、B2B +25、速度 +20
+    pain_hits = first_hits(hits["pain"])
+    for group, (label, points) in INTENT_GROUP_SCORES.items():
+        if group in pain_hits:
+            score += points
+            signals.append(f"{label}:{pain_hits[group]}")
     
     # 长尾词 +15
-    word_count = len(keyword.split())
+    word_count = keyword_tokens(keyword).word_count
     if 2 <= word_count <= 4:
         score += 15
         signals.append(f"长尾:{word_count}词")
@@ -590,20 +591,22 @@ def calculate_intent_score(keyword: str) -> Dict:
 
 # ==================== Step 4.5: User Intent Mining (新增) ====================
 
-def detect_user_intent(keyword: str) -> Dict:
-    """深挖用户意图（不只是信号，而是用户真正想做什么）"""
-    keyword_lower = keyword.lower()
+def detect_user_intent(keyword: str, hits: Optional[Dict] = None) -> Dict:
+    """
+    深挖用户意图（不只是信号，而是用户真正想做什么）
+
+    hits: KEYWORD_CLASSIFIER.classify(keyword) 的结果（已分类过时传入，避免重复扫描）
+    """
+    if hits is None:
+        hits = KEYWORD_CLASSIFIER.classify(keyword)
     
     detected_intents = []
     intent_details = []
     
-    # 遍历意图模式
-    for intent_type, patterns in USER_INTENT_PATTERNS.items():
-        for pattern in patterns:
-            if pattern in keyword_lower:
-                detected_intents.append(intent_type)
-                intent_details.append(f"{intent_type}({pattern})")
-                break
+    # 命中的意图（按 USER_INTENT_PATTERNS 的顺序，每类取第一个命中的词）
+    for intent_type, pattern in first_hits(hits["user_intent"]).items():
+        detected_intents.append(intent_type)
+        intent_details.append(f"{intent_type}({pattern})")
     
     # 去重
     detected_intents = list(dict.fromkeys(detected_intents))
@@ -639,23 +642,47 @@ def detect_user_intent(keyword: str) -> Dict:
         "intent_clarity": intent_clarity
     }
 
+# 意图评分 / 用户意图写入候选词表的列
+INTENT_COLUMNS = ["intent_score", "signals"]
+USER_INTENT_COLUMNS = ["user_intent", "intent_details", "user_goal", "intent_clarity"]
+
+def score_intent_columns(keywords: List[str]) -> Dict[str, list]:
+    """
+    一组关键词 → 意图评分 + 用户意图（列式结果，含 keyword 列）
+
+    每个词只分类一次，两种评分共用；模块级函数，可以交给 parallel_scoring 在子进程里跑。
+    """
+    intent_rows, user_intent_rows = [], []
+    for keyword, hits in zip(keywords, KEYWORD_CLASSIFIER.classify_many(keywords)):
+        intent_rows.append(calculate_intent_score(keyword, hits))
+        user_intent_rows.append(detect_user_intent(keyword, hits))
+    columns = {"keyword": list(keywords)}
+    columns.update(to_columns(intent_rows, INTENT_COLUMNS))
+    columns.update(to_columns(user_intent_rows, USER_INTENT_COLUMNS))
+    return columns
+
 # ==================== Step 5: Final Scoring (优化版) ====================
 
+# 可构建性：含这些工具词的关键词最容易做成工具站
+BUILDABILITY_TOOL_WORDS = ["calculator", "generator", "converter", "maker", "checker"]
+
 def calculate_final_score_ultimate(row: pd.Series) -> Dict:
-    """终极评分算法（更容易出现"立即做"）"""
+    """
+    终极评分算法（更容易出现"立即做"）
+
+    权重和分档都在配置区（FINAL_SCORE_WEIGHTS / TREND_SCORE_TIERS / COMPETITION_SCORE_TIERS /
+    DECISION_TIERS），向量化的 calculate_final_scores 读同一份。
+    """
     
     # 1. Trend Score（优化：即使没有 GPTs 数据也给基础分）
     ratio = row.get('avg_ratio', 0)
     growth = row.get('growth', 0)
     
-    if ratio >= THRESHOLDS["GREAT_GPTS_RATIO"] and growth > 0:
-        trend_score = 100
-    elif ratio >= THRESHOLDS["GOOD_GPTS_RATIO"] and growth > 5:
-        trend_score = 85
-    elif ratio >= THRESHOLDS["MIN_GPTS_RATIO"]:
-        trend_score = 70  # 提高基础分
-    else:
-        trend_score = 50  # 即使没数据也给 50 分
+    trend_score = TREND_BASE_SCORE
+    for threshold, min_growth, score in TREND_SCORE_TIERS:
+        if ratio >= THRESHOLDS[threshold] and (min_growth is None or growth > min_growth):
+            trend_score = score
+            break
     
     # 2. Intent Score
     intent_score = row.get('intent_score', 0)
@@ -665,40 +692,26 @@ def calculate_final_score_ultimate(row: pd.Series) -> Dict:
     降维打击 = row.get('降维打击', False)
     
     if 降维打击:
-        comp_score = 100  # 降维打击 = 满分
-    elif '🟢' in competition or 'WEAK' in competition or 'LOW' in competition:
-        comp_score = 90
-    elif '🟡' in competition:
-        comp_score = 60
+        comp_score = DIMENSION_STRIKE_SCORE  # 降维打击 = 满分
     else:
-        comp_score = 30
+        comp_score = next((score for markers, score in COMPETITION_SCORE_TIERS
+                           if any(marker in competition for marker in markers)),
+                          COMPETITION_BASE_SCORE)
     
     # 4. Buildability Score
-    keyword_lower = row.get('keyword', '').lower()
-    tool_words = ["calculator", "generator", "converter", "maker", "checker"]
-    
-    if any(tool in keyword_lower for tool in tool_words):
-        build_score = 100
-    elif "online" in keyword_lower or "free" in keyword_lower:
-        build_score = 85
-    else:
-        build_score = 70
+    build_score = buildability_score(row.get('keyword', ''))
     
-    # 综合评分（权重优化）
+    # 综合评分
     final_score = (
-        trend_score * 0.25 +      # 降低 Trend 权重
-        intent_score * 0.35 +     # 提高 Intent 权重
-        comp_score * 0.25 +       # 提高竞争度权重
-        build_score * 0.15
+        trend_score * FINAL_SCORE_WEIGHTS["trend"] +
+        intent_score * FINAL_SCORE_WEIGHTS["intent"] +
+        comp_score * FINAL_SCORE_WEIGHTS["competition"] +
+        build_score * FINAL_SCORE_WEIGHTS["buildability"]
     )
     
     # 决策
-    if final_score >= THRESHOLDS["BUILD_NOW"]:
-        decision = "🔴 BUILD NOW"
-    elif final_score >= THRESHOLDS["WATCH"]:
-        decision = "🟡 WATCH"
-    else:
-        decision = "❌ DROP"
+    decision = next((label for threshold, label in DECISION_TIERS
+                     if final_score >= THRESHOLDS[threshold]), DEFAULT_DECISION)
     
     return {
         "trend_score": trend_score,
@@ -708,6 +721,141 @@ def calculate_final_score_ultimate(row: pd.Series) -> Dict:
         "decision": decision
     }
 
+def _numeric_column(df: pd.DataFrame, name: str, default: float = 0) -> np.ndarray:
+    """取数值列（没有该列时用默认值，对应 row.get(name, default)）"""
+    if name not in df.columns:
+        return np.full(len(df), default, dtype=float)
+    return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+
+def _text_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """取文本列（没有该列时用空字符串）"""
+    if name not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[name].astype(object)
+
+def buildability_score(keyword) -> int:
+    """可构建性分数：工具词 100（子串，复数也算），online/free 整词 85，其他 70"""
+    if not isinstance(keyword, str):
+        return 70
+    tokens = keyword_tokens(keyword)
+    if any(tool in tokens.text for tool in BUILDABILITY_TOOL_WORDS):
+        return 100
+    if "online" in tokens.word_set or "free" in tokens.word_set:
+        return 85
+    return 70
+
+def calculate_buildability_scores(keywords: pd.Series) -> np.ndarray:
+    """可构建性分数（整列）：分词结果有缓存，同一个关键词只切一次"""
+    return np.fromiter((buildability_score(k) for k in keywords), dtype=int, count=len(keywords))
+
+def calculate_final_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    向量化的终极评分：与逐行调用 calculate_final_score_ultimate 结果完全一致
+
+    所有分支都换成列运算（布尔掩码 + np.select），几十万行也是秒级；
+    权重和分档读配置区的同一份规则。
+    返回与 df 同索引的 trend_score / competition_score / buildability_score /
+    final_score / decision 五列。
+    """
+    ratio = _numeric_column(df, 'avg_ratio')
+    growth = _numeric_column(df, 'growth')
+    intent_score = _numeric_column(df, 'intent_score')
+
+    # 1. Trend Score（NaN 参与比较都是 False，与逐行版本一样落到 50 分）
+    trend_score = np.select(
+        [ratio >= THRESHOLDS[threshold] if min_growth is None
+         else (ratio >= THRESHOLDS[threshold]) & (growth > min_growth)
+         for threshold, min_growth, _ in TREND_SCORE_TIERS],
+        [score for _, _, score in TREND_SCORE_TIERS],
+        default=TREND_BASE_SCORE
+    )
+
+    # 3. Competition Score
+    # 降维打击按 Python 真值判断：没做 SERP 分析的词合并后是 NaN，NaN 为真（满分）
+    if '降维打击' in df.columns:
+        dimension_strike = df['降维打击'].astype(object).astype(bool).to_numpy()
+    else:
+        dimension_strike = np.zeros(len(df), dtype=bool)
+    competition = _text_column(df, 'competition')
+    tier_masks = [
+        np.logical_or.reduce([competition.str.contains(marker, regex=False, na=False).to_numpy()
+                              for marker in markers])
+        for markers, _ in COMPETITION_SCORE_TIERS
+    ]
+    comp_score = np.select(
+        [dimension_strike] + tier_masks,
+        [DIMENSION_STRIKE_SCORE] + [score for _, score in COMPETITION_SCORE_TIERS],
+        default=COMPETITION_BASE_SCORE
+    )
+
+    # 4. Buildability Score
+    build_score = calculate_buildability_scores(_text_column(df, 'keyword'))
+
+    # 综合评分（与逐行版本相同的运算顺序，浮点结果逐位一致）
+    final_score = (
+        trend_score * FINAL_SCORE_WEIGHTS["trend"] +
+        intent_score * FINAL_SCORE_WEIGHTS["intent"] +
+        comp_score * FINAL_SCORE_WEIGHTS["competition"] +
+        build_score * FINAL_SCORE_WEIGHTS["buildability"]
+    )
+
+    # 决策（按未四舍五入的分数判断）
+    decision = np.select(
+        [final_score >= THRESHOLDS[threshold] for threshold, _ in DECISION_TIERS],
+        [label for _, label in DECISION_TIERS],
+        default=DEFAULT_DECISION
+    )
+
+    return pd.DataFrame({
+        "trend_score": trend_score.astype(np.int64),
+        "competition_score": comp_score.astype(np.int64),
+        "buildability_score": build_score.astype(np.int64),
+        # Python round（十进制正确舍入），np.round 在 .x5 边界上会有差异
+        "final_score": [round(score, 1) for score in final_score.tolist()],
+        "decision": decision.astype(object)
+    }, index=df.index)
+
+def benchmark_final_scoring(sizes: List[int] = (10_000, 100_000, 1_000_000),
+                            row_limit: int = 100_000, seed: int = 42):
+    """
+    对比逐行 apply 与向量化评分的耗时，并校验两者结果一致
+
+    超过 row_limit 行时逐行版本按 row_limit 行的耗时线性估算（1M 行要跑好几分钟）。
+    """
+    rng = np.random.default_rng(seed)
+    keywords = np.array(["pdf converter", "free invoice generator", "online timer",
+                         "mortgage calculator", "how to fix slow wifi", "best notes app"])
+    competitions = np.array(["🟢 WEAK", "🟢 LOW", "🟡 MEDIUM", "🟡 MEDIUM-LOW", "🔴 HIGH", np.nan],
+                            dtype=object)
+    strikes = np.array([True, False, np.nan], dtype=object)
+
+    for n in sizes:
+        df = pd.DataFrame({
+            "keyword": rng.choice(keywords, n),
+            "avg_ratio": np.where(rng.random(n) < 0.1, np.nan, rng.random(n) * 0.3),
+            "growth": np.where(rng.random(n) < 0.1, np.nan, rng.integers(-10, 20, n)),
+            "intent_score": rng.integers(0, 101, n),
+            "competition": rng.choice(competitions, n),
+            "降维打击": rng.choice(strikes, n),
+        })
+        # 竞争度为 NaN 的行（没做 SERP 分析）降维打击也是 NaN
+        df.loc[df["competition"].isna(), "降维打击"] = np.nan
+
+        start = time.perf_counter()
+        vectorized = calculate_final_scores(df)
+        vectorized_time = time.perf_counter() - start
+
+        sample = df.iloc[:min(n, row_limit)]
+        start = time.perf_counter()
+        row_wise = sample.apply(lambda row: pd.Series(calculate_final_score_ultimate(row)), axis=1)
+        row_time = (time.perf_counter() - start) * n / len(sample)
+
+        identical = row_wise.equals(vectorized.iloc[:len(sample)])
+        estimated = "（估算）" if len(sample) < n else ""
+        log_execution(f"⏱️ {n:>9,} 行: 逐行 {row_time:8.2f}s{estimated} | "
+                      f"向量化 {vectorized_time:6.3f}s | 加速 {row_time / vectorized_time:6.0f}x | "
+                      f"结果一致: {identical}")
+
 # ==================== Main Pipeline ====================
 
 def run_ultimate_hunter(
@@ -741,57 +889,79 @@ def run_ultimate_hunter(
                 df_trends_renamed[['keyword', 'seed', 'source']]
             ], ignore_index=True).drop_duplicates(subset=['keyword'])
     
+    # 主题分组（稀疏 TF-IDF + mini-batch k-means），超出数量上限时按主题轮流抽样，
+    # 避免一个大主题吃掉大部分 Trends 预算
+    all_candidates = all_candidates.merge(group_topics(all_candidates['keyword']), on='keyword', how='left')
+    log_execution(f"\n🗺️ 主题分组：{len(all_candidates)} 个词 → {all_candidates['topic'].nunique()} 个主题")
+    
     # 限制候选词数量
     if len(all_candidates) > max_candidates:
-        all_candidates = all_candidates.sample(max_candidates)
+        all_candidates = sample_per_topic(all_candidates, max_candidates)
+    
+    # 候选词表：每个词一个整数 ID，后续各步骤按 ID 写入自己的列（不再逐步 merge）
+    candidates = CandidateTable.from_frame(all_candidates)
+    keywords = candidates.keywords
+    
+    # Step 1.5: 近重复聚类（词序调换、free/online、年份后缀……）
+    # 每个簇只让代表词跑 Trends 和 SERP 抓取，结果铺给整个簇，shared_from_cluster 标记借用的行
+    clusters = cluster_keywords(keywords)
+    representatives = list(dict.fromkeys(clusters.values()))
+    candidates.set_column('cluster', [clusters[kw] for kw in keywords])
+    candidates.set_column('shared_from_cluster', [clusters[kw] != kw for kw in keywords])
+    if keywords:
+        log_execution(f"\n🧬 近重复聚类：{len(keywords)} 个词 → {len(representatives)} 个代表词"
+                      f"（Trends / SERP 请求减少 {1 - len(representatives) / len(keywords):.0%}）")
     
     # Step 2: GPTs Benchmark (必选)
-    log_execution(f"\n⚖️ Step 2: GPTs 基准对比（{len(all_candidates)} 个词）...")
+    log_execution(f"\n⚖️ Step 2: GPTs 基准对比（{len(representatives)} 个代表词）...")
     df_gpts = compare_to_gpts_batch(
-        all_candidates['keyword'].tolist(),
+        representatives,
         batch_size=TRENDS_CONFIG["BATCH_SIZE"],
         max_retries=TRENDS_CONFIG["MAX_RETRIES"],
         delay=TRENDS_CONFIG["DELAY_PER_REQUEST"]
     )
     
     if not df_gpts.empty:
-        all_candidates = all_candidates.merge(
-            df_gpts,
-            on='keyword',
-            how='left'
-        )
+        candidates.join(df_gpts, via='cluster')
     else:
         # 默认值
-        all_candidates['avg_ratio'] = 0.05
-        all_candidates['growth'] = 0
+        candidates.set_column('avg_ratio', 0.05)
+        candidates.set_column('growth', 0)
     
     # Step 3: SERP Analysis
     log_execution("\n🎯 Step 3: SERP 竞争分析...")
-    df_serp = batch_analyze_serp(all_candidates['keyword'].tolist(), use_playwright=enable_playwright)
-    all_candidates = all_candidates.merge(df_serp, on='keyword', how='left')
-    
-    # Step 4: Intent Scoring
-    log_execution("\n🧠 Step 4: 意图评分...")
-    intent_results = [calculate_intent_score(kw) for kw in all_candidates['keyword']]
-    df_intent = pd.DataFrame(intent_results)
-    all_candidates = all_candidates.merge(df_intent, on='keyword', how='left')
-    
-    # Step 4.5: User Intent Mining（新增：深挖用户意图）
-    log_execution("\n💡 Step 4.5: 用户意图深挖...")
-    user_intent_results = [detect_user_intent(kw) for kw in all_candidates['keyword']]
-    df_user_intent = pd.DataFrame(user_intent_results)
-    all_candidates = all_candidates.merge(df_user_intent, on='keyword', how='left')
-    
-    # Step 5: Final Scoring
+    # 只有 Playwright 抓取是外部请求，按簇共享；简化评估是本地规则，每个词单独算
+    if enable_playwright:
+        df_serp = batch_analyze_serp(representatives, use_playwright=True)
+        candidates.join(df_serp, via='cluster')
+    else:
+        df_serp = batch_analyze_serp(keywords, use_playwright=False)
+        candidates.join(df_serp)
+    
+    # Step 4 + 4.5: 意图评分 + 用户意图深挖（延迟到评分读取时计算，关键词多时多进程并行）
+    def intent_columns(table: CandidateTable) -> Dict[str, list]:
+        log_execution("\n🧠 Step 4: 意图评分 + 💡 用户意图深挖...")
+        columns = parallel_map_chunks(score_intent_columns, table.keywords)
+        columns.pop("keyword", None)
+        return columns
+    
+    candidates.lazy(INTENT_COLUMNS + USER_INTENT_COLUMNS, intent_columns)
+    
+    # Step 5: Final Scoring（直接读表里的列，评分结果也写回表里）
     log_execution("\n📊 Step 5: 终极评分...")
-    scores = all_candidates.apply(lambda row: pd.Series(calculate_final_score_ultimate(row)), axis=1)
-    final_df = pd.concat([all_candidates, scores], axis=1)
-    final_df = final_df.sort_values("final_score", ascending=False)
+    scores = calculate_final_scores(candidates)
+    for column in scores.columns:
+        candidates.set_column(column, scores[column])
+    final_df = candidates.to_frame().sort_values("final_score", ascending=False)
     
     # 保存
     csv_path = os.path.join(DATA_DIR, "ultimate_final_results.csv")
     final_df.to_csv(csv_path, index=False, encoding='utf-8-sig')
     
+    # 按主题汇总
+    rollup = topic_rollup(final_df)
+    rollup.to_csv(os.path.join(DATA_DIR, "ultimate_topic_rollup.csv"), index=False, encoding='utf-8-sig')
+    
     # 统计
     stats = {
         'total': len(final_df),
@@ -806,6 +976,9 @@ def run_ultimate_hunter(
     log_execution(f"🔴 立即做: {stats['build_now']}")
     log_execution(f"🟡 观察: {stats['watch']}")
     log_execution(f"📈 平均分: {stats['avg_score']:.1f}")
+    for _, topic in rollup.head(5).iterrows():
+        log_execution(f"🗺️ {topic['topic_label']}: {topic['keywords']} 个词，平均 {topic['avg_score']} 分，"
+                      f"代表词 {topic['top_keyword']}")
     log_execution("=" * 60)
     
     return csv_path, final_df, stats
@@ -819,9 +992,21 @@ def main():
     parser.add_argument('--trends', action='store_true', help='启用 Trends 深度挖掘')
     parser.add_argument('--playwright', action='store_true', help='启用 Playwright SERP 分析（慢）')
     parser.add_argument('--max', type=int, default=50, help='最大候选词数量')
+    parser.add_argument('--benchmark', action='store_true', help='评分性能基准（逐行 vs 向量化），不挖掘')
+    parser.add_argument('--rescore', nargs='?', const='', default=None, metavar='CSV',
+                        help='用存下来的原始信号离线重算评分并对比决策（不联网，可指定之前的结果 CSV）')
     
     args = parser.parse_args()
     
+    if args.benchmark:
+        benchmark_final_scoring()
+        return
+    
+    if args.rescore is not None:
+        from offline_rescore import run_rescore
+        run_rescore(input_path=args.rescore or None)
+        return
+    
     seeds = load_seed_words()
     
     csv_path, final_df, stats = run_ultimate_hunter(
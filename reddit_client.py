@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📡 Reddit Client - 按 Reddit 限速响应头控制请求节奏
+===================================================
+
+Reddit 每个响应都带三个响应头：
+    x-ratelimit-used       本窗口已用请求数
+    x-ratelimit-remaining  本窗口剩余请求数
+    x-ratelimit-reset      距窗口重置的秒数
+
+RedditClient 每次收到响应就更新这三个值，然后把剩余额度平均分摊到
+重置前的剩余时间里：下一个请求的间隔 = 剩余秒数 / 剩余次数。
+额度用完时精确等到窗口重置；收到 429 时按 Retry-After / reset 退避后重试。
+还没拿到响应头之前，按 default_interval 的固定间隔发请求。
+
+用法与 requests.Session 相同（client.get(url, params=..., timeout=...)），
+可以直接传给 reddit_evidence 的收集函数；client.budget() 返回当前剩余额度。
+"""
+
+import time
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import requests
+
+# 窗口重置后多等一点，避免和服务端时钟边界撞上
+RESET_MARGIN = 0.5
+
+# ==================== 工具函数 ====================
+
+def log_execution(message: str, level: str = "INFO"):
+    """日志记录"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}")
+
+def _header_float(headers, name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+# ==================== 客户端 ====================
+
+class RedditClient:
+    """
+    线程安全的 Reddit 请求客户端
+
+    多个线程共享一个实例时，按“预约时间片”的方式错开请求（同 HostRateLimiter），
+    时间片的间隔由最近一次响应的限速头决定。
+    """
+
+    def __init__(self, session: requests.Session, default_interval: float = 1.0,
+                 max_retries: int = 2):
+        self.session = session
+        self.default_interval = default_interval
+        self.max_retries = max_retries
+        self.remaining: Optional[float] = None
+        self.used: Optional[float] = None
+        self.reset_at: Optional[float] = None   # time.monotonic() 时间
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    # ---------- 节奏 ----------
+
+    def _interval(self, now: float) -> float:
+        """当前额度下两次请求之间的间隔（调用方持有锁）"""
+        if self.remaining is None or self.reset_at is None or now >= self.reset_at:
+            return self.default_interval
+        return (self.reset_at - now) / max(self.remaining, 1)
+
+    def reserve(self) -> float:
+        """预约下一个请求时间片，返回需要等待的秒数（不睡眠）"""
+        with self._lock:
+            now = time.monotonic()
+            if self.remaining is not None and self.remaining < 1 and \
+                    self.reset_at is not None and now < self.reset_at:
+                # 额度用完：等到窗口重置
+                slot = max(self._next_slot, self.reset_at + RESET_MARGIN)
+            else:
+                slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval(slot)
+            if self.remaining is not None:
+                self.remaining -= 1  # 先占用一次，等响应头再校正
+        return slot - now
+
+    def update(self, headers) -> None:
+        """用响应头更新额度"""
+        remaining = _header_float(headers, "x-ratelimit-remaining")
+        reset = _header_float(headers, "x-ratelimit-reset")
+        used = _header_float(headers, "x-ratelimit-used")
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self.remaining = remaining
+            self.used = used
+            self.reset_at = now + reset
+            # 按新额度校正下一个时间片：间隔变大时往后推，额度用完时等到重置
+            if remaining >= 1:
+                self._next_slot = max(self._next_slot, now + self._interval(now))
+            else:
+                self._next_slot = max(self._next_slot, self.reset_at + RESET_MARGIN)
+
+    def budget(self) -> Dict:
+        """当前剩余额度（供调度使用）"""
+        with self._lock:
+            now = time.monotonic()
+            reset_in = max(0.0, self.reset_at - now) if self.reset_at is not None else None
+            return {
+                "remaining": self.remaining,
+                "used": self.used,
+                "reset_in": reset_in,
+                "interval": self._interval(now)
+            }
+
+    # ---------- 请求 ----------
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """按节奏发 GET 请求；429 时退避后重试"""
+        for attempt in range(self.max_retries + 1):
+            delay = self.reserve()
+            if delay > 0:
+                time.sleep(delay)
+
+            response = self.session.get(url, **kwargs)
+            self.update(response.headers)
+
+            if response.status_code != 429 or attempt == self.max_retries:
+                return response
+
+            retry_after = _header_float(response.headers, "retry-after") or \
+                _header_float(response.headers, "x-ratelimit-reset") or self.default_interval * 10
+            log_execution(f"⏸️ Reddit 429 限速，{retry_after:.0f} 秒后重试", "WARNING")
+            with self._lock:
+                self.remaining = 0
+                self.reset_at = time.monotonic() + retry_after
+                self._next_slot = self.reset_at + RESET_MARGIN
+        return response
@@ -0,0 +1,685 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧵 Reddit Evidence - 分页流式收集 Reddit 痛点证据
+================================================
+
+沿着 Reddit 搜索接口的 after 游标一页一页往后翻，每到一页就增量评分：
+- 内存里只保留累计值（帖子数、痛点信号数、抱怨的评论/点赞总和）
+  和 Top N 条真实抱怨（小根堆）；
+- 达到帖子数 / 时间预算（stop_reason 分别是 post_budget / time_budget）、
+  没有下一页（exhausted）、分数已封顶（100 分，后面的帖子不会再改变结论；
+  增量模式除外）、或连续几页都没有痛点信号时提前停止。
+
+评分公式与原来单页版本相同：
+    min(100, 痛点信号数 * 10 + 抱怨评论数 / 10 + 抱怨点赞数 / 20)
+
+增量模式（update_reddit_evidence）：
+每个关键词计入评分的帖子、已见帖子 ID、水位线存在 data/reddit_state/ 下，
+之后的运行按 sort=new 只抓比水位线更新的帖子，翻到水位线就停，
+在上次的帖子上继续评分。每隔 full_refresh_days 天做一次完整重扫。
+- 水位线只在真正翻到它（caught_up）或结果翻完时前移；因为帖子数 / 时间预算
+  中途停下时水位线不动，记下 after 游标，下次从那里接着往旧翻，补上中间的帖子。
+- 评分只算时间窗口（time_filter，默认一年）内最新的 max_posts 条帖子，
+  和完整扫描的上限一样，分数不会随增量运行次数一直涨。
+
+近重复过滤：
+转帖、重复发帖按标题+正文的 SimHash 指纹识别（text_fingerprints），
+在扫描痛点信号之前就丢掉，不计入帖子数、信号数和抱怨的评论/点赞；
+指纹随增量状态一起保存，跨运行也能识别。
+
+批量模式（update_reddit_evidence_batch）：
+共享种子词的关键词（"pdf to word converter"、"pdf converter online free"）
+合并成一个 OR 查询，只抓一次并集，再按关键词的实词是否都出现在帖子里
+把帖子归到各个关键词，分别累计评分。
+plan_reddit_batches 把关键词分成互相独立的批次，调用方可以每批一个任务并发执行
+（update_reddit_batch），每个词只等自己所在的批次。
+"""
+
+import os
+import json
+import time
+import heapq
+import hashlib
+import tempfile
+import itertools
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Iterator, Tuple
+
+import requests
+
+from pattern_matcher import PatternMatcher
+from keyword_tokens import keyword_tokens
+from text_fingerprints import simhash, SimHashIndex
+
+REDDIT_SEARCH_URL = "https://www.reddit.com/search.json"
+
+DATA_DIR = "data"
+REDDIT_STATE_DIR = os.path.join(DATA_DIR, "reddit_state")
+
+# 每个关键词最多记住的已见帖子 ID 数（按时间保留最新的）
+MAX_SEEN_IDS = 1000
+
+# 每个关键词最多记住的帖子指纹数（保留最新的）
+MAX_FINGERPRINTS = 1000
+
+# 每个关键词最多计入评分的帖子数（完整扫描和增量更新共用）
+DEFAULT_MAX_POSTS = 100
+
+# Reddit 搜索 t 参数 → 秒数（增量更新时过期的帖子不再计分）
+TIME_FILTER_SECONDS = {
+    "hour": 3600, "day": 86400, "week": 7 * 86400,
+    "month": 31 * 86400, "year": 366 * 86400, "all": None
+}
+
+# 批量查询：Reddit 的 q 参数上限约 512 字符，留点余量
+MAX_QUERY_CHARS = 400
+
+# 归属判断时忽略的虚词（Reddit 搜索本身也基本忽略它们）
+ATTRIBUTION_STOPWORDS = {
+    "a", "an", "the", "to", "for", "of", "in", "on", "and", "or", "with",
+    "how", "is", "my", "your"
+}
+
+# 常见修饰词：归属时照样要求出现（和逐个查询的结果一致），只是不拿来当分批的种子词
+ANCHOR_STOPWORDS = {"best", "free", "online"}
+
+# 评分上限：达到后停止翻页
+MAX_VALIDATION_SCORE = 100
+
+# 状态文件必须有的字段（缺任何一个都当作没有状态，重新完整扫描；
+# 没有逐帖记录 posts 的旧版本状态也会重扫一次）
+REQUIRED_EVIDENCE_KEYS = ("newest_created_utc", "seen_ids", "posts")
+
+# ==================== 工具函数 ====================
+
+def log_execution(message: str, level: str = "INFO"):
+    """日志记录"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}")
+
+# ==================== 增量评分 ====================
+
+class RedditEvidence:
+    """
+    一个关键词的 Reddit 证据累计器
+
+    每次 add_post 一条帖子，实时更新累计值和验证分数；
+    真实抱怨只保留互动量（点赞 + 评论）最高的 top_n 条；
+    和已收帖子近重复的帖子直接丢弃（duplicate_count 记数）。
+    计入评分的帖子逐条记在 posts 里，prune 去掉过期 / 超出上限的帖子后按剩下的重算。
+    """
+
+    def __init__(self, matcher, top_n: int = 10):
+        self.matcher = matcher
+        self.top_n = top_n
+        self.total_mentions = 0
+        self.pain_signal_count = 0
+        self.signal_counts: Dict[str, int] = {}
+        self.complaint_count = 0
+        self.complaint_comments = 0
+        self.complaint_score = 0
+        self.newest_created_utc = 0.0
+        self.seen_ids: Dict[str, float] = {}
+        self.fingerprints = SimHashIndex()
+        self.duplicate_count = 0
+        self.posts: Dict[str, Dict] = {}  # 计入评分的帖子 → {created_utc, signals, complaint}
+        self.pages = 0
+        self.stop_reason = ""
+        self.cursor: Optional[str] = None  # 本次翻到的 after 游标（还有下一页时）
+        self.oldest_fetched_utc: Optional[float] = None  # 本次抓到的最旧帖子时间
+        self._top_complaints: List = []
+        self._seq = itertools.count()
+
+    def add_post(self, post_data: Dict, fingerprint: Optional[int] = None) -> int:
+        """
+        累计一条帖子，返回该帖子里不同痛点信号的数量
+
+        已见过的帖子和近重复帖子跳过，返回 0。
+        fingerprint: 调用方已算好的 SimHash（批量模式一条帖子归给多个关键词时只算一次）
+        """
+        post_id = post_data.get("id")
+        created_utc = post_data.get("created_utc", 0) or 0
+        if post_id:
+            if post_id in self.seen_ids:
+                return 0
+            self.seen_ids[post_id] = created_utc
+        self.newest_created_utc = max(self.newest_created_utc, created_utc)
+
+        title = post_data.get("title", "")
+        combined_text = title + " " + post_data.get("selftext", "")
+
+        if fingerprint is None:
+            fingerprint = simhash(combined_text)
+        if fingerprint is not None and not self.fingerprints.add_if_new(fingerprint):
+            self.duplicate_count += 1
+            return 0
+
+        # 同一帖子里的每个不同信号都计入
+        post_signals = []
+        title_signals = []
+        for match in self.matcher.finditer(combined_text):
+            if match.pattern not in post_signals:
+                post_signals.append(match.pattern)
+            if match.end <= len(title) and match.pattern not in title_signals:
+                title_signals.append(match.pattern)
+
+        # 真实抱怨：标题里有痛点信号
+        complaint = None
+        if title_signals and len(title) < 200:
+            complaint = {
+                "text": title,
+                "signals": title_signals,
+                "score": post_data.get("score", 0),
+                "num_comments": post_data.get("num_comments", 0),
+                "url": f"https://reddit.com{post_data.get('permalink', '')}"
+            }
+
+        key = post_id or hashlib.sha1(combined_text.encode("utf-8")).hexdigest()[:16]
+        self.posts[key] = {"created_utc": created_utc, "signals": post_signals, "complaint": complaint}
+        self._count(post_signals, complaint)
+        return len(post_signals)
+
+    def _count(self, post_signals: List[str], complaint: Optional[Dict]):
+        """把一条帖子的信号和真实抱怨计入累计值"""
+        self.total_mentions += 1
+        self.pain_signal_count += len(post_signals)
+        for signal in post_signals:
+            self.signal_counts[signal] = self.signal_counts.get(signal, 0) + 1
+        if complaint is None:
+            return
+
+        self.complaint_count += 1
+        self.complaint_comments += complaint["num_comments"]
+        self.complaint_score += complaint["score"]
+        entry = (complaint["score"] + complaint["num_comments"], next(self._seq), complaint)
+        if len(self._top_complaints) < self.top_n:
+            heapq.heappush(self._top_complaints, entry)
+        elif entry[0] > self._top_complaints[0][0]:
+            heapq.heapreplace(self._top_complaints, entry)
+
+    def _recount(self):
+        """按 posts 重算全部累计值和 Top N 抱怨"""
+        self.total_mentions = 0
+        self.pain_signal_count = 0
+        self.signal_counts = {}
+        self.complaint_count = 0
+        self.complaint_comments = 0
+        self.complaint_score = 0
+        self._top_complaints = []
+        for post in self.posts.values():
+            self._count(post["signals"], post["complaint"])
+
+    def prune(self, oldest_utc: Optional[float] = None, max_posts: Optional[int] = None) -> int:
+        """
+        只保留评分窗口内的帖子：早于 oldest_utc 的过期，超过 max_posts 条时保留最新的
+
+        有帖子被去掉时按剩下的帖子重算累计值。返回去掉的帖子数。
+        """
+        kept = sorted(self.posts.items(), key=lambda item: -item[1]["created_utc"])
+        if oldest_utc is not None:
+            kept = [item for item in kept if item[1]["created_utc"] >= oldest_utc]
+        if max_posts is not None:
+            kept = kept[:max_posts]
+        dropped = len(self.posts) - len(kept)
+        if dropped:
+            self.posts = dict(kept)
+            self._recount()
+        return dropped
+
+    @property
+    def validation_score(self) -> float:
+        """当前验证分数（痛点信号数 * 10 + 评论数/10 + 点赞数/20，封顶 100）"""
+        return min(MAX_VALIDATION_SCORE,
+            self.pain_signal_count * 10 +
+            self.complaint_comments / 10 +
+            self.complaint_score / 20
+        )
+
+    @property
+    def is_saturated(self) -> bool:
+        """分数已封顶，继续翻页不会改变结论"""
+        return self.validation_score >= MAX_VALIDATION_SCORE
+
+    def top_complaints(self) -> List[Dict]:
+        """Top N 真实抱怨（按互动量降序）"""
+        return [c for _, _, c in sorted(self._top_complaints, key=lambda e: (-e[0], e[1]))]
+
+    def to_result(self) -> Dict:
+        """转换成 search_reddit_pain_points 的返回格式"""
+        return {
+            "total_mentions": self.total_mentions,
+            "pain_signal_count": self.pain_signal_count,
+            "pain_signals": dict(sorted(self.signal_counts.items(), key=lambda x: -x[1])),
+            "complaint_count": self.complaint_count,
+            "real_complaints": self.top_complaints(),
+            "validation_score": self.validation_score,
+            "duplicates_dropped": self.duplicate_count,
+            "pages": self.pages,
+            "stop_reason": self.stop_reason
+        }
+
+    def to_state(self) -> Dict:
+        """导出可持久化的状态（计入评分的帖子 + 已见帖子 + 指纹）"""
+        seen = sorted(self.seen_ids.items(), key=lambda x: -x[1])[:MAX_SEEN_IDS]
+        return {
+            "newest_created_utc": self.newest_created_utc,
+            "seen_ids": dict(seen),
+            "fingerprints": [f"{fp:016x}" for fp in self.fingerprints.fingerprints[-MAX_FINGERPRINTS:]],
+            "duplicate_count": self.duplicate_count,
+            "posts": self.posts
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict, matcher, top_n: int = 10) -> "RedditEvidence":
+        """从 to_state 的结果恢复累计器（累计值按 posts 重算）"""
+        evidence = cls(matcher, top_n=top_n)
+        evidence.newest_created_utc = state["newest_created_utc"]
+        evidence.seen_ids = dict(state["seen_ids"])
+        # 旧版本的状态文件没有指纹
+        evidence.fingerprints = SimHashIndex(int(fp, 16) for fp in state.get("fingerprints", []))
+        evidence.duplicate_count = state.get("duplicate_count", 0)
+        evidence.posts = dict(state["posts"])
+        evidence._recount()
+        return evidence
+
+# ==================== 分页抓取 ====================
+
+def budget_deadline(time_budget: Optional[float]) -> Optional[float]:
+    """时间预算（秒）→ time.monotonic() 截止时间，没有预算返回 None"""
+    return time.monotonic() + time_budget if time_budget else None
+
+def deadline_passed(deadline: Optional[float]) -> bool:
+    """截止时间已到"""
+    return deadline is not None and time.monotonic() >= deadline
+
+def iter_reddit_pages(params: Dict, session: requests.Session, rate_limiter=None,
+                      max_posts: int = 100, deadline: Optional[float] = None,
+                      timeout: int = 15) -> Iterator[Tuple[List[Dict], Optional[str]]]:
+    """
+    沿 after 游标逐页返回 (帖子列表, 下一页游标)，帖子是 post["data"]，没有下一页时游标为 None
+
+    deadline: budget_deadline 的截止时间，到点后不再发请求（调用方用 deadline_passed
+    区分"时间用完"和"没有更多结果"）。调用方可以随时 break，生成器不会再发请求。
+    """
+    params = dict(params)
+    fetched = 0
+
+    while fetched < max_posts:
+        if deadline_passed(deadline):
+            return
+
+        params["limit"] = min(params.get("limit", 25), max_posts - fetched)
+        if rate_limiter is not None:
+            rate_limiter.wait(REDDIT_SEARCH_URL)
+        response = session.get(REDDIT_SEARCH_URL, params=params, timeout=timeout)
+        response.raise_for_status()
+        listing = response.json().get("data", {})
+
+        page = [child.get("data", {}) for child in listing.get("children", [])]
+        if not page:
+            return
+        fetched += len(page)
+        after = listing.get("after")
+        yield page, after
+
+        if not after:
+            return
+        params["after"] = after
+
+def collect_reddit_evidence(keyword: str, matcher, session: requests.Session,
+                            rate_limiter=None, page_size: int = 20, max_posts: int = DEFAULT_MAX_POSTS,
+                            time_budget: Optional[float] = None, top_n: int = 10,
+                            empty_page_stop: int = 2, sort: str = "relevance",
+                            time_filter: str = "year",
+                            evidence: Optional[RedditEvidence] = None,
+                            until_utc: Optional[float] = None,
+                            after: Optional[str] = None,
+                            stop_when_saturated: bool = True) -> RedditEvidence:
+    """
+    流式收集一个关键词的 Reddit 证据
+
+    evidence: 在已有累计器上继续累计（增量模式）
+    until_utc: 配合 sort="new"，翻到不晚于该时间的帖子就停止
+    after: 从这个游标接着往后翻（上次中途停下时记下的 evidence.cursor）
+    stop_when_saturated: 分数封顶就停止翻页（增量模式关掉，新帖子照样收进证据）
+
+    中途请求失败时保留已收集的部分，记录日志后返回。
+    """
+    if evidence is None:
+        evidence = RedditEvidence(matcher, top_n=top_n)
+    params = {"q": keyword, "limit": page_size, "sort": sort, "t": time_filter}
+    if after:
+        params["after"] = after
+    deadline = budget_deadline(time_budget)
+    pages = 0
+    fetched = 0  # 本次抓到的帖子数（增量模式下累计值里还有之前的帖子）
+    empty_pages = 0
+    cursor = after
+    oldest_utc = None
+    stop_reason = "exhausted"
+
+    try:
+        for page, cursor in iter_reddit_pages(params, session, rate_limiter,
+                                              max_posts=max_posts, deadline=deadline):
+            pages += 1
+            fetched += len(page)
+            page_oldest = min((post.get("created_utc") or 0) for post in page)
+            oldest_utc = page_oldest if oldest_utc is None else min(oldest_utc, page_oldest)
+            page_signals = sum(evidence.add_post(post) for post in page)
+
+            if until_utc is not None and any(
+                    (post.get("created_utc") or 0) <= until_utc for post in page):
+                stop_reason = "caught_up"
+                break
+            if stop_when_saturated and evidence.is_saturated:
+                stop_reason = "saturated"
+                break
+            # 按相关度排序时，连续几页没有痛点信号，后面的帖子更不相关
+            empty_pages = 0 if page_signals else empty_pages + 1
+            if empty_page_stop and empty_pages >= empty_page_stop:
+                stop_reason = "no_signals"
+                break
+        else:
+            # 最后一页没有下一页游标就是真的翻完了（哪怕刚好用完帖子数）
+            if pages and cursor is None:
+                stop_reason = "exhausted"
+            elif fetched >= max_posts:
+                stop_reason = "post_budget"
+            elif deadline_passed(deadline):
+                stop_reason = "time_budget"
+
+    except (requests.RequestException, ValueError) as e:
+        stop_reason = "error"
+        log_execution(f"⚠️ Reddit 第{pages + 1}页抓取失败 '{keyword}': {str(e)[:80]}", "WARNING")
+
+    evidence.pages = pages
+    evidence.stop_reason = stop_reason
+    evidence.cursor = cursor
+    evidence.oldest_fetched_utc = oldest_utc
+    return evidence
+
+# ==================== 批量查询 ====================
+
+def keyword_terms(keyword: str) -> List[str]:
+    """关键词里用于归属判断的实词（去掉虚词，修饰词保留）"""
+    words = list(keyword_tokens(keyword).tokens)
+    terms = [w for w in words if w not in ATTRIBUTION_STOPWORDS]
+    return terms or words
+
+def group_related_keywords(keywords: List[str], batch_size: int = 5,
+                           max_query_chars: int = MAX_QUERY_CHARS) -> List[List[str]]:
+    """
+    按共享的种子词把关键词分批
+
+    每个关键词取它在整批词里出现次数最多的实词（不含 free / online 这类修饰词）作为锚点，
+    锚点相同的词放一组，再按 batch_size 和查询长度切块。
+    """
+    def anchor_terms(keyword: str) -> List[str]:
+        terms = keyword_terms(keyword)
+        return [t for t in terms if t not in ANCHOR_STOPWORDS] or terms
+
+    term_freq: Dict[str, int] = {}
+    for keyword in keywords:
+        for term in set(anchor_terms(keyword)):
+            term_freq[term] = term_freq.get(term, 0) + 1
+
+    groups: Dict[str, List[str]] = {}
+    for keyword in keywords:
+        terms = anchor_terms(keyword)
+        anchor = max(terms, key=lambda t: term_freq[t])  # 并列时取靠前的词
+        groups.setdefault(anchor, []).append(keyword)
+
+    batches = []
+    for members in groups.values():
+        batch = []
+        for keyword in members:
+            if batch and (len(batch) >= batch_size or
+                          len(build_or_query(batch + [keyword])) > max_query_chars):
+                batches.append(batch)
+                batch = []
+            batch.append(keyword)
+        if batch:
+            batches.append(batch)
+    return batches
+
+def build_or_query(keywords: List[str]) -> str:
+    """多个关键词 → Reddit OR 查询"""
+    if len(keywords) == 1:
+        return keywords[0]
+    return " OR ".join(f"({keyword})" for keyword in keywords)
+
+def collect_batched_evidence(keywords: List[str], matcher, session: requests.Session,
+                             rate_limiter=None, page_size: int = 20, max_posts: int = DEFAULT_MAX_POSTS,
+                             time_budget: Optional[float] = None, top_n: int = 10,
+                             empty_page_stop: int = 2, sort: str = "relevance",
+                             time_filter: str = "year") -> Dict[str, RedditEvidence]:
+    """
+    一个 OR 查询抓一批关键词的并集，再把帖子归到各个关键词
+
+    归属规则：关键词的全部实词都作为整词出现在帖子标题+正文里。
+    每个关键词最多累计 max_posts 条；全部封顶或达到上限时停止翻页。
+    """
+    if len(keywords) == 1:
+        return {keywords[0]: collect_reddit_evidence(
+            keywords[0], matcher, session, rate_limiter=rate_limiter, page_size=page_size,
+            max_posts=max_posts, time_budget=time_budget, top_n=top_n,
+            empty_page_stop=empty_page_stop, sort=sort, time_filter=time_filter)}
+
+    evidences = {keyword: RedditEvidence(matcher, top_n=top_n) for keyword in keywords}
+    terms = {keyword: set(keyword_terms(keyword)) for keyword in keywords}
+    term_matcher = PatternMatcher(set().union(*terms.values()), whole_words=True)
+
+    query = build_or_query(keywords)
+    params = {"q": query, "limit": page_size, "sort": sort, "t": time_filter}
+    deadline = budget_deadline(time_budget)
+    pages = 0
+    empty_pages = 0
+    stop_reason = "exhausted"
+
+    def is_done(evidence: RedditEvidence) -> bool:
+        return evidence.is_saturated or evidence.total_mentions >= max_posts
+
+    try:
+        for page, _ in iter_reddit_pages(params, session, rate_limiter,
+                                         max_posts=max_posts * len(keywords),
+                                         deadline=deadline):
+            pages += 1
+            page_signals = 0
+            for post in page:
+                text = post.get("title", "") + " " + post.get("selftext", "")
+                present = term_matcher.matched_patterns(text)
+                fingerprint = None
+                for keyword, evidence in evidences.items():
+                    if terms[keyword] <= present and not is_done(evidence):
+                        if fingerprint is None:
+                            fingerprint = simhash(text)
+                        page_signals += evidence.add_post(post, fingerprint=fingerprint)
+
+            if all(is_done(evidence) for evidence in evidences.values()):
+                stop_reason = "saturated"
+                break
+            empty_pages = 0 if page_signals else empty_pages + 1
+            if empty_page_stop and empty_pages >= empty_page_stop:
+                stop_reason = "no_signals"
+                break
+        else:
+            if deadline_passed(deadline):
+                stop_reason = "time_budget"
+
+    except (requests.RequestException, ValueError) as e:
+        stop_reason = "error"
+        log_execution(f"⚠️ Reddit 批量查询第{pages + 1}页失败 '{query[:60]}': {str(e)[:80]}", "WARNING")
+
+    for evidence in evidences.values():
+        evidence.pages = pages
+        evidence.stop_reason = f"batch:{stop_reason}"
+    return evidences
+
+# ==================== 增量状态 ====================
+
+def reddit_state_path(keyword: str) -> str:
+    """关键词 → 状态文件路径（按规范化关键词的哈希命名）"""
+    digest = hashlib.sha1(keyword.strip().lower().encode("utf-8")).hexdigest()[:16]
+    return os.path.join(REDDIT_STATE_DIR, f"{digest}.json")
+
+def load_reddit_state(keyword: str) -> Optional[Dict]:
+    """读取关键词的增量状态，没有、损坏或缺字段时返回 None"""
+    path = reddit_state_path(keyword)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        datetime.fromisoformat(state["full_scan_at"])
+        evidence = state["evidence"]
+        if not all(key in evidence for key in REQUIRED_EVIDENCE_KEYS):
+            raise KeyError("evidence")
+        resume = state.get("resume")
+        if resume is not None and not isinstance(resume.get("after"), str):
+            raise ValueError("resume")
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        log_execution(f"⚠️ Reddit 状态文件无效，重新完整扫描 '{keyword}': {str(e)[:50]}", "WARNING")
+        return None
+    return state
+
+def save_reddit_state(keyword: str, evidence: RedditEvidence, full_scan_at: str,
+                      watermark_utc: Optional[float] = None, resume: Optional[Dict] = None):
+    """
+    保存关键词的增量状态（先写临时文件再替换）
+
+    watermark_utc: 不晚于这个时间的帖子都已抓过（默认是已见的最新帖子时间）
+    resume: 增量更新中途停下时的 {"after": 游标, "oldest_utc": 已抓到的最旧帖子时间}
+    """
+    os.makedirs(REDDIT_STATE_DIR, exist_ok=True)
+    path = reddit_state_path(keyword)
+    state = {
+        "keyword": keyword,
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+        "full_scan_at": full_scan_at,
+        "watermark_utc": evidence.newest_created_utc if watermark_utc is None else watermark_utc,
+        "resume": resume,
+        "evidence": evidence.to_state()
+    }
+    # 每次写一个唯一的临时文件，多个线程同时保存同一个词也不会互相覆盖临时文件
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=REDDIT_STATE_DIR,
+                                     suffix=".tmp", delete=False) as f:
+        tmp_path = f.name
+        json.dump(state, f, ensure_ascii=False)
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+def update_reddit_evidence(keyword: str, matcher, session: requests.Session,
+                           full_refresh_days: Optional[float] = 30,
+                           top_n: int = 10, **collect_kwargs) -> RedditEvidence:
+    """
+    增量更新一个关键词的 Reddit 证据
+
+    - 没有状态、或距上次完整扫描超过 full_refresh_days 天：完整扫描（按相关度）
+    - 否则：按 sort=new 只抓水位线之后的新帖子，在原来的帖子上继续评分；
+      分数已封顶的词也照样翻新帖子（分数保持封顶，真实抱怨和累计值继续更新）。
+      上次中途停下的，这次从记下的游标接着往旧翻，翻到水位线为止。
+
+    保存前按 time_filter 窗口和 max_posts 上限修剪计入评分的帖子，和完整扫描的口径一致。
+    """
+    state = load_reddit_state(keyword)
+    now = datetime.now()
+    max_posts = collect_kwargs.get("max_posts", DEFAULT_MAX_POSTS)
+    window = TIME_FILTER_SECONDS.get(collect_kwargs.get("time_filter", "year"))
+
+    if state is not None and full_refresh_days is not None:
+        full_scan_at = datetime.fromisoformat(state["full_scan_at"])
+        if now - full_scan_at > timedelta(days=full_refresh_days):
+            state = None
+
+    resume = None
+    if state is None:
+        evidence = collect_reddit_evidence(keyword, matcher, session, top_n=top_n, **collect_kwargs)
+        full_scan_at = now.isoformat(timespec="seconds")
+        watermark = evidence.newest_created_utc
+    else:
+        full_scan_at = state["full_scan_at"]
+        evidence = RedditEvidence.from_state(state["evidence"], matcher, top_n=top_n)
+        # 旧版本的状态没有水位线，已见的最新帖子时间就是水位线
+        watermark = state.get("watermark_utc", evidence.newest_created_utc)
+        resume = state.get("resume")
+        if resume:
+            log_execution(f"↩️ Reddit 接着补抓 '{keyword}' 上次停下处之前的帖子")
+        collect_kwargs.update(sort="new", empty_page_stop=0)
+        evidence = collect_reddit_evidence(keyword, matcher, session, top_n=top_n,
+                                           evidence=evidence, until_utc=watermark,
+                                           after=resume["after"] if resume else None,
+                                           stop_when_saturated=False,
+                                           **collect_kwargs)
+        if evidence.stop_reason in ("caught_up", "exhausted"):
+            # 水位线到现在之间的帖子都抓齐了
+            watermark, resume = evidence.newest_created_utc, None
+        elif evidence.stop_reason != "error":
+            # 帖子数 / 时间预算用完，还没翻到水位线：水位线不动，下次从游标接着翻
+            oldest_utc = evidence.oldest_fetched_utc
+            if oldest_utc is None and resume:
+                oldest_utc = resume.get("oldest_utc")
+            resume = {"after": evidence.cursor, "oldest_utc": oldest_utc}
+
+    # 抓取出错时不保存，下次仍按原状态重试
+    if evidence.stop_reason != "error":
+        evidence.prune(oldest_utc=time.time() - window if window else None, max_posts=max_posts)
+        save_reddit_state(keyword, evidence, full_scan_at, watermark_utc=watermark, resume=resume)
+    return evidence
+
+def has_fresh_state(keyword: str, full_refresh_days: Optional[float] = 30) -> bool:
+    """关键词有有效状态且不需要完整刷新（可以只抓新帖子）"""
+    state = load_reddit_state(keyword)
+    if state is None:
+        return False
+    return (full_refresh_days is None or
+            datetime.now() - datetime.fromisoformat(state["full_scan_at"]) <= timedelta(days=full_refresh_days))
+
+def plan_reddit_batches(keywords: List[str], batch_size: int = 5,
+                        full_refresh_days: Optional[float] = 30) -> List[List[str]]:
+    """
+    把一组关键词分成互相独立的 Reddit 批次
+
+    已有有效状态的词各自一批（逐个增量更新，只抓新帖子，请求本来就少）；
+    需要完整扫描的词按种子词分批，一批一个 OR 查询。
+    """
+    incremental, fresh = [], []
+    for keyword in keywords:
+        (incremental if has_fresh_state(keyword, full_refresh_days) else fresh).append(keyword)
+    return [[keyword] for keyword in incremental] + group_related_keywords(fresh, batch_size=batch_size)
+
+def update_reddit_batch(batch: List[str], matcher, session: requests.Session,
+                        full_refresh_days: Optional[float] = 30, top_n: int = 10,
+                        **collect_kwargs) -> Dict[str, RedditEvidence]:
+    """更新 plan_reddit_batches 的一个批次：单个词走增量更新，多个词一个 OR 查询完整扫描"""
+    if len(batch) == 1:
+        keyword = batch[0]
+        return {keyword: update_reddit_evidence(keyword, matcher, session,
+                                                full_refresh_days=full_refresh_days,
+                                                top_n=top_n, **collect_kwargs)}
+
+    full_scan_at = datetime.now().isoformat(timespec="seconds")
+    evidences = collect_batched_evidence(batch, matcher, session, top_n=top_n, **collect_kwargs)
+    for keyword, evidence in evidences.items():
+        if not evidence.stop_reason.endswith("error"):
+            save_reddit_state(keyword, evidence, full_scan_at)
+    return evidences
+
+def update_reddit_evidence_batch(keywords: List[str], matcher, session: requests.Session,
+                                 batch_size: int = 5, full_refresh_days: Optional[float] = 30,
+                                 top_n: int = 10, **collect_kwargs) -> Dict[str, RedditEvidence]:
+    """
+    批量更新一组关键词的 Reddit 证据（按 plan_reddit_batches 分批，逐批执行）
+
+    需要并发时由调用方对每个批次分别调用 update_reddit_batch。
+    """
+    results: Dict[str, RedditEvidence] = {}
+    for batch in plan_reddit_batches(keywords, batch_size=batch_size,
+                                     full_refresh_days=full_refresh_days):
+        results.update(update_reddit_batch(batch, matcher, session,
+                                           full_refresh_days=full_refresh_days,
+                                           top_n=top_n, **collect_kwargs))
+    return results
@@ -16,24 +16,11 @@ echo.
 pause
 
 echo.
-echo 🔍 Step 1: 基础关键词挖掘...
-python profit_hunter_ultimate.py --trends --max 100
+echo 🔍 关键词挖掘 + 深度需求验证（同一进程）...
+python profit_hunter_pipeline.py --trends --max 100 --validate 30
 
 if errorlevel 1 (
-    echo ❌ Step 1 失败
-    pause
-    exit /b 1
-)
-
-echo.
-echo ✅ Step 1 完成！
-echo.
-
-echo 🔍 Step 2: 深度需求验证...
-python profit_hunter_deep_validation.py --input data\ultimate_final_results.csv --max 30
-
-if errorlevel 1 (
-    echo ❌ Step 2 失败
+    echo ❌ 运行失败
     pause
     exit /b 1
 )
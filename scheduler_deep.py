@@ -17,9 +17,8 @@
 
 import schedule
 import time
-import os
-import subprocess
 from datetime import datetime
+from profit_hunter_pipeline import run_pipeline, PIPELINE_CONFIG
 
 def log_execution(message: str):
     """日志记录"""
@@ -27,38 +26,26 @@ def log_execution(message: str):
     print(f"[{timestamp}] {message}")
 
 def run_ultimate_analysis():
-    """运行终极分析（1小时深度版本）"""
+    """运行终极分析（1小时深度版本）：挖掘和深度验证在本进程内一次跑完"""
     log_execution("=" * 60)
     log_execution("🚀 开始深度分析运行...")
     log_execution("=" * 60)
     
     try:
-        # Step 1: 运行基础挖掘（30分钟）
-        log_execution("📍 Step 1: 基础关键词挖掘（预计30分钟）")
-        subprocess.run([
-            "python", "profit_hunter_ultimate.py",
-            "--trends",        # 启用Trends深度挖掘
-            "--max", "100"     # 挖掘100个候选词
-        ], check=True)
-        
-        log_execution("✅ Step 1 完成")
-        
-        # Step 2: 深度需求验证（30分钟）
-        log_execution("📍 Step 2: 深度需求验证（预计30分钟）")
-        
-        # 找到最新的结果文件
-        latest_file = max(
-            [f for f in os.listdir("data") if f.startswith("ultimate_final_results")],
-            key=lambda x: os.path.getctime(os.path.join("data", x))
+        # Step 1: 基础挖掘（30分钟）→ Step 2: 深度需求验证（30分钟）
+        # 评分结果直接交给验证，不再经过子进程和 CSV；
+        # 验证数是上限，Reddit 剩余额度不够时排在后面的词推迟到下次运行
+        result = run_pipeline(
+            enable_trends=True,    # 启用Trends深度挖掘
+            max_candidates=100,    # 挖掘100个候选词
+            max_validate=PIPELINE_CONFIG["MAX_VALIDATE"]
         )
         
-        subprocess.run([
-            "python", "profit_hunter_deep_validation.py",
-            "--input", f"data/{latest_file}",
-            "--max", "30"      # 验证Top 30个关键词
-        ], check=True)
-        
-        log_execution("✅ Step 2 完成")
+        log_execution(f"✅ 挖掘结果: {result['ultimate_csv']}")
+        if result["validation_df"] is not None:
+            log_execution(f"✅ 验证: {len(result['validation_df'])} 个词")
+        if result["report_path"]:
+            log_execution(f"✅ 验证报告: {result['report_path']}")
         
         log_execution("=" * 60)
         log_execution("✅ 本次深度分析运行完成！")
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗄️ SERP Archive - 原始 SERP 页面压缩存档 + 离线重算
+====================================================
+
+每次抓到的 SERP 页面都按内容哈希（sha256）压缩存成一个 blob：
+    data/serp_archive/blobs/ab/abcdef....html.zst   （安装了 zstandard）
+    data/serp_archive/blobs/ab/abcdef....html.gz    （否则用 gzip）
+相同内容只存一份。另有一个很小的索引 index.jsonl，每行一条：
+    {"keyword", "engine", "fetched_at", "sha256", "codec", "size"}
+
+调整 domain_categories.tsv 或 lite 的决策矩阵之后，不用重新抓取：
+    python serp_archive.py rescore-serp                 # 全部引擎，每个词取最新存档
+    python serp_archive.py rescore-serp --engine ddg
+    python serp_archive.py stats
+
+重算只读本地文件（mmap 读取 + 解压 + 单次遍历解析），不访问网络。
+"""
+
+import os
+import sys
+import json
+import gzip
+import zlib
+import mmap
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Iterator
+
+# ==================== 配置区 ====================
+
+DATA_DIR = "data"
+ARCHIVE_DIR = os.path.join(DATA_DIR, "serp_archive")
+BLOBS_DIR = os.path.join(ARCHIVE_DIR, "blobs")
+INDEX_FILE = os.path.join(ARCHIVE_DIR, "index.jsonl")
+
+SERP_ARCHIVE_CONFIG = {
+    "ENABLED": True,           # 关闭后 archive_serp 直接跳过
+    "ZSTD_LEVEL": 10,          # zstd 压缩级别
+    "GZIP_LEVEL": 6,           # gzip 压缩级别
+}
+
+CODEC_EXTENSIONS = {"zstd": ".html.zst", "gzip": ".html.gz"}
+
+# 读取 / 解压 blob 可能抛出的异常（文件缺失、截断、损坏）
+BLOB_READ_ERRORS = (OSError, ValueError, EOFError, zlib.error)
+try:
+    import zstandard
+    BLOB_READ_ERRORS += (zstandard.ZstdError,)
+except ImportError:
+    pass
+
+_INDEX_LOCK = threading.Lock()
+
+# ==================== 工具函数 ====================
+
+def log_execution(message: str, level: str = "INFO"):
+    """日志记录"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"[{timestamp}] [{level}] {message}")
+
+def _default_codec() -> str:
+    """有 zstandard 用 zstd，否则用标准库 gzip"""
+    try:
+        import zstandard  # noqa: F401
+        return "zstd"
+    except ImportError:
+        return "gzip"
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=SERP_ARCHIVE_CONFIG["ZSTD_LEVEL"]).compress(data)
+    return gzip.compress(data, compresslevel=SERP_ARCHIVE_CONFIG["GZIP_LEVEL"])
+
+def _decompress(buf, codec: str) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompressobj().decompress(buf)
+    return gzip.decompress(buf)
+
+def blob_path(sha256: str, codec: str) -> str:
+    """blob 文件路径（按哈希前两位分目录）"""
+    return os.path.join(BLOBS_DIR, sha256[:2], sha256 + CODEC_EXTENSIONS[codec])
+
+# ==================== 存档 ====================
+
+def archive_serp(keyword: str, engine: str, html: str) -> Optional[str]:
+    """
+    存档一份 SERP 原始页面，返回内容哈希
+
+    线程安全；存档失败只记日志，不影响在线分析流程。
+    """
+    if not SERP_ARCHIVE_CONFIG["ENABLED"] or not html:
+        return None
+
+    try:
+        data = html.encode("utf-8")
+        sha256 = hashlib.sha256(data).hexdigest()
+        codec = _default_codec()
+        path = blob_path(sha256, codec)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_compress(data, codec))
+            os.replace(tmp_path, path)
+
+        entry = {
+            "keyword": keyword,
+            "engine": engine,
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            "sha256": sha256,
+            "codec": codec,
+            "size": len(data)
+        }
+        with _INDEX_LOCK:
+            with open(INDEX_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return sha256
+
+    except OSError as e:
+        log_execution(f"⚠️ SERP 存档失败 '{keyword}': {str(e)[:50]}", "WARNING")
+        return None
+
+# ==================== 读取 ====================
+
+def iter_index(engine: Optional[str] = None, latest_only: bool = True) -> Iterator[Dict]:
+    """
+    遍历存档索引
+
+    latest_only=True 时每个 (keyword, engine) 只返回最新一条。
+    """
+    if not os.path.exists(INDEX_FILE):
+        return
+
+    entries = []
+    with open(INDEX_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if engine and entry.get("engine") != engine:
+                continue
+            entries.append(entry)
+
+    if latest_only:
+        latest = {}
+        for entry in entries:
+            latest[(entry["keyword"], entry["engine"])] = entry  # 文件按时间追加，后者覆盖前者
+        entries = list(latest.values())
+
+    yield from entries
+
+def load_serp_html(sha256: str, codec: str = "gzip") -> str:
+    """读取一个 blob（mmap 映射文件后直接解压，不额外拷贝整份压缩数据）"""
+    with open(blob_path(sha256, codec), "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _decompress(mm, codec).decode("utf-8", errors="replace")
+
+# ==================== 离线重算 ====================
+
+def rescore_entry(entry: Dict) -> Dict:
+    """用当前的域名分类和决策矩阵重算一条存档"""
+    from serp_parser import parse_serp
+
+    html = load_serp_html(entry["sha256"], entry.get("codec", "gzip"))
+    serp = parse_serp(html, engine=entry["engine"])
+
+    row = {
+        "keyword": entry["keyword"],
+        "engine": entry["engine"],
+        "fetched_at": entry["fetched_at"],
+        "sha256": entry["sha256"],
+    }
+
+    if entry["engine"] == "ddg":
+        # lite 决策矩阵：Top 5 里的弱竞争对手数量
+        from serp_extractors import classify_serp_competition
+        domains = serp["domains"][:5]
+        scored = classify_serp_competition(domains)
+        row.update({
+            "top_domains": ", ".join(domains),
+            "weak_spots": scored["weak_spots"],
+            "competition": scored["competition"],
+            "decision": scored["decision"],
+        })
+    else:
+        # ultimate 降维打击分析：前 3 名域名分类
+        from serp_extractors import classify_top_domains
+        scored = classify_top_domains(serp["domains"])
+        row.update({
+            "top_domains": ", ".join(scored["top3"]),
+            "competition": scored["competition"],
+            "降维打击": scored["降维打击"],
+        })
+
+    row["ad_count"] = serp["ad_count"]
+    row["features"] = ", ".join(serp["features"])
+    return row
+
+def rescore_serps(engine: Optional[str] = None, latest_only: bool = True,
+                  output_path: Optional[str] = None) -> str:
+    """重算全部存档 SERP 的竞争度，结果写入 CSV，返回文件路径"""
+    import csv
+
+    entries = list(iter_index(engine=engine, latest_only=latest_only))
+    log_execution(f"🔁 离线重算 {len(entries)} 份存档 SERP（engine={engine or 'all'}）")
+
+    rows = []
+    failed = 0
+    for entry in entries:
+        try:
+            rows.append(rescore_entry(entry))
+        except BLOB_READ_ERRORS as e:
+            failed += 1
+            log_execution(f"⚠️ 读取存档失败 '{entry.get('keyword')}': {str(e)[:50]}", "WARNING")
+
+    if output_path is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = os.path.join(DATA_DIR, f"serp_rescore_{timestamp}.csv")
+
+    fieldnames = []
+    for row in rows:
+        for key in row:
+            if key not in fieldnames:
+                fieldnames.append(key)
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    # 统计
+    summary = {}
+    for row in rows:
+        label = row.get("decision") or row.get("competition")
+        summary[label] = summary.get(label, 0) + 1
+    for label, count in sorted(summary.items(), key=lambda x: -x[1]):
+        log_execution(f"   {label}: {count}")
+    if failed:
+        log_execution(f"⚠️ {failed} 份存档读取失败", "WARNING")
+    log_execution(f"✅ 重算结果已保存: {output_path}")
+    return output_path
+
+def archive_stats() -> Dict:
+    """存档统计"""
+    entries = list(iter_index(latest_only=False))
+    blobs = {e["sha256"] for e in entries}
+    stats = {
+        "entries": len(entries),
+        "keywords": len({(e["keyword"], e["engine"]) for e in entries}),
+        "unique_blobs": len(blobs),
+        "raw_bytes": sum(e.get("size", 0) for e in entries),
+    }
+    return stats
+
+# ==================== CLI ====================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='SERP 存档与离线重算')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rescore = subparsers.add_parser('rescore-serp', help='用当前分类表/决策矩阵重算存档 SERP（不联网）')
+    rescore.add_argument('--engine', choices=['ddg', 'google'], default=None, help='只重算某个引擎')
+    rescore.add_argument('--all', action='store_true', help='重算全部历史存档（默认每个词只取最新一份）')
+    rescore.add_argument('--output', type=str, default=None, help='输出 CSV 路径')
+
+    subparsers.add_parser('stats', help='显示存档统计')
+
+    args = parser.parse_args()
+
+    if args.command == 'rescore-serp':
+        rescore_serps(engine=args.engine, latest_only=not args.all, output_path=args.output)
+    elif args.command == 'stats':
+        for key, value in archive_stats().items():
+            print(f"{key}: {value}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧩 SERP Extractors - 一次抓取、一次解析、多个信号提取器
+=======================================================
+
+一份 SERP 页面解析一次（serp_parser），然后依次跑所有注册的提取器：
+- competition: 前 3 名域名分类 → 降维打击判断（ultimate 使用）
+- ads:         广告块数量 → 商业意图（deep validation 使用）
+- forum_gap:   工具站 / 论坛结果数量 → 市场空白（deep validation 使用）
+- features:    SERP 特性（People Also Ask、精选摘要等）
+
+classify_top_domains / classify_serp_competition 是 ultimate / lite 的竞争度判断，
+只依赖域名分类表，在线分析和 serp_archive 的离线重算共用。
+
+合并后的信号按关键词存一份到 data/serp_signals.jsonl，
+后续步骤（如深度验证）直接读取，不必再抓一次 Google。
+
+新增提取器：
+    @register_extractor("my_signal")
+    def extract_my_signal(serp: Dict) -> Dict:
+        return {"my_field": ...}
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Callable, Optional
+
+from serp_parser import parse_serp
+from domain_index import classify_domains
+from serp_archive import archive_serp
+
+# ==================== 配置区 ====================
+
+DATA_DIR = "data"
+SERP_SIGNALS_FILE = os.path.join(DATA_DIR, "serp_signals.jsonl")
+
+# SERP 竞争对手分类（大厂 vs 弱鸡），域名归类见 domain_categories.tsv
+SERP_GIANT_CATEGORIES = {"giant"}
+SERP_WEAK_CATEGORIES = {"forum", "blog"}
+
+# lite 决策矩阵（DuckDuckGo Top 5）的弱竞争对手：论坛、博客平台、社交/UGC
+DDG_WEAK_CATEGORIES = {"forum", "blog", "social"}
+
+# 市场空白判断：论坛结果多 + 工具结果少 = 有需求但缺工具
+GAP_MIN_FORUM_RESULTS = 3
+GAP_MAX_TOOL_RESULTS = 5
+
+# 限流 / 验证码 / 同意页的特征（这类页面解析出来是 0 个结果，不能当成"没有竞争"）
+BLOCK_PAGE_MARKERS = (
+    "unusual traffic", "/sorry/index", "g-recaptcha", "captcha-form", "detected unusual",
+    "consent.google.com", "before you continue to google", "our systems have detected",
+)
+
+SERP_EXTRACTORS: Dict[str, Callable[[Dict], Dict]] = {}
+
+_SIGNALS_CACHE: Optional[Dict[str, Dict]] = None
+_SIGNALS_LOCK = threading.Lock()
+
+# ==================== 注册 ====================
+
+def register_extractor(name: str):
+    """注册一个提取器（装饰器）：输入 parse_serp 的结果，返回信号字典"""
+    def decorator(func: Callable[[Dict], Dict]) -> Callable[[Dict], Dict]:
+        SERP_EXTRACTORS[name] = func
+        return func
+    return decorator
+
+def run_extractors(serp: Dict, names: Optional[List[str]] = None) -> Dict:
+    """对一份解析结果运行所有（或指定的）提取器，合并返回"""
+    signals = {}
+    for name, extractor in SERP_EXTRACTORS.items():
+        if names is not None and name not in names:
+            continue
+        signals.update(extractor(serp))
+    return signals
+
+# ==================== 内置提取器 ====================
+
+def classify_top_domains(top_domains: List[str]) -> Dict:
+    """降维打击分析：根据前 3 名域名的分类判断竞争度"""
+    top3 = top_domains[:3]
+    categories = classify_domains(top3)
+    has_giant = any(c in SERP_GIANT_CATEGORIES for c in categories)
+    has_weak = any(c in SERP_WEAK_CATEGORIES for c in categories)
+
+    if has_weak and not has_giant:
+        return {
+            "competition": "🟢 WEAK",
+            "reason": f"前3名有论坛/博客: {', '.join(top3)}",
+            "top3": top3,
+            "降维打击": True
+        }
+    elif has_giant:
+        return {
+            "competition": "🔴 GIANT",
+            "reason": f"大厂占据: {', '.join(top3)}",
+            "top3": top3,
+            "降维打击": False
+        }
+    else:
+        return {
+            "competition": "🟡 MEDIUM",
+            "reason": f"中等竞争: {', '.join(top3)}",
+            "top3": top3,
+            "降维打击": False
+        }
+
+def classify_serp_competition(domains: List[str]) -> Dict:
+    """
+    lite 的决策矩阵（来自 Yuanbao）：按 Top 域名里的弱竞争对手数量判断
+
+    - ≥2 个弱竞争对手：🟢 LOW → BUILD NOW
+    - 1 个：🟡 MED → WATCH
+    - 0 个：🔴 HIGH → DROP
+    """
+    # 检测弱竞争对手
+    weak_spots = sum(1 for c in classify_domains(domains) if c in DDG_WEAK_CATEGORIES)
+
+    if weak_spots >= 2:
+        competition = "🟢 LOW"
+        decision = "BUILD NOW"
+    elif weak_spots == 1:
+        competition = "🟡 MED"
+        decision = "WATCH"
+    else:
+        competition = "🔴 HIGH"
+        decision = "DROP"
+
+    return {
+        "weak_spots": weak_spots,
+        "competition": competition,
+        "decision": decision,
+        "has_gap": weak_spots >= 2
+    }
+
+@register_extractor("competition")
+def extract_competition(serp: Dict) -> Dict:
+    """前 3 名竞争度"""
+    if not serp["organic"]:
+        return {"competition": "🟢 ZERO", "reason": "无搜索结果", "top3": [], "降维打击": False}
+    return classify_top_domains(serp["domains"])
+
+@register_extractor("ads")
+def extract_ads(serp: Dict) -> Dict:
+    """商业意图（广告数量）"""
+    return {
+        "ad_count": serp["ad_count"],
+        "commercial_intent": min(100, serp["ad_count"] * 10)
+    }
+
+@register_extractor("forum_gap")
+def extract_forum_gap(serp: Dict) -> Dict:
+    """工具站 / 论坛结果数量与市场空白"""
+    tool_count = 0
+    forum_count = 0
+    for category in classify_domains(serp["domains"]):
+        if category == "tool":
+            tool_count += 1
+        elif category == "forum":
+            forum_count += 1
+    return {
+        "tool_results_count": tool_count,
+        "forum_results_count": forum_count,
+        "has_gap": forum_count >= GAP_MIN_FORUM_RESULTS and tool_count < GAP_MAX_TOOL_RESULTS,
+        "top_competitors": serp["domains"][:3]
+    }
+
+@register_extractor("features")
+def extract_features(serp: Dict) -> Dict:
+    """SERP 特性"""
+    return {"serp_features": list(serp["features"])}
+
+# ==================== 一次抓取的完整流程 ====================
+
+class SerpBlockedError(RuntimeError):
+    """抓到的是限流 / 验证码 / 同意页，不是搜索结果"""
+
+def looks_blocked(html: str) -> bool:
+    """页面是否像限流、验证码或同意页"""
+    text = (html or "").lower()
+    return any(marker in text for marker in BLOCK_PAGE_MARKERS)
+
+def analyze_serp_document(keyword: str, engine: str, html: str, store: bool = True) -> Dict:
+    """
+    存档 → 解析一次 → 跑全部提取器 → 保存合并信号
+
+    返回合并后的信号字典（含 organic_count）。
+    没有自然结果的限流 / 验证码 / 同意页抛 SerpBlockedError（不存档、不保存），
+    由调用方走原来的失败分支；其他 0 个自然结果的页面照常返回，
+    但不保存信号，避免在有效期内被当成"没有竞争"复用。
+    """
+    serp = parse_serp(html, engine=engine)
+    if not serp["organic"] and looks_blocked(html):
+        raise SerpBlockedError(f"SERP 被拦截（限流 / 验证码 / 同意页）: {keyword}")
+
+    sha256 = archive_serp(keyword, engine, html)
+    signals = run_extractors(serp)
+    signals["organic_count"] = len(serp["organic"])
+
+    if store and signals["organic_count"] > 0:
+        save_serp_signals(keyword, engine, signals, sha256)
+    return signals
+
+# ==================== 信号存储 ====================
+
+def _signals_key(keyword: str, engine: str) -> str:
+    return f"{engine}:{keyword.strip().lower()}"
+
+def _load_signals_cache() -> Dict[str, Dict]:
+    """读取信号文件，每个关键词保留最新一条"""
+    global _SIGNALS_CACHE
+    if _SIGNALS_CACHE is None:
+        cache = {}
+        if os.path.exists(SERP_SIGNALS_FILE):
+            with open(SERP_SIGNALS_FILE, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    cache[_signals_key(record["keyword"], record["engine"])] = record
+        _SIGNALS_CACHE = cache
+    return _SIGNALS_CACHE
+
+def save_serp_signals(keyword: str, engine: str, signals: Dict, sha256: Optional[str] = None):
+    """追加保存一条合并信号（线程安全）"""
+    record = {
+        "keyword": keyword,
+        "engine": engine,
+        "fetched_at": datetime.now().isoformat(timespec="seconds"),
+        "sha256": sha256,
+        "signals": signals
+    }
+    with _SIGNALS_LOCK:
+        cache = _load_signals_cache()
+        os.makedirs(DATA_DIR, exist_ok=True)
+        with open(SERP_SIGNALS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        cache[_signals_key(keyword, engine)] = record
+
+def load_serp_signals(keyword: str, engine: str = "google",
+                      max_age_hours: Optional[float] = None) -> Optional[Dict]:
+    """读取某个关键词最新的合并信号；超过 max_age_hours 视为过期返回 None"""
+    with _SIGNALS_LOCK:
+        record = _load_signals_cache().get(_signals_key(keyword, engine))
+    if record is None:
+        return None
+    if max_age_hours is not None:
+        fetched_at = datetime.fromisoformat(record["fetched_at"])
+        if datetime.now() - fetched_at > timedelta(hours=max_age_hours):
+            return None
+    return record["signals"]
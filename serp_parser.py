@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔎 SERP Parser - 单次遍历的结构化搜索结果解析
+=============================================
+
+把 DuckDuckGo HTML 版和 Google 搜索结果页解析成统一的结构：
+- organic: 自然结果（排名、URL、域名、标题、摘要）
+- domains: 自然结果域名（按排名）
+- ads / ad_count: 广告块
+- features: SERP 特性（People Also Ask、精选摘要、知识面板等）
+
+解析基于流式事件（lxml 的 parser target，未安装 lxml 时回退到标准库
+html.parser），整页只扫描一次、不构建 DOM 树，script/style 内容直接跳过。
+
+用法：
+    from serp_parser import parse_serp
+    serp = parse_serp(html, engine="ddg")
+    serp["domains"]  # ['reddit.com', 'quora.com', ...]
+"""
+
+from html.parser import HTMLParser
+from typing import List, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+# ==================== 配置区 ====================
+
+# 各搜索引擎的页面布局（class / id / 属性标记）
+SERP_LAYOUTS = {
+    "ddg": {
+        "result_classes": {"result"},           # 单条结果容器
+        "ad_classes": {"result--ad"},           # 广告结果
+        "ad_attrs": set(),
+        "ad_region_ids": set(),
+        "link_classes": {"result__a"},          # 标题链接
+        "title_tag": None,                      # 标题取链接文本
+        "snippet_classes": {"result__snippet"},
+    },
+    "google": {
+        "result_classes": {"g"},
+        "ad_classes": {"ads-fr", "uEierd"},
+        "ad_attrs": {"data-text-ad"},
+        "ad_region_ids": {"tads", "tadsb", "bottomads"},
+        "link_classes": set(),                  # 取容器内第一个外链
+        "title_tag": "h3",
+        "snippet_classes": {"VwiC3b", "st", "IsZvec"},
+    },
+}
+
+# SERP 特性标记：class / id / 属性名 → 特性名
+SERP_FEATURE_MARKERS = {
+    "ddg": {
+        "zci-wrapper": "instant_answer",
+        "zero_click_wrapper": "instant_answer",
+        "module--about": "knowledge_panel",
+    },
+    "google": {
+        "related-question-pair": "people_also_ask",
+        "data-initq": "people_also_ask",
+        "xpdopen": "featured_snippet",
+        "featured-snippet": "featured_snippet",
+        "kp-wholepage": "knowledge_panel",
+        "kp-blk": "knowledge_panel",
+        "lu_map": "local_pack",
+        "local-pack": "local_pack",
+        "g-section-with-header": "top_stories",
+        "video-voyager": "videos",
+        "brs": "related_searches",
+        "botstuff": "related_searches",
+    },
+}
+
+# 不参与文本提取的标签
+SKIP_TEXT_TAGS = {"script", "style", "noscript", "template"}
+
+# HTML 空元素（标准库解析器不会产生结束事件）
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr"
+}
+
+# ==================== 工具函数 ====================
+
+def normalize_domain(url: str) -> str:
+    """从 URL 提取域名（小写、去掉端口和 www.）"""
+    if not url:
+        return ""
+    if "//" not in url:
+        url = "//" + url
+    try:
+        netloc = urlparse(url).netloc
+    except ValueError:
+        return ""
+    netloc = netloc.rsplit("@", 1)[-1].split(":", 1)[0].lower().rstrip(".")
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    return netloc
+
+def unwrap_result_url(href: str) -> str:
+    """还原搜索引擎跳转链接（DDG 的 /l/?uddg=、Google 的 /url?q=）"""
+    if not href:
+        return ""
+    if href.startswith("//"):
+        href = "https:" + href
+    parsed = urlparse(href)
+    if parsed.path in ("/l/", "/url"):
+        params = parse_qs(parsed.query)
+        for key in ("uddg", "q", "url"):
+            if params.get(key):
+                return params[key][0]
+    return href
+
+def empty_serp(engine: str) -> Dict:
+    """空的解析结果"""
+    return {
+        "engine": engine,
+        "organic": [],
+        "domains": [],
+        "ads": [],
+        "ad_count": 0,
+        "features": []
+    }
+
+# ==================== 流式解析器 ====================
+
+class _SerpCollector:
+    """
+    解析事件收集器（lxml parser target 接口：start / end / data / close）
+
+    只追踪当前所在的结果容器、标题、摘要和跳过区域的深度，
+    整页只走一遍事件流。
+    """
+
+    def __init__(self, engine: str):
+        self.engine = engine
+        self.layout = SERP_LAYOUTS[engine]
+        self.feature_markers = SERP_FEATURE_MARKERS.get(engine, {})
+        self.result = empty_serp(engine)
+        self.features = []
+
+        self.depth = 0
+        self.skip_depth = None        # script/style 等区域
+        self.ad_region_depth = None   # 广告区域（Google #tads）
+        self.current = None           # 当前结果容器
+        self.current_depth = None
+        self.title_depth = None
+        self.snippet_depth = None
+
+    # ---------- target 接口 ----------
+
+    def start(self, tag, attrib):
+        self.depth += 1
+        if self.skip_depth is not None:
+            return
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag in SKIP_TEXT_TAGS:
+            self.skip_depth = self.depth
+            return
+
+        classes = set((attrib.get("class") or "").split())
+        element_id = attrib.get("id") or ""
+
+        self._mark_features(tag, classes, element_id, attrib)
+
+        is_ad = bool(classes & self.layout["ad_classes"]) or any(
+            a in attrib for a in self.layout["ad_attrs"]
+        )
+        if element_id in self.layout["ad_region_ids"] and self.ad_region_depth is None:
+            self.ad_region_depth = self.depth
+
+        # 结果容器（嵌套容器只认最外层）
+        if self.current is None and (classes & self.layout["result_classes"] or is_ad):
+            self.current = {
+                "url": "",
+                "title": "",
+                "snippet": "",
+                "is_ad": is_ad or self.ad_region_depth is not None
+            }
+            self.current_depth = self.depth
+        elif self.current is not None and is_ad:
+            self.current["is_ad"] = True
+
+        if self.current is None:
+            return
+
+        # 链接
+        if tag == "a" and not self.current["url"]:
+            link_classes = self.layout["link_classes"]
+            if not link_classes or classes & link_classes:
+                url = unwrap_result_url(attrib.get("href") or "")
+                if url.startswith("http"):
+                    self.current["url"] = url
+                    if self.layout["title_tag"] is None and self.title_depth is None:
+                        self.title_depth = self.depth
+
+        # 标题
+        title_tag = self.layout["title_tag"]
+        if title_tag and tag == title_tag and not self.current["title"] and self.title_depth is None:
+            self.title_depth = self.depth
+
+        # 摘要
+        if classes & self.layout["snippet_classes"] and self.snippet_depth is None \
+                and not self.current["snippet"]:
+            self.snippet_depth = self.depth
+
+    def end(self, tag):
+        if self.skip_depth is not None:
+            if self.depth == self.skip_depth:
+                self.skip_depth = None
+            self.depth -= 1
+            return
+
+        if self.title_depth == self.depth:
+            self.title_depth = None
+        if self.snippet_depth == self.depth:
+            self.snippet_depth = None
+        if self.current_depth == self.depth:
+            self._finish_result()
+        if self.ad_region_depth == self.depth:
+            self.ad_region_depth = None
+        self.depth -= 1
+
+    def data(self, text):
+        if self.skip_depth is not None or self.current is None:
+            return
+        if self.title_depth is not None:
+            self.current["title"] += text
+        elif self.snippet_depth is not None:
+            self.current["snippet"] += text
+
+    def comment(self, text):
+        pass
+
+    def close(self) -> Dict:
+        if self.current is not None:
+            self._finish_result()
+        self.result["features"] = list(dict.fromkeys(self.features))
+        return self.result
+
+    # ---------- 内部 ----------
+
+    def _mark_features(self, tag, classes, element_id, attrib):
+        markers = self.feature_markers
+        if not markers:
+            return
+        if tag in markers:
+            self.features.append(markers[tag])
+        if element_id in markers:
+            self.features.append(markers[element_id])
+        for c in classes:
+            if c in markers:
+                self.features.append(markers[c])
+        for a in attrib:
+            if a in markers:
+                self.features.append(markers[a])
+
+    def _finish_result(self):
+        item = self.current
+        self.current = None
+        self.current_depth = None
+        self.title_depth = None
+        self.snippet_depth = None
+
+        if item["is_ad"]:
+            self.result["ads"].append({
+                "url": item["url"],
+                "domain": normalize_domain(item["url"]),
+                "title": " ".join(item["title"].split())
+            })
+            self.result["ad_count"] += 1
+            return
+
+        if not item["url"]:
+            return
+        domain = normalize_domain(item["url"])
+        if not domain:
+            return
+        self.result["organic"].append({
+            "position": len(self.result["organic"]) + 1,
+            "url": item["url"],
+            "domain": domain,
+            "title": " ".join(item["title"].split()),
+            "snippet": " ".join(item["snippet"].split())
+        })
+        self.result["domains"].append(domain)
+
+class _StdlibAdapter(HTMLParser):
+    """把标准库 HTMLParser 的回调转换成 target 接口（lxml 不可用时）"""
+
+    def __init__(self, target: _SerpCollector):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, {k: (v or "") for k, v in attrs})
+        if tag in VOID_TAGS:
+            self.target.end(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, {k: (v or "") for k, v in attrs})
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        if tag not in VOID_TAGS:
+            self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+# ==================== 对外接口 ====================
+
+def parse_serp(html: str, engine: str = "google") -> Dict:
+    """
+    单次遍历解析 SERP 页面
+
+    参数：
+        html: 页面 HTML
+        engine: "ddg"（html.duckduckgo.com）或 "google"
+
+    返回：
+    {
+        "engine": 引擎名,
+        "organic": [{"position", "url", "domain", "title", "snippet"}, ...],
+        "domains": 自然结果域名列表（按排名）,
+        "ads": [{"url", "domain", "title"}, ...],
+        "ad_count": 广告块数量,
+        "features": SERP 特性列表
+    }
+    """
+    if engine not in SERP_LAYOUTS:
+        raise ValueError(f"未知的搜索引擎布局: {engine}")
+    if not html or not html.strip():
+        return empty_serp(engine)
+
+    collector = _SerpCollector(engine)
+    try:
+        from lxml import etree
+
+        parser = etree.HTMLParser(target=collector, recover=True)
+        parser.feed(html)
+        return parser.close()
+    except ImportError:
+        adapter = _StdlibAdapter(collector)
+        adapter.feed(html)
+        adapter.close()
+        return collector.close()
+
+def top_domains(serp: Dict, n: Optional[int] = None) -> List[str]:
+    """前 n 个自然结果域名"""
+    domains = serp.get("domains", [])
+    return domains[:n] if n is not None else list(domains)
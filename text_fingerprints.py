@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧬 Text Fingerprints - 文本指纹与近重复检测
+==========================================
+
+SimHash：把一段文本（词 + 相邻词对）压成一个 64 位指纹，
+内容几乎相同的文本（转帖、重复发帖、只改了几个字）指纹的汉明距离很小。
+
+SimHashIndex 把 64 位指纹切成 8 段 8 位，按段建索引：
+汉明距离 ≤ 6 的两个指纹至少有一段完全相同（抽屉原理），
+所以查近重复只需要比对同段的少量候选，不用全表扫描。
+
+指纹用 blake2b 做词哈希（与进程无关），可以跨运行持久化。
+
+MinHash + LSH（关键词聚类）：
+挖出来的关键词里有大量近似写法（词序调换、多个 free / online、年份后缀），
+每个都要单独跑一次 Trends 和 SERP。keyword_shingles 把关键词变成词集合
+（去掉通用修饰词和年份，复数归一），MinHashLSH 按 16 段 × 8 行分桶，
+只和同桶的代表词做精确 Jaccard 比较；cluster_keywords 一遍扫完，
+每个簇选一个代表词去跑昂贵的外部请求，总耗时近似线性。
+"""
+
+import re
+import hashlib
+from functools import lru_cache
+from typing import List, Dict, Optional, Iterable, FrozenSet
+
+import numpy as np
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 8
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# 汉明距离不超过这个值视为近重复（必须 < SIMHASH_BANDS）
+# 标题 + 正文加一个前缀（"[crosspost]"）或改几个字通常在 6 以内，不相关的帖子一般 > 10
+DEFAULT_MAX_DISTANCE = 6
+
+# 词数太少的文本（如 "need help"）不做指纹，避免误判为重复
+MIN_TOKENS = 4
+
+TOKEN_RE = re.compile(r"\w+")
+
+# ==================== 指纹 ====================
+
+@lru_cache(maxsize=65536)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+def tokenize(text: str) -> List[str]:
+    """小写分词"""
+    return TOKEN_RE.findall(text.lower())
+
+def simhash(text: str) -> Optional[int]:
+    """
+    64 位 SimHash（特征 = 词 + 相邻词对），词数不足 MIN_TOKENS 时返回 None
+
+    按位加权投票用 numpy 一次完成：哈希 → 拆成比特矩阵 → 按列求和。
+    """
+    tokens = tokenize(text)
+    if len(tokens) < MIN_TOKENS:
+        return None
+
+    features = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+    hashes = np.array([_token_hash(f) for f in features], dtype="<u8")
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(features)
+
+    fingerprint = 0
+    for i in np.flatnonzero(votes > 0):
+        fingerprint |= 1 << int(i)
+    return fingerprint
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+# ==================== 索引 ====================
+
+class SimHashIndex:
+    """按 8 位分段索引的 SimHash 集合，支持近重复查询"""
+
+    def __init__(self, fingerprints: Iterable[int] = (), max_distance: int = DEFAULT_MAX_DISTANCE):
+        if max_distance >= SIMHASH_BANDS:
+            raise ValueError(f"max_distance 必须小于 {SIMHASH_BANDS}")
+        self.max_distance = max_distance
+        self.fingerprints: List[int] = []
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(SIMHASH_BANDS)]
+        for fingerprint in fingerprints:
+            self.add(fingerprint)
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def add(self, fingerprint: int):
+        self.fingerprints.append(fingerprint)
+        for band in range(SIMHASH_BANDS):
+            key = (fingerprint >> (band * BAND_BITS)) & BAND_MASK
+            self._bands[band].setdefault(key, []).append(fingerprint)
+
+    def find_near(self, fingerprint: int) -> Optional[int]:
+        """返回一个汉明距离 ≤ max_distance 的已有指纹，没有则 None"""
+        for band in range(SIMHASH_BANDS):
+            key = (fingerprint >> (band * BAND_BITS)) & BAND_MASK
+            for candidate in self._bands[band].get(key, ()):
+                if hamming_distance(candidate, fingerprint) <= self.max_distance:
+                    return candidate
+        return None
+
+    def add_if_new(self, fingerprint: int) -> bool:
+        """不是近重复就加入并返回 True；是近重复返回 False"""
+        if self.find_near(fingerprint) is not None:
+            return False
+        self.add(fingerprint)
+        return True
+
+# ==================== MinHash + LSH（关键词聚类） ====================
+
+MINHASH_PERMUTATIONS = 128
+MINHASH_BANDS = 16
+MINHASH_ROWS = MINHASH_PERMUTATIONS // MINHASH_BANDS
+
+# 词集合 Jaccard 不低于这个值视为同一个簇
+DEFAULT_MIN_JACCARD = 0.8
+
+# 不改变需求的通用修饰词，不参与聚类比较（"free pdf to word converter" ≈ "pdf to word converter"）
+KEYWORD_MODIFIERS = frozenset([
+    "free", "online", "best", "top", "simple", "easy", "new", "the", "a", "an", "for",
+])
+
+# 方向词：前后两个词组成有序特征，"pdf to word" 和 "word to pdf" 不会被并成一簇
+DIRECTION_WORDS = frozenset(["to", "into", "from"])
+
+YEAR_RE = re.compile(r"^(19|20)\d\d$")
+
+# 这些结尾的 s 不是复数（canvas、news、status、analysis、class），不做复数归一
+NON_PLURAL_ENDINGS = ("ss", "us", "is", "as", "ews")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# 固定种子的随机排列参数，签名跨进程、跨运行一致
+_permutation_rng = np.random.RandomState(1)
+_PERM_A = _permutation_rng.randint(1, 1 << 31, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+_PERM_B = _permutation_rng.randint(0, 1 << 31, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+
+def _normalize_word(word: str) -> str:
+    """保守的复数归一（converters → converter），不做完整词干化"""
+    if len(word) > 3 and word.endswith("s") and not word.endswith(NON_PLURAL_ENDINGS):
+        return word[:-1]
+    return word
+
+def keyword_shingles(keyword: str) -> FrozenSet[str]:
+    """
+    关键词 → 聚类用的特征集合
+
+    词（去掉修饰词和年份、复数归一，与词序无关）+ 方向词两侧的有序词对。
+    修饰词按原词过滤（先归一会把 news 变成 new 再当修饰词丢掉）；
+    全是修饰词的关键词保留原词，避免变成空集合。
+    """
+    words = tokenize(keyword)
+    content = [w for w in words if w not in KEYWORD_MODIFIERS and not YEAR_RE.match(w)] or words
+    content = [_normalize_word(w) for w in content]
+    shingles = set(content)
+    for i in range(1, len(content) - 1):
+        if content[i] in DIRECTION_WORDS:
+            shingles.add(content[i - 1] + ">" + content[i + 1])
+    return frozenset(shingles)
+
+def minhash_signature(shingles: Iterable[str]) -> np.ndarray:
+    """MinHash 签名（MINHASH_PERMUTATIONS 个 32 位最小哈希），空集合返回全最大值"""
+    hashes = np.array([_token_hash(s) & _MAX_HASH for s in shingles], dtype=np.uint64)
+    if hashes.size == 0:
+        return np.full(MINHASH_PERMUTATIONS, _MAX_HASH, dtype=np.uint64)
+    # (a * x + b) mod p：a, b < 2^31，x < 2^32，乘积不会溢出 uint64
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0)
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+class MinHashLSH:
+    """
+    MinHash 签名的 LSH 分桶索引
+
+    签名切成 MINHASH_BANDS 段，任一段完全相同即为候选，
+    候选再用特征集合的精确 Jaccard 确认（关键词的特征集合很小，确认很便宜）。
+    Jaccard 0.8 时漏检率约 5%，完全相同的集合（词序调换、只差修饰词）不会漏。
+    """
+
+    def __init__(self, min_jaccard: float = DEFAULT_MIN_JACCARD):
+        self.min_jaccard = min_jaccard
+        self.shingles: Dict[str, FrozenSet[str]] = {}
+        self._bands: List[Dict[bytes, List[str]]] = [{} for _ in range(MINHASH_BANDS)]
+
+    def __len__(self) -> int:
+        return len(self.shingles)
+
+    @staticmethod
+    def _band_keys(signature: np.ndarray) -> List[bytes]:
+        return [signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS].tobytes()
+                for band in range(MINHASH_BANDS)]
+
+    def add(self, key: str, shingles: FrozenSet[str], signature: Optional[np.ndarray] = None):
+        if signature is None:
+            signature = minhash_signature(shingles)
+        self.shingles[key] = shingles
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._bands[band].setdefault(band_key, []).append(key)
+
+    def find_near(self, shingles: FrozenSet[str],
+                  signature: Optional[np.ndarray] = None) -> Optional[str]:
+        """返回 Jaccard 最高且 ≥ min_jaccard 的已有 key，没有则 None"""
+        if signature is None:
+            signature = minhash_signature(shingles)
+        best_key, best_score, checked = None, -1.0, set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            for key in self._bands[band].get(band_key, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                score = jaccard(shingles, self.shingles[key])
+                if score >= self.min_jaccard and score > best_score:
+                    best_key, best_score = key, score
+        return best_key
+
+def cluster_keywords(keywords: Iterable[str],
+                     min_jaccard: float = DEFAULT_MIN_JACCARD) -> Dict[str, str]:
+    """
+    近重复关键词聚类，返回 {关键词: 代表词}（代表词映射到自己）
+
+    词数少的先处理，所以代表词是簇里最短（最通用）的写法；
+    只有代表词进索引，每个词只和代表词比较，不会出现 A≈B≈C 链式漂移。
+    """
+    keywords = list(dict.fromkeys(keywords))
+    order = sorted(range(len(keywords)), key=lambda i: (len(keywords[i].split()), i))
+
+    index = MinHashLSH(min_jaccard)
+    clusters: Dict[str, str] = {}
+    for i in order:
+        keyword = keywords[i]
+        shingles = keyword_shingles(keyword)
+        signature = minhash_signature(shingles)
+        representative = index.find_near(shingles, signature)
+        if representative is None:
+            index.add(keyword, shingles, signature)
+            representative = keyword
+        clusters[keyword] = representative
+    return {keyword: clusters[keyword] for keyword in keywords}
@@ -7,7 +7,18 @@ sys.stdout.reconfigure(encoding='utf-8')
 
 import requests
 import time
-import re
+
+from filter_engine import (FilterEngine, load_filter_rules, new_rejection_columns,
+                           split_rejections, summarize_rejections, save_rejections)
+from keyword_tokens import keyword_tokens
+from parallel_scoring import parallel_map_chunks, to_columns, to_records
+
+# Filter rules (noise words, required tool words, tool types, score words)
+# live in filter_rules.json; compiled once, each keyword is checked in a single pass
+FILTER_ENGINE = FilterEngine(load_filter_rules('trend_hunter_optimized'))
+
+# Rejected keywords and their reason codes, appended on every run
+REJECTIONS_FILE = os.path.join("data", "filter_rejections.csv")
 
 # Load seed words
 def load_seed_words():
@@ -95,88 +106,40 @@ def optimized_mining(seed_words):
 
     return all_keywords
 
-def filter_and_score(keywords):
-    """Enhanced filtering and scoring"""
-    noise_patterns = [
-        r'\b(smith|johnson|williams|brown|jones|garcia|miller|davis|wilson|taylor)\b',
-        r'\b(election|scandal|arrest|death|crash|attack|lawsuit|scandal)\b',
-        r'\b(movie|song|album|episode|trailer|season)\b',
-        r'\b(news|breaking|update|report)\b',
-    ]
-
-    # Extended tool words
-    tool_words = [
-        'calculator', 'generator', 'converter', 'checker', 'maker',
-        'editor', 'analyzer', 'optimizer', 'translator', 'parser',
-        'formatter', 'encoder', 'decoder', 'builder', 'extractor',
-        'downloader', 'uploader', 'viewer', 'player', 'creator',
-        'processor', 'manager', 'tracker', 'planner', 'scheduler',
-        'remover', 'joiner', 'splitter', 'merger', 'resize',
-        'compress', 'convert', 'extract', 'generate', 'create',
-        'validate', 'verify', 'test', 'detect', 'scan',
-        'encrypt', 'decrypt', 'hash', 'minify', 'beautify',
-        'crop', 'rotate', 'flip', 'trim', 'merge', 'split'
-    ]
+CANDIDATE_COLUMNS = ['keyword', 'seed', 'tool_type', 'buildability', 'decision', 'source']
 
+def _filter_and_score_chunk(keywords):
+    """Enhanced filtering and scoring (one chunk, returned as columns)"""
     candidates = []
+    rejections = new_rejection_columns()
 
     for item in keywords:
         kw = item['keyword']
-        kw_lower = kw.lower()
-        words = kw.split()
 
-        # Basic filters
-        if len(words) < 2:
-            continue
-        if any(len(w) == 1 for w in words):
-            continue
-        if any(re.search(p, kw_lower) for p in noise_patterns):
-            continue
-
-        # Must contain tool word
-        if not any(tw in kw_lower for tw in tool_words):
+        # Word count, single-letter words, noise, required tool word
+        reason, hits = FILTER_ENGINE.evaluate(kw)
+        if reason is not None:
+            rejections['rejected_keyword'].append(kw)
+            rejections['reject_reason'].append(reason)
             continue
 
         # Tool type detection
         tool_type = 'other'
-        type_scores = []
-        type_keywords = {
-            'calculator': ['calculator', 'calc', 'calculate'],
-            'generator': ['generator', 'generate', 'create', 'make', 'maker'],
-            'converter': ['converter', 'convert', 'to ', ' to'],
-            'checker': ['checker', 'check', 'verify', 'validate', 'test', 'detect'],
-            'editor': ['editor', 'edit', 'modify', 'adjust'],
-            'optimizer': ['optimizer', 'optimize', 'improve', 'enhance'],
-            'analyzer': ['analyzer', 'analyze', 'analysis'],
-            'translator': ['translator', 'translate', 'translation'],
-            'extractor': ['extractor', 'extract', 'pull'],
-            'downloader': ['downloader', 'download'],
-            'uploader': ['uploader', 'upload'],
-            'viewer': ['viewer', 'view', 'viewing'],
-            'player': ['player', 'play'],
-            'joiner': ['joiner', 'join', 'merge', 'combine'],
-            'splitter': ['splitter', 'split', 'divide'],
-            'remover': ['remover', 'remove', 'delete', 'erase'],
-            'resizer': ['resize', 'scale'],
-            'compressor': ['compress', 'compress'],
-        }
-
         max_matches = 0
-        for t, keywords_list in type_keywords.items():
-            matches = sum(1 for kw in keywords_list if kw in kw_lower)
-            if matches > max_matches:
-                max_matches = matches
+        for t, matched in hits['type'].items():
+            if len(matched) > max_matches:
+                max_matches = len(matched)
                 tool_type = t
 
         # Scoring (1-5)
         score = 3
-        if any(rp in kw_lower for rp in ['calculator', 'generator', 'converter', 'checker']):
+        if 'core' in hits['score']:
             score += 1
-        if any(w in kw_lower for w in [' ai ', 'online', 'free', 'tool']):
+        if 'modifier' in hits['score']:
             score += 1
-        if any(w in kw_lower for w in ['jpg', 'png', 'pdf', 'mp3', 'mp4', 'wav']):
+        if 'format' in hits['score']:
             score += 1
-        word_count = len(words)
+        word_count = keyword_tokens(kw).word_count
         if 2 <= word_count <= 4:
             score += 1
 
@@ -197,7 +160,17 @@ def filter_and_score(keywords):
             'source': item['source']
         })
 
-    return candidates
+    columns = to_columns(candidates, CANDIDATE_COLUMNS)
+    columns.update(rejections)
+    return columns
+
+def filter_and_score(keywords):
+    """Enhanced filtering and scoring; large keyword lists are split across worker processes"""
+    columns, rejections = split_rejections(parallel_map_chunks(_filter_and_score_chunk, keywords))
+    save_rejections(rejections, REJECTIONS_FILE, 'trend_hunter_optimized')
+    summary = ", ".join(f"{reason} {count}" for reason, count in summarize_rejections(rejections)[:5])
+    print(f"    Rejected: {len(rejections['rejected_keyword'])} ({summary})")
+    return to_records(columns)
 
 def generate_html_report(candidates):
     """Generate comprehensive HTML report"""
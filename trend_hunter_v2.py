@@ -7,7 +7,18 @@ sys.stdout.reconfigure(encoding='utf-8')
 
 import requests
 import time
-import re
+
+from filter_engine import (FilterEngine, load_filter_rules, new_rejection_columns,
+                           split_rejections, summarize_rejections, save_rejections)
+from keyword_tokens import keyword_tokens
+from parallel_scoring import parallel_map_chunks, to_columns, to_records
+
+# Filter rules (noise words, required tool words, tool types, score words)
+# live in filter_rules.json; compiled once, each keyword is checked in a single pass
+FILTER_ENGINE = FilterEngine(load_filter_rules('trend_hunter_v2'))
+
+# Rejected keywords and their reason codes, appended on every run
+REJECTIONS_FILE = os.path.join("data", "filter_rejections.csv")
 
 # Load seed words
 def load_seed_words():
@@ -74,74 +85,33 @@ def smart_mining(seed_words):
 
     return all_keywords
 
-def filter_and_score(keywords):
-    """Filter and score keywords"""
-    # Noise patterns
-    noise_patterns = [
-        r'\b(smith|johnson|williams|brown|jones|garcia|miller|davis)\b',
-        r'\b(election|scandal|arrest|death|crash|attack)\b',
-        r'\b(movie|song|album|episode|trailer)\b',
-    ]
+CANDIDATE_COLUMNS = ['keyword', 'seed', 'tool_type', 'buildability', 'decision', 'source']
 
+def _filter_and_score_chunk(keywords):
+    """Filter and score keywords (one chunk, returned as columns)"""
     candidates = []
+    rejections = new_rejection_columns()
 
     for item in keywords:
         kw = item['keyword']
-        kw_lower = kw.lower()
-        words = kw.split()
-
-        # Must be multi-word phrase
-        if len(words) < 2:
-            continue
 
-        # No single-letter words
-        if any(len(w) == 1 for w in words):
-            continue
-
-        # No noise
-        if any(re.search(p, kw_lower) for p in noise_patterns):
-            continue
-
-        # Must contain tool-related word
-        tool_words = ['calculator', 'generator', 'converter', 'checker', 'maker',
-                     'editor', 'analyzer', 'optimizer', 'translator', 'parser',
-                     'formatter', 'encoder', 'decoder', 'builder', 'extractor',
-                     'downloader', 'uploader', 'viewer', 'player', 'creator',
-                     'processor', 'manager', 'tracker', 'planner', 'scheduler']
-        if not any(tw in kw_lower for tw in tool_words):
+        # Word count, single-letter words, noise, required tool word
+        reason, hits = FILTER_ENGINE.evaluate(kw)
+        if reason is not None:
+            rejections['rejected_keyword'].append(kw)
+            rejections['reject_reason'].append(reason)
             continue
 
         # Determine tool type
-        if any(w in kw_lower for w in ['calculator', 'calc']):
-            tool_type = 'calculator'
-        elif any(w in kw_lower for w in ['generator', 'create', 'make']):
-            tool_type = 'generator'
-        elif any(w in kw_lower for w in ['converter', 'convert', ' to ', 'to jpg', 'to pdf', 'heic']):
-            tool_type = 'converter'
-        elif any(w in kw_lower for w in ['checker', 'check', 'verify', 'test']):
-            tool_type = 'checker'
-        elif any(w in kw_lower for w in ['editor', 'edit']):
-            tool_type = 'editor'
-        elif any(w in kw_lower for w in ['optimizer', 'optimize']):
-            tool_type = 'optimizer'
-        elif any(w in kw_lower for w in ['analyzer', 'analyze']):
-            tool_type = 'analyzer'
-        elif any(w in kw_lower for w in ['translator', 'translate']):
-            tool_type = 'translator'
-        elif any(w in kw_lower for w in ['extractor', 'extract']):
-            tool_type = 'extractor'
-        elif any(w in kw_lower for w in ['downloader', 'download']):
-            tool_type = 'downloader'
-        else:
-            tool_type = 'other'
+        tool_type = next(iter(hits['type']), 'other')
 
         # Score (1-5)
         score = 3
-        if any(rp in kw_lower for rp in ['calculator', 'generator', 'converter', 'checker']):
+        if 'core' in hits['score']:
             score += 1
-        if any(w in kw_lower for w in [' ai ', 'online', 'free', 'tool']):
+        if 'modifier' in hits['score']:
             score += 1
-        word_count = len(words)
+        word_count = keyword_tokens(kw).word_count
         if 2 <= word_count <= 4:
             score += 1
 
@@ -162,7 +132,17 @@ def filter_and_score(keywords):
             'source': item['source']
         })
 
-    return candidates
+    columns = to_columns(candidates, CANDIDATE_COLUMNS)
+    columns.update(rejections)
+    return columns
+
+def filter_and_score(keywords):
+    """Filter and score keywords; large keyword lists are split across worker processes"""
+    columns, rejections = split_rejections(parallel_map_chunks(_filter_and_score_chunk, keywords))
+    save_rejections(rejections, REJECTIONS_FILE, 'trend_hunter_v2')
+    summary = ", ".join(f"{reason} {count}" for reason, count in summarize_rejections(rejections)[:5])
+    print(f"    Rejected: {len(rejections['rejected_keyword'])} ({summary})")
+    return to_records(columns)
 
 def generate_html_report(candidates):
     """Generate HTML report"""
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗃️ Validation Store - 深度验证结果库（SQLite WAL）
+=================================================
+
+每次深度验证的结果都追加一行到 data/validation/validation_store.sqlite3：
+按规范化关键词（小写、合并空白）索引，保留完整历史
+（综合分数、Reddit / SERP 汇总、判断理由、时间戳、完整结果 JSON）。
+
+- load_recent_validations(): TTL 内验证过的词直接从库里取，不再重复验证
+- validation_history() / score_history(): 报告里直接查历史分数
+- save_candidate_features() / training_rows(): 记录挖掘阶段的特征，
+  和验证结论配对后给 prevalidation_model 训练
+- latest_candidate_features() / latest_validations(): 每个词最近一次的原始信号，
+  offline_rescore 用来离线重算评分
+
+用 WAL 模式，报告读库时不会阻塞验证写入。
+"""
+
+import os
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+
+# ==================== 配置区 ====================
+
+DATA_DIR = "data"
+VALIDATION_DIR = os.path.join(DATA_DIR, "validation")
+VALIDATION_DB = os.path.join(VALIDATION_DIR, "validation_store.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS validations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    keyword TEXT NOT NULL,
+    raw_keyword TEXT NOT NULL,
+    validated_at TEXT NOT NULL,
+    validation_score REAL NOT NULL,
+    is_real_need INTEGER NOT NULL,
+    reddit_score REAL,
+    reddit_mentions INTEGER,
+    pain_signals INTEGER,
+    real_complaints INTEGER,
+    has_market_gap INTEGER,
+    commercial_intent REAL,
+    tool_results INTEGER,
+    forum_results INTEGER,
+    reasoning TEXT,
+    result_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_validations_keyword_time
+    ON validations (keyword, validated_at);
+CREATE TABLE IF NOT EXISTS candidate_features (
+    keyword TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    features_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_candidate_features_keyword_time
+    ON candidate_features (keyword, recorded_at);
+"""
+
+# 每个关键词最近一次写入的行：按插入顺序（id / rowid）取最大值，
+# 同一秒内写入的多条记录也有确定的先后（时间戳只精确到秒）
+LATEST_VALIDATION_IDS = "SELECT MAX(id) FROM validations GROUP BY keyword"
+LATEST_FEATURE_ROWIDS = "SELECT MAX(rowid) FROM candidate_features GROUP BY keyword"
+
+# ==================== 连接 ====================
+
+def canonical_keyword(keyword: str) -> str:
+    """规范化关键词：小写 + 合并空白"""
+    return " ".join(keyword.lower().split())
+
+def connect(db_path: str = VALIDATION_DB) -> sqlite3.Connection:
+    """打开结果库（首次使用时建表，开启 WAL）"""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+# ==================== 写入 ====================
+
+def _to_row(result: Dict, validated_at: str) -> tuple:
+    reddit = result.get("reddit_data", {})
+    serp = result.get("serp_data", {})
+    return (
+        canonical_keyword(result["keyword"]),
+        result["keyword"],
+        validated_at,
+        float(result["validation_score"]),
+        int(bool(result["is_real_need"])),
+        reddit.get("validation_score"),
+        reddit.get("total_mentions"),
+        reddit.get("pain_signal_count"),
+        reddit.get("complaint_count"),
+        int(bool(serp.get("has_gap"))),
+        serp.get("commercial_intent"),
+        serp.get("tool_results_count"),
+        serp.get("forum_results_count"),
+        result.get("reasoning"),
+        json.dumps(result, ensure_ascii=False, default=str)
+    )
+
+def save_validations(results: List[Dict], db_path: str = VALIDATION_DB) -> int:
+    """批量保存验证结果（一个事务），返回写入条数"""
+    if not results:
+        return 0
+    validated_at = datetime.now().isoformat(timespec="seconds")
+    with closing(connect(db_path)) as conn, conn:
+        conn.executemany(
+            "INSERT INTO validations (keyword, raw_keyword, validated_at, validation_score, "
+            "is_real_need, reddit_score, reddit_mentions, pain_signals, real_complaints, "
+            "has_market_gap, commercial_intent, tool_results, forum_results, reasoning, result_json) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [_to_row(r, validated_at) for r in results]
+        )
+    return len(results)
+
+# ==================== 读取 ====================
+
+def load_recent_validations(keywords: List[str], ttl_hours: float,
+                            db_path: str = VALIDATION_DB) -> Dict[str, Dict]:
+    """
+    TTL 内验证过的关键词 → 最近一次的完整结果
+
+    返回的键是传入的原始关键词（不是规范化后的）。
+    """
+    if not keywords or not os.path.exists(db_path):
+        return {}
+
+    since = (datetime.now() - timedelta(hours=ttl_hours)).isoformat(timespec="seconds")
+    by_canonical = {}
+    for keyword in keywords:
+        by_canonical.setdefault(canonical_keyword(keyword), []).append(keyword)
+
+    found = {}
+    with closing(connect(db_path)) as conn:
+        canonical = list(by_canonical)
+        # SQLite 单条语句的参数个数有上限，分块查询
+        for i in range(0, len(canonical), 500):
+            chunk = canonical[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT keyword, result_json FROM validations "
+                f"WHERE keyword IN ({placeholders}) AND validated_at >= ? "
+                f"ORDER BY validated_at",
+                chunk + [since]
+            ).fetchall()
+            for row in rows:  # 按时间升序，后者覆盖前者
+                for keyword in by_canonical[row["keyword"]]:
+                    found[keyword] = json.loads(row["result_json"])
+    return found
+
+def validation_history(keyword: Optional[str] = None, since: Optional[str] = None,
+                       db_path: str = VALIDATION_DB) -> List[Dict]:
+    """
+    查询验证历史（不含完整 JSON），按时间升序
+
+    keyword 为空时返回全部关键词；since 为 ISO 时间字符串。
+    """
+    if not os.path.exists(db_path):
+        return []
+
+    sql = ("SELECT keyword, raw_keyword, validated_at, validation_score, is_real_need, "
+           "reddit_score, reddit_mentions, pain_signals, real_complaints, has_market_gap, "
+           "commercial_intent, tool_results, forum_results, reasoning FROM validations")
+    conditions, params = [], []
+    if keyword is not None:
+        conditions.append("keyword = ?")
+        params.append(canonical_keyword(keyword))
+    if since is not None:
+        conditions.append("validated_at >= ?")
+        params.append(since)
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY validated_at, id"
+
+    with closing(connect(db_path)) as conn:
+        return [dict(row) for row in conn.execute(sql, params)]
+
+def score_history(keywords: List[str], limit: int = 5,
+                  db_path: str = VALIDATION_DB) -> Dict[str, List[float]]:
+    """每个关键词最近 limit 次的综合分数（按时间升序），供报告显示趋势"""
+    history: Dict[str, List[float]] = {}
+    if keywords and os.path.exists(db_path):
+        canonical = list(dict.fromkeys(canonical_keyword(keyword) for keyword in keywords))
+        with closing(connect(db_path)) as conn:
+            # 走 (keyword, validated_at) 索引，只读这几个词；参数个数有上限，分块查询
+            for i in range(0, len(canonical), 500):
+                chunk = canonical[i:i + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for row in conn.execute(
+                        f"SELECT keyword, validation_score FROM validations "
+                        f"WHERE keyword IN ({placeholders}) ORDER BY validated_at, id", chunk):
+                    history.setdefault(row["keyword"], []).append(row["validation_score"])
+    return {
+        keyword: history.get(canonical_keyword(keyword), [])[-limit:]
+        for keyword in keywords
+    }
+
+def latest_validations(db_path: str = VALIDATION_DB) -> Dict[str, Dict]:
+    """每个关键词最近一次的验证汇总（不含完整 JSON），键是规范化关键词"""
+    if not os.path.exists(db_path):
+        return {}
+
+    sql = ("SELECT keyword, validation_score, is_real_need, reddit_score, reddit_mentions, "
+           "pain_signals, real_complaints, has_market_gap, commercial_intent, tool_results, "
+           f"forum_results, validated_at FROM validations WHERE id IN ({LATEST_VALIDATION_IDS})")
+    with closing(connect(db_path)) as conn:
+        return {row["keyword"]: dict(row) for row in conn.execute(sql)}
+
+# ==================== 候选词特征（训练数据） ====================
+
+def save_candidate_features(rows: List[Dict], db_path: str = VALIDATION_DB) -> int:
+    """
+    记录挖掘阶段每个候选词的特征（ultimate 的评分列），返回写入条数
+
+    rows 里每个字典都要有 keyword；其余字段原样存成 JSON。
+    """
+    if not rows:
+        return 0
+    recorded_at = datetime.now().isoformat(timespec="seconds")
+    with closing(connect(db_path)) as conn, conn:
+        conn.executemany(
+            "INSERT INTO candidate_features (keyword, recorded_at, features_json) VALUES (?, ?, ?)",
+            [(canonical_keyword(row["keyword"]), recorded_at,
+              json.dumps(row, ensure_ascii=False, default=str)) for row in rows]
+        )
+    return len(rows)
+
+def latest_candidate_features(db_path: str = VALIDATION_DB) -> List[Dict]:
+    """
+    每个关键词最近一次记录的特征（挖掘阶段的原始信号和当时的评分）
+
+    返回 features 字典列表，额外带 recorded_at。
+    """
+    if not os.path.exists(db_path):
+        return []
+
+    sql = (f"SELECT features_json, recorded_at FROM candidate_features "
+           f"WHERE rowid IN ({LATEST_FEATURE_ROWIDS})")
+    with closing(connect(db_path)) as conn:
+        return [
+            dict(json.loads(row["features_json"]), recorded_at=row["recorded_at"])
+            for row in conn.execute(sql)
+        ]
+
+def training_rows(db_path: str = VALIDATION_DB) -> List[Dict]:
+    """
+    每个关键词最近一次的特征 + 最近一次的验证结论
+
+    返回 [{"keyword", "is_real_need", "validation_score", "features": {...}}, ...]
+    """
+    if not os.path.exists(db_path):
+        return []
+
+    sql = f"""
+        SELECT v.keyword, v.is_real_need, v.validation_score, f.features_json
+        FROM (SELECT keyword, is_real_need, validation_score
+              FROM validations WHERE id IN ({LATEST_VALIDATION_IDS})) AS v
+        JOIN (SELECT keyword, features_json
+              FROM candidate_features WHERE rowid IN ({LATEST_FEATURE_ROWIDS})) AS f
+        ON v.keyword = f.keyword
+    """
+    with closing(connect(db_path)) as conn:
+        return [
+            {
+                "keyword": row["keyword"],
+                "is_real_need": bool(row["is_real_need"]),
+                "validation_score": row["validation_score"],
+                "features": json.loads(row["features_json"])
+            }
+            for row in conn.execute(sql)
+        ]